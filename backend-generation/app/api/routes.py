@@ -1,12 +1,16 @@
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import JSONResponse
+import json
+from collections.abc import AsyncIterator
 
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from app.dependencies import get_pipeline_service
 from app.schemas import AssetJobCreateResponse, AssetJobStatusResponse, JobResultResponse, LegacyGenerateResponse
-from app.services.pipeline import PipelineService
+from app.services.pipeline import JobStateError, PipelineService
 from app.services.payload_normalizer import normalize_asset_job_payload
+from app.services.scheduler import QueueFullError
 
 router = APIRouter()
-service = PipelineService()
 
 
 @router.get("/health", tags=["health"])
@@ -15,44 +19,120 @@ def health() -> dict[str, str]:
 
 
 @router.post("/api/assets/jobs/storyboard", response_model=AssetJobCreateResponse, tags=["assets"])
-def create_storyboard_job(payload: dict) -> AssetJobCreateResponse:
+def create_storyboard_job(
+    payload: dict,
+    service: PipelineService = Depends(get_pipeline_service),
+) -> AssetJobCreateResponse:
     try:
         normalized = normalize_asset_job_payload(payload)
         return service.create_job(normalized, mode="storyboard")
+    except QueueFullError as exc:
+        raise HTTPException(status_code=429, detail=str(exc)) from exc
     except Exception as exc:
         raise HTTPException(status_code=500, detail=f"Job creation failed: {exc}") from exc
 
 
 @router.post("/api/assets/jobs/storyboard-to-video", response_model=AssetJobCreateResponse, tags=["assets"])
-def create_storyboard_to_video_job(payload: dict) -> AssetJobCreateResponse:
+def create_storyboard_to_video_job(
+    payload: dict,
+    service: PipelineService = Depends(get_pipeline_service),
+) -> AssetJobCreateResponse:
     try:
         normalized = normalize_asset_job_payload(payload)
         return service.create_job(normalized, mode="storyboard_to_video")
+    except QueueFullError as exc:
+        raise HTTPException(status_code=429, detail=str(exc)) from exc
     except Exception as exc:
         raise HTTPException(status_code=500, detail=f"Job creation failed: {exc}") from exc
 
 
 @router.post("/api/assets/jobs", response_model=AssetJobCreateResponse, tags=["assets"])
-def create_asset_job(payload: dict) -> AssetJobCreateResponse:
+def create_asset_job(
+    payload: dict,
+    service: PipelineService = Depends(get_pipeline_service),
+) -> AssetJobCreateResponse:
     try:
         normalized = normalize_asset_job_payload(payload)
         return service.create_job(normalized, mode="storyboard")
+    except QueueFullError as exc:
+        raise HTTPException(status_code=429, detail=str(exc)) from exc
     except Exception as exc:
         raise HTTPException(status_code=500, detail=f"Job creation failed: {exc}") from exc
 
 
 @router.get("/api/assets/jobs/{job_id}", response_model=AssetJobStatusResponse, tags=["assets"])
-def get_asset_job_status(job_id: str) -> AssetJobStatusResponse:
+async def get_asset_job_status(
+    job_id: str,
+    wait: int = Query(0, ge=0, le=60, description="Long-poll: seconds to wait for the next transition."),
+    service: PipelineService = Depends(get_pipeline_service),
+) -> AssetJobStatusResponse:
     try:
-        return service.get_status(job_id)
+        return await service.wait_for_change(job_id, wait)
     except KeyError as exc:
         raise HTTPException(status_code=404, detail=f"Job not found: {job_id}") from exc
     except Exception as exc:
         raise HTTPException(status_code=500, detail=f"Status lookup failed: {exc}") from exc
 
 
+def _sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+@router.get("/api/assets/jobs/{job_id}/events", tags=["assets"])
+async def stream_asset_job_status(
+    job_id: str,
+    service: PipelineService = Depends(get_pipeline_service),
+) -> StreamingResponse:
+    stream = service.stream_status(job_id)
+    try:
+        first = await anext(stream)
+    except KeyError as exc:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}") from exc
+
+    async def events() -> AsyncIterator[str]:
+        yield _sse_event("status", first.model_dump(mode="json"))
+        try:
+            async for status in stream:
+                if status is None:
+                    yield ": keep-alive\n\n"
+                else:
+                    yield _sse_event("status", status.model_dump(mode="json"))
+        except Exception as exc:
+            yield _sse_event("error", {"detail": str(exc)})
+        finally:
+            await stream.aclose()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/api/assets/jobs/{job_id}/resume", response_model=AssetJobCreateResponse, tags=["assets"])
+def resume_asset_job(
+    job_id: str,
+    service: PipelineService = Depends(get_pipeline_service),
+) -> AssetJobCreateResponse:
+    try:
+        return service.resume_job(job_id)
+    except KeyError as exc:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}") from exc
+    except FileNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=f"Job request not found: {job_id}") from exc
+    except JobStateError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+    except QueueFullError as exc:
+        raise HTTPException(status_code=429, detail=str(exc)) from exc
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail=f"Job resume failed: {exc}") from exc
+
+
 @router.get("/api/assets/jobs/{job_id}/result", response_model=JobResultResponse, tags=["assets"])
-def get_asset_job_result(job_id: str) -> JobResultResponse:
+def get_asset_job_result(
+    job_id: str,
+    service: PipelineService = Depends(get_pipeline_service),
+) -> JobResultResponse:
     try:
         return service.get_result(job_id)
     except FileNotFoundError as exc:
@@ -62,14 +142,19 @@ def get_asset_job_result(job_id: str) -> JobResultResponse:
 
 
 @router.post("/api/assets/generate", tags=["assets"])
-def generate_assets_legacy(payload: dict):
+async def generate_assets_legacy(
+    payload: dict,
+    service: PipelineService = Depends(get_pipeline_service),
+):
     try:
         normalized = normalize_asset_job_payload(payload)
-        status_code, body = service.wait_for_legacy(normalized, mode="storyboard")
+        status_code, body = await service.wait_for_legacy(normalized, mode="storyboard")
         if status_code == 200:
             return LegacyGenerateResponse(**body)
         if status_code == 202:
             return JSONResponse(status_code=202, content=body)
         return JSONResponse(status_code=500, content=body)
+    except QueueFullError as exc:
+        raise HTTPException(status_code=429, detail=str(exc)) from exc
     except Exception as exc:
         raise HTTPException(status_code=500, detail=f"Asset generation failed: {exc}") from exc
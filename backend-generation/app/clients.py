@@ -0,0 +1,54 @@
+"""Process-wide pooled HTTP and Gemini clients owned by the app lifespan."""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from threading import Lock
+
+import httpx
+from google import genai
+
+from app.config import Settings, get_settings
+
+
+class ClientRegistry:
+    def __init__(self, settings: Settings) -> None:
+        self.settings = settings
+        self._lock = Lock()
+        self._genai_clients: dict[tuple[str, str], genai.Client] = {}
+        self._limits = httpx.Limits(
+            max_connections=settings.gen_http_max_connections,
+            max_keepalive_connections=settings.gen_http_max_keepalive_connections,
+            keepalive_expiry=settings.gen_http_keepalive_expiry_sec,
+        )
+        self.http = httpx.Client(timeout=settings.gen_http_timeout_sec, limits=self._limits)
+        self._async_http: httpx.AsyncClient | None = None
+
+    @property
+    def async_http(self) -> httpx.AsyncClient:
+        with self._lock:
+            if self._async_http is None:
+                self._async_http = httpx.AsyncClient(
+                    timeout=self.settings.gen_http_timeout_sec, limits=self._limits
+                )
+            return self._async_http
+
+    def genai(self, project: str | None = None, location: str | None = None) -> genai.Client:
+        key = (project or self.settings.gcp_project_id, location or self.settings.gcp_location)
+        with self._lock:
+            client = self._genai_clients.get(key)
+            if client is None:
+                client = genai.Client(vertexai=True, project=key[0], location=key[1])
+                self._genai_clients[key] = client
+            return client
+
+    async def aclose(self) -> None:
+        self.http.close()
+        if self._async_http is not None:
+            await self._async_http.aclose()
+            self._async_http = None
+
+
+@lru_cache
+def get_client_registry() -> ClientRegistry:
+    return ClientRegistry(get_settings())
@@ -1,4 +1,5 @@
 from functools import lru_cache
+from typing import Literal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -12,6 +13,10 @@ class Settings(BaseSettings):
 
     gcp_project_id: str = ""
     gcp_location: str = "global"
+    gen_http_timeout_sec: float = 60.0
+    gen_http_max_connections: int = 32
+    gen_http_max_keepalive_connections: int = 16
+    gen_http_keepalive_expiry_sec: float = 60.0
     generated_dir: str = "/workspace/frontend/public/generated"
     gcp_vertex_image_model: str = "gemini-3-pro-image-preview"
     gcp_vertex_video_model: str = "veo-3.1-generate-preview"
@@ -19,6 +24,12 @@ class Settings(BaseSettings):
     scene_planner_model: str = "gemini-2.5-pro"
     creator_reference_model: str = "gemini-2.5-pro"
     creator_reference_search_enabled: bool = True
+    creator_reference_fallback_delay_sec: float = 8.0
+    creator_reference_deadline_sec: float = 45.0
+    creator_reference_cache_enabled: bool = True
+    creator_reference_cache_ttl_sec: float = 21600.0
+    creator_reference_cache_max_entries: int = 256
+    creator_reference_cache_path: str = "data/creator_reference_cache.json"
     max_scene_plan_attempts: int = 1
     max_image_text_retry: int = 2
     max_allowed_text_chars_frame: int = 12
@@ -26,12 +37,46 @@ class Settings(BaseSettings):
     max_image_generation_attempts: int = 5
     image_retry_backoff_base_sec: float = 4.0
     image_retry_backoff_max_sec: float = 30.0
-    image_request_interval_sec: float = 1.2
+    image_requests_per_minute: float = 50.0
+    image_request_burst: int = 3
+    video_requests_per_minute: float = 10.0
+    veo_poll_initial_sec: float = 5.0
+    veo_poll_max_sec: float = 30.0
+    veo_poll_multiplier: float = 1.5
+    veo_poll_jitter: float = 0.2
+    veo_operation_deadline_sec: float = 600.0
+    rate_limit_decrease_factor: float = 0.5
+    rate_limit_recovery_step: float = 0.05
+    rate_limit_min_requests_per_minute: float = 2.0
+    image_batch_enabled: bool = False
+    image_batch_max_frames: int = 5
+    reference_gcs_bucket: str = ""
+    reference_gcs_prefix: str = "references/"
+    reference_cache_max_entries: int = 32
+    image_cache_enabled: bool = True
+    image_cache_dir: str = ""
+    image_cache_max_bytes: int = 1_073_741_824
     output_image_width: int = 640
     output_image_height: int = 360
+    png_optimize: bool = False
+    ocr_grayscale: bool = True
+    ocr_scale: float = 1.0
+    ocr_workers: int = 2
+    ocr_prefilter_enabled: bool = False
+    ocr_prefilter_min_blocks: int = 2
     preview_video_fps: int = 10
     preview_video_bitrate: str = "550k"
-    max_worker_jobs: int = 1
+    preview_video_encoder: Literal["ffmpeg", "moviepy"] = "ffmpeg"
+    max_active_jobs: int = 4
+    max_queued_storyboard_jobs: int = 32
+    max_queued_storyboard_to_video_jobs: int = 8
+    llm_stage_workers: int = 4
+    image_stage_workers: int = 4
+    cpu_stage_workers: int = 2
+    veo_stage_workers: int = 2
+    job_store_backend: Literal["memory", "sqlite"] = "sqlite"
+    job_store_path: str = "data/jobs.sqlite3"
+    max_frame_workers: int = 5
     default_max_video_seconds: int = 5
     video_quality_threshold: float = 0.55
     max_video_attempts: int = 2
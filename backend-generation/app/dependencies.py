@@ -0,0 +1,12 @@
+from fastapi import Request
+
+from app.clients import ClientRegistry
+from app.services.pipeline import PipelineService
+
+
+def get_clients(request: Request) -> ClientRegistry:
+    return request.app.state.clients
+
+
+def get_pipeline_service(request: Request) -> PipelineService:
+    return request.app.state.pipeline
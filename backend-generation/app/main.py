@@ -1,16 +1,33 @@
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.routes import router as api_router
+from app.clients import get_client_registry
 from app.config import get_settings
+from app.services.pipeline import PipelineService
 
 settings = get_settings()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    clients = get_client_registry()
+    app.state.clients = clients
+    app.state.pipeline = PipelineService(clients)
+    yield
+    await clients.aclose()
+    get_client_registry.cache_clear()
+
+
 app = FastAPI(
     title=settings.gen_app_name,
     debug=settings.gen_app_debug,
     version="0.1.0",
     description="Script-to-thumbnail/teaser pipeline backend",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -132,7 +132,7 @@ class JobResultResponse(BaseModel):
     scene_plan_path: str = ""
     character_anchor_path: str = ""
     text_guard_enabled: bool = False
-    text_guard_summary: dict[str, int | bool | str | list[str]] = {}
+    text_guard_summary: dict[str, int | float | bool | str | list[str] | dict[str, int]] = {}
     veo_trace: dict[str, str | int | bool] = {}
     partial_result: bool = False
     error_message: str | None = None
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from pathlib import Path
+from threading import Lock
+from typing import Any
+
+from app.utils.files import atomic_write_json
+
+MANIFEST_NAME = "checkpoint.json"
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class StageCheckpoint:
+    """Per-job manifest of completed pipeline stages.
+
+    A stage entry records the size and hash of each artifact it produced plus the
+    digests of the stages it was built from. A stage is reusable only while its
+    artifacts are intact and none of its upstream stages has been redone since.
+    """
+
+    def __init__(self, job_dir: Path) -> None:
+        self.job_dir = job_dir
+        self.manifest_path = job_dir / MANIFEST_NAME
+        self._lock = Lock()
+        self._stages: dict[str, dict[str, Any]] = {}
+        if self.manifest_path.exists():
+            try:
+                loaded = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+                self._stages = dict(loaded.get("stages", {}))
+            except (OSError, ValueError):
+                self._stages = {}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stages = {}
+            self._flush()
+
+    def digest(self, stage: str) -> str | None:
+        with self._lock:
+            entry = self._stages.get(stage)
+            return entry.get("digest") if entry else None
+
+    def is_valid(self, stage: str) -> bool:
+        with self._lock:
+            entry = self._stages.get(stage)
+            if not entry:
+                return False
+            for dep, dep_digest in entry.get("depends_on", {}).items():
+                if (self._stages.get(dep) or {}).get("digest") != dep_digest:
+                    return False
+            artifacts: dict[str, dict[str, Any]] = entry.get("artifacts", {})
+        for rel_path, meta in artifacts.items():
+            path = self.job_dir / rel_path
+            try:
+                if path.stat().st_size != meta.get("size") or _file_sha256(path) != meta.get("sha256"):
+                    return False
+            except OSError:
+                return False
+        return True
+
+    def mark_done(self, stage: str, artifacts: list[Path], depends_on: list[str] | None = None) -> None:
+        artifact_meta = {
+            path.relative_to(self.job_dir).as_posix(): {
+                "size": path.stat().st_size,
+                "sha256": _file_sha256(path),
+            }
+            for path in artifacts
+        }
+        stage_digest = hashlib.sha256(
+            json.dumps(artifact_meta, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+        with self._lock:
+            self._stages[stage] = {
+                "digest": stage_digest,
+                "artifacts": artifact_meta,
+                "depends_on": {
+                    dep: (self._stages.get(dep) or {}).get("digest") for dep in depends_on or []
+                },
+                "completed_at": time.time(),
+            }
+            self._flush()
+
+    def _flush(self) -> None:
+        atomic_write_json(self.manifest_path, {"stages": self._stages})
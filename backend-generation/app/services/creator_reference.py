@@ -1,23 +1,108 @@
 from __future__ import annotations
 
+import hashlib
 import json
 import re
+import time
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Lock
 from typing import Any
 
 from google import genai
 from google.genai import types
 
+from app.clients import get_client_registry
 from app.config import get_settings
 from app.schemas import AssetJobCreateRequest
+from app.utils.files import atomic_write_json
+
+
+@dataclass(frozen=True)
+class CreatorReferenceResult:
+    """A resolved reference plus how it was obtained.
+
+    Only `reference` is stored and sent to the scene planner; the flags are for the
+    provider trace, so the prompt is the same on a memo hit and a miss.
+    """
+
+    reference: dict[str, Any]
+    resolved_by: str
+    cache_hit: bool
+
+
+class CreatorReferenceMemo:
+    """TTL + LRU memo of resolved creator references, optionally mirrored to a JSON file."""
+
+    def __init__(self, ttl_sec: float, max_entries: int, persist_path: Path | None = None) -> None:
+        self.ttl_sec = ttl_sec
+        self.max_entries = max(1, max_entries)
+        self.persist_path = persist_path
+        self._lock = Lock()
+        self._entries: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        if persist_path and persist_path.exists():
+            try:
+                stored = json.loads(persist_path.read_text(encoding="utf-8"))
+                now = time.time()
+                for key, item in sorted(stored.get("entries", {}).items(), key=lambda kv: kv[1]["stored_at"]):
+                    if now - float(item["stored_at"]) < self.ttl_sec:
+                        self._entries[key] = (float(item["stored_at"]), dict(item["value"]))
+            except (OSError, ValueError, KeyError, TypeError):
+                self._entries.clear()
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            stored_at, value = item
+            if time.time() - stored_at >= self.ttl_sec:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return dict(value)
+
+    def put(self, key: str, value: dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = (time.time(), dict(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            if self.persist_path:
+                atomic_write_json(
+                    self.persist_path,
+                    {
+                        "entries": {
+                            k: {"stored_at": stored_at, "value": v}
+                            for k, (stored_at, v) in self._entries.items()
+                        }
+                    },
+                )
 
 
 class CreatorReferenceService:
-    def __init__(self) -> None:
+    def __init__(self, client: genai.Client | None = None) -> None:
         self.settings = get_settings()
-        self.client = genai.Client(
-            vertexai=True,
-            project=self.settings.gcp_project_id,
-            location=self.settings.gcp_location,
+        self.client = client or get_client_registry().genai()
+        self.memo: CreatorReferenceMemo | None = None
+        if self.settings.creator_reference_cache_enabled:
+            self.memo = CreatorReferenceMemo(
+                ttl_sec=self.settings.creator_reference_cache_ttl_sec,
+                max_entries=self.settings.creator_reference_cache_max_entries,
+                persist_path=(
+                    Path(self.settings.creator_reference_cache_path)
+                    if self.settings.creator_reference_cache_path
+                    else None
+                ),
+            )
+        # Every active job may have both branches in flight, so a fallback never queues
+        # behind another job's losing branch. Branch calls time out at the lookup deadline,
+        # so a hung loser frees its worker instead of holding it until the socket gives up.
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, self.settings.max_active_jobs) * 2,
+            thread_name_prefix="creator-ref",
         )
 
     @staticmethod
@@ -37,14 +122,24 @@ class CreatorReferenceService:
             return json.loads(block.group(1))
         return {}
 
+    @staticmethod
+    def _source_fields(payload: AssetJobCreateRequest) -> list[tuple[str, str]]:
+        return [
+            ("제목", payload.script.title),
+            ("설명", payload.meta.description),
+            ("후킹", payload.script.hook_0_15s),
+            ("본문1", payload.script.body_15_150s[0].line if payload.script.body_15_150s else ""),
+            ("결론", payload.rationale_block.logic.conclusion),
+        ]
+
+    def fingerprint(self, payload: AssetJobCreateRequest) -> str:
+        normalized = [" ".join(value.split()).lower() for _, value in self._source_fields(payload)]
+        normalized.append(self.settings.creator_reference_model)
+        normalized.append("search" if self.settings.creator_reference_search_enabled else "no_search")
+        return hashlib.sha256("\x1f".join(normalized).encode("utf-8")).hexdigest()
+
     def _prompt(self, payload: AssetJobCreateRequest) -> str:
-        text_blob = (
-            f"제목: {payload.script.title}\n"
-            f"설명: {payload.meta.description}\n"
-            f"후킹: {payload.script.hook_0_15s}\n"
-            f"본문1: {payload.script.body_15_150s[0].line if payload.script.body_15_150s else ''}\n"
-            f"결론: {payload.rationale_block.logic.conclusion}\n"
-        )
+        text_blob = "".join(f"{label}: {value}\n" for label, value in self._source_fields(payload))
         return (
             "너는 유튜브 콘텐츠 레퍼런스 리서처다. 한국어 JSON만 출력한다.\n"
             "목표: 입력 문맥과 가장 관련 깊은 유튜버/크리에이터 1명을 추정하고,\n"
@@ -64,38 +159,96 @@ class CreatorReferenceService:
             f"입력:\n{text_blob}"
         )
 
-    def resolve(self, payload: AssetJobCreateRequest) -> dict[str, Any]:
-        prompt = self._prompt(payload)
+    def _generate(self, prompt: str, use_search: bool) -> dict[str, Any]:
         config_kwargs: dict[str, Any] = {
             "temperature": 0.2,
             "response_mime_type": "application/json",
         }
-        if self.settings.creator_reference_search_enabled:
+        if use_search:
             config_kwargs["tools"] = [types.Tool(google_search=types.GoogleSearch())]
-
-        try:
-            response = self.client.models.generate_content(
-                model=self.settings.creator_reference_model,
-                contents=prompt,
-                config=types.GenerateContentConfig(**config_kwargs),
-            )
-            parsed = self._extract_json(response.text or "")
-            if parsed:
-                return parsed
-        except Exception:
-            pass
-
-        # Fallback without search tool.
+        deadline_ms = int(max(1.0, self.settings.creator_reference_deadline_sec) * 1000)
+        config_kwargs["http_options"] = types.HttpOptions(timeout=deadline_ms)
         response = self.client.models.generate_content(
             model=self.settings.creator_reference_model,
             contents=prompt,
-            config=types.GenerateContentConfig(
-                temperature=0.2,
-                response_mime_type="application/json",
-            ),
+            config=types.GenerateContentConfig(**config_kwargs),
         )
-        parsed = self._extract_json(response.text or "")
-        return parsed or {
+        return self._extract_json(response.text or "")
+
+    def _timed_generate(
+        self, prompt: str, use_search: bool, timings: dict[str, int]
+    ) -> dict[str, Any]:
+        started_at = time.perf_counter()
+        try:
+            return self._generate(prompt, use_search)
+        finally:
+            key = "creator_search_ms" if use_search else "creator_fallback_ms"
+            timings[key] = int((time.perf_counter() - started_at) * 1000)
+
+    def resolve(
+        self, payload: AssetJobCreateRequest, timings: dict[str, int] | None = None
+    ) -> CreatorReferenceResult:
+        """Return the memoized reference for this script, resolving it on a miss."""
+        cache_key = self.fingerprint(payload) if self.memo else ""
+        if self.memo:
+            cached = self.memo.get(cache_key)
+            if cached is not None:
+                resolved_by = str(cached.pop("resolved_by", ""))
+                return CreatorReferenceResult(reference=cached, resolved_by=resolved_by, cache_hit=True)
+        reference, resolved_by = self._resolve_uncached(payload, timings if timings is not None else {})
+        # Only memoize real answers; the empty placeholder should be retried next time.
+        if self.memo and resolved_by:
+            self.memo.put(cache_key, {**reference, "resolved_by": resolved_by})
+        return CreatorReferenceResult(reference=reference, resolved_by=resolved_by, cache_hit=False)
+
+    def _resolve_uncached(
+        self, payload: AssetJobCreateRequest, timings: dict[str, int]
+    ) -> tuple[dict[str, Any], str]:
+        """Race the search-grounded call against the plain fallback.
+
+        The fallback is started once the search call fails or has not answered
+        within `creator_reference_fallback_delay_sec`; the first usable answer
+        wins. Returns (reference, winning branch or "" for the empty placeholder).
+        Per-branch latencies are written into `timings`.
+        """
+        branches: dict[Future[dict[str, Any]], str] = {}
+        try:
+            return self._race(self._prompt(payload), branches, timings)
+        finally:
+            # A branch still queued when the race ends never needs to start.
+            for future in branches:
+                future.cancel()
+
+    def _race(
+        self, prompt: str, branches: dict[Future[dict[str, Any]], str], timings: dict[str, int]
+    ) -> tuple[dict[str, Any], str]:
+        deadline = time.monotonic() + max(1.0, self.settings.creator_reference_deadline_sec)
+        if self.settings.creator_reference_search_enabled:
+            search = self._executor.submit(self._timed_generate, prompt, True, timings)
+            branches[search] = "search"
+            done, _ = wait([search], timeout=max(0.0, self.settings.creator_reference_fallback_delay_sec))
+            if done:
+                parsed = self._branch_result(search)
+                if parsed:
+                    return parsed, "search"
+                branches.pop(search)
+        fallback = self._executor.submit(self._timed_generate, prompt, False, timings)
+        branches[fallback] = "no_search"
+
+        pending = set(branches)
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                parsed = self._branch_result(future)
+                if parsed:
+                    return parsed, branches[future]
+        if pending:
+            raise TimeoutError("Creator reference lookup exceeded its deadline.")
+        fallback.result()  # Surface the fallback error when every branch failed outright.
+        placeholder = {
             "creator_name": "",
             "confidence": 0.0,
             "reference_creator_style": "",
@@ -104,3 +257,11 @@ class CreatorReferenceService:
             "search_evidence": [],
             "search_used": False,
         }
+        return placeholder, ""
+
+    @staticmethod
+    def _branch_result(future: Future[dict[str, Any]]) -> dict[str, Any]:
+        try:
+            return future.result()
+        except Exception:
+            return {}
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+from pathlib import Path
+from threading import Lock
+
+from app.utils.files import ensure_dir, make_request_id
+
+
+class ImageCache:
+    """Content-addressed store of accepted images with LRU eviction by total bytes.
+
+    Entries are keyed by a hash of everything that determines the provider output
+    (prompt, reference image bytes, model, output size). Recency is tracked with the
+    file mtime so the LRU order survives restarts.
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: int) -> None:
+        self.cache_dir = ensure_dir(cache_dir)
+        self.max_bytes = max(0, max_bytes)
+        self._lock = Lock()
+        self._sizes: dict[Path, int] = {}
+        for entry in self.cache_dir.glob("*.png"):
+            try:
+                self._sizes[entry] = entry.stat().st_size
+            except OSError:
+                continue
+        self._total_bytes = sum(self._sizes.values())
+
+    @staticmethod
+    def make_key(prompt: str, reference_digests: list[str | None], model: str, size: tuple[int, int]) -> str:
+        """reference_digests are SHA-256 hex digests of the reference bytes, None if missing."""
+        digest = hashlib.sha256()
+        for part in (model, f"{size[0]}x{size[1]}", prompt):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        for reference_digest in reference_digests:
+            if reference_digest:
+                digest.update(bytes.fromhex(reference_digest))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _entry(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.png"
+
+    def fetch(self, key: str, output_path: Path) -> bool:
+        entry = self._entry(key)
+        with self._lock:
+            if entry not in self._sizes:
+                return False
+            try:
+                os.utime(entry)
+            except OSError:
+                self._forget(entry)
+                return False
+        ensure_dir(output_path.parent)
+        temp_path = output_path.with_name(f".{output_path.name}.{make_request_id()}")
+        try:
+            try:
+                os.link(entry, temp_path)
+            except OSError:
+                shutil.copyfile(entry, temp_path)
+            # Replace the directory entry rather than writing through an existing inode.
+            temp_path.replace(output_path)
+        except OSError:
+            temp_path.unlink(missing_ok=True)
+            return False
+        return True
+
+    def store(self, key: str, source_path: Path) -> None:
+        if self.max_bytes <= 0:
+            return
+        entry = self._entry(key)
+        size = source_path.stat().st_size
+        if size > self.max_bytes:
+            return
+        temp_path = entry.with_name(f".{entry.name}.{make_request_id()}")
+        # Copy instead of linking so later in-place edits of the job file cannot touch the cache.
+        shutil.copyfile(source_path, temp_path)
+        temp_path.replace(entry)
+        with self._lock:
+            self._total_bytes += size - self._sizes.get(entry, 0)
+            self._sizes[entry] = size
+            self._evict()
+
+    def _forget(self, entry: Path) -> None:
+        self._total_bytes -= self._sizes.pop(entry, 0)
+
+    def _evict(self) -> None:
+        if self._total_bytes <= self.max_bytes:
+            return
+
+        def mtime(entry: Path) -> float:
+            try:
+                return entry.stat().st_mtime
+            except OSError:
+                return 0.0
+
+        for entry in sorted(self._sizes, key=mtime):
+            if self._total_bytes <= self.max_bytes:
+                break
+            entry.unlink(missing_ok=True)
+            self._forget(entry)
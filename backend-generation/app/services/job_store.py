@@ -1,8 +1,16 @@
 from __future__ import annotations
 
-from dataclasses import asdict, dataclass, field
-from threading import Lock
-from typing import Literal
+import asyncio
+import json
+import sqlite3
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field, fields
+from pathlib import Path
+from threading import Lock, local
+from typing import Any, Literal
+
+from app.config import get_settings
 
 
 @dataclass
@@ -17,21 +25,127 @@ class JobRecord:
     alt_video_path: str | None = None
     result_path: str = ""
     error_message: str | None = None
+    created_at: float = field(default_factory=time.time)
+
+
+RECORD_FIELDS = tuple(f.name for f in fields(JobRecord))
+TERMINAL_STATUSES = ("succeeded", "failed")
+
+
+class JobEventHub:
+    """Per-job version counters that wake waiters on every state transition.
+
+    Stores publish after each write, from whichever thread wrote. A waiter reads the
+    version, then the record, and waits for the version to move past what it read, so no
+    transition can slip between the read and the wait. Waiters are futures resolved on
+    their own event loop, so nobody holds a worker thread while a job runs.
+
+    Live jobs keep their version in _versions. Once a job is terminal and its waiters are
+    woken, its last version moves to a bounded LRU, so memory stays flat while a late
+    waiter still sees the job as changed. Versions come from one hub-wide counter, so a
+    resumed job never reuses a version it had before. A job never published since startup
+    reports 0 and wakes on its first publish.
+    """
+
+    def __init__(self, max_finished: int = 4096) -> None:
+        self._lock = Lock()
+        self._clock = 0
+        self._versions: dict[str, int] = {}
+        self._finished: OrderedDict[str, int] = OrderedDict()
+        self._max_finished = max(1, max_finished)
+        self._futures: dict[str, list[tuple[asyncio.AbstractEventLoop, asyncio.Future[int]]]] = {}
+
+    def version(self, job_id: str) -> int:
+        with self._lock:
+            return self._current(job_id)
+
+    def _current(self, job_id: str) -> int:
+        version = self._versions.get(job_id)
+        if version is None:
+            version = self._finished.get(job_id, 0)
+        return version
+
+    def publish(self, job_id: str, terminal: bool = False) -> None:
+        with self._lock:
+            self._clock += 1
+            version = self._clock
+            futures = self._futures.pop(job_id, [])
+            if terminal:
+                # Every waiter is resolved below, so only the final version is kept.
+                self._versions.pop(job_id, None)
+                self._finished[job_id] = version
+                self._finished.move_to_end(job_id)
+                while len(self._finished) > self._max_finished:
+                    self._finished.popitem(last=False)
+            else:
+                self._finished.pop(job_id, None)
+                self._versions[job_id] = version
+        for loop, future in futures:
+            try:
+                loop.call_soon_threadsafe(_resolve_future, future, version)
+            except RuntimeError:
+                pass  # The waiter's loop is already closed.
+
+    async def wait(self, job_id: str, after_version: int, timeout_sec: float) -> int:
+        """Await the next change past after_version without holding a worker thread."""
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[int] = loop.create_future()
+        entry = (loop, future)
+        with self._lock:
+            current = self._current(job_id)
+            if current > after_version:
+                return current
+            self._futures.setdefault(job_id, []).append(entry)
+        try:
+            return await asyncio.wait_for(future, timeout_sec)
+        except TimeoutError:
+            return self.version(job_id)
+        finally:
+            with self._lock:
+                waiters = self._futures.get(job_id)
+                if waiters and entry in waiters:
+                    waiters.remove(entry)
+                    if not waiters:
+                        del self._futures[job_id]
+
+
+def _resolve_future(future: asyncio.Future[int], version: int) -> None:
+    if not future.done():
+        future.set_result(version)
 
 
 class JobStore:
-    def __init__(self) -> None:
+    def __init__(self, events: JobEventHub | None = None) -> None:
+        self.events = events or JobEventHub()
         self._lock = Lock()
         self._jobs: dict[str, JobRecord] = {}
+        self._payloads: dict[str, dict[str, Any]] = {}
 
-    def put(self, record: JobRecord) -> None:
+    def put(self, record: JobRecord, payload: dict[str, Any] | None = None) -> None:
         with self._lock:
             self._jobs[record.job_id] = record
+            if payload is not None:
+                self._payloads[record.job_id] = payload
+        self.events.publish(record.job_id, terminal=record.status in TERMINAL_STATUSES)
+
+    def put_if_absent(self, record: JobRecord, payload: dict[str, Any] | None = None) -> bool:
+        with self._lock:
+            if record.job_id in self._jobs:
+                return False
+            self._jobs[record.job_id] = record
+            if payload is not None:
+                self._payloads[record.job_id] = payload
+        self.events.publish(record.job_id, terminal=record.status in TERMINAL_STATUSES)
+        return True
 
     def get(self, job_id: str) -> JobRecord | None:
         with self._lock:
             return self._jobs.get(job_id)
 
+    def get_payload(self, job_id: str) -> dict[str, Any] | None:
+        with self._lock:
+            return self._payloads.get(job_id)
+
     def update(self, job_id: str, **fields: object) -> JobRecord:
         with self._lock:
             if job_id not in self._jobs:
@@ -39,9 +153,189 @@ class JobStore:
             record = self._jobs[job_id]
             for key, value in fields.items():
                 setattr(record, key, value)
-            return record
+        self.events.publish(job_id, terminal=record.status in TERMINAL_STATUSES)
+        return record
+
+    def compare_and_update(self, job_id: str, expected_status: str, **fields: object) -> bool:
+        """Apply fields only if the job is currently in expected_status."""
+        with self._lock:
+            record = self._jobs.get(job_id)
+            if record is None or record.status != expected_status:
+                return False
+            for key, value in fields.items():
+                setattr(record, key, value)
+        self.events.publish(job_id, terminal=record.status in TERMINAL_STATUSES)
+        return True
 
     def asdict(self, job_id: str) -> dict:
         with self._lock:
             record = self._jobs[job_id]
             return asdict(record)
+
+    def list_by_status(self, status: str) -> list[JobRecord]:
+        with self._lock:
+            records = [r for r in self._jobs.values() if r.status == status]
+        return sorted(records, key=lambda r: r.created_at)
+
+    def fail_running(self, error_message: str) -> list[str]:
+        # Nothing survives a restart in memory, so there is never anything to fail.
+        return []
+
+
+class SqliteJobStore:
+    """JobStore backed by a local SQLite file in WAL mode.
+
+    Each thread keeps its own connection so status reads never wait on the
+    writer lock; WAL lets them proceed while a write transaction is open.
+    """
+
+    def __init__(self, db_path: Path, events: JobEventHub | None = None) -> None:
+        self.events = events or JobEventHub()
+        self.db_path = db_path
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._write_lock = Lock()
+        self._local = local()
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                stage TEXT NOT NULL,
+                progress INTEGER NOT NULL,
+                pipeline_mode TEXT NOT NULL,
+                output_mode TEXT NOT NULL,
+                video_path TEXT,
+                alt_video_path TEXT,
+                result_path TEXT NOT NULL,
+                error_message TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                payload TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status);
+            CREATE INDEX IF NOT EXISTS idx_jobs_created_at ON jobs (created_at);
+            """
+        )
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30.0, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _to_record(row: tuple[Any, ...]) -> JobRecord:
+        return JobRecord(**dict(zip(RECORD_FIELDS, row)))
+
+    def put(self, record: JobRecord, payload: dict[str, Any] | None = None) -> None:
+        self._insert("INSERT OR REPLACE", record, payload)
+
+    def put_if_absent(self, record: JobRecord, payload: dict[str, Any] | None = None) -> bool:
+        return self._insert("INSERT OR IGNORE", record, payload)
+
+    def _insert(self, verb: str, record: JobRecord, payload: dict[str, Any] | None) -> bool:
+        values = asdict(record)
+        columns = [*RECORD_FIELDS, "updated_at", "payload"]
+        params = [
+            *(values[name] for name in RECORD_FIELDS),
+            time.time(),
+            json.dumps(payload, ensure_ascii=False) if payload is not None else None,
+        ]
+        placeholders = ", ".join("?" for _ in columns)
+        with self._write_lock:
+            cursor = self._conn().execute(
+                f"{verb} INTO jobs ({', '.join(columns)}) VALUES ({placeholders})",
+                params,
+            )
+        if cursor.rowcount == 0:
+            return False
+        self.events.publish(record.job_id, terminal=record.status in TERMINAL_STATUSES)
+        return True
+
+    def get(self, job_id: str) -> JobRecord | None:
+        row = self._conn().execute(
+            f"SELECT {', '.join(RECORD_FIELDS)} FROM jobs WHERE job_id = ?", (job_id,)
+        ).fetchone()
+        return self._to_record(row) if row else None
+
+    def get_payload(self, job_id: str) -> dict[str, Any] | None:
+        row = self._conn().execute("SELECT payload FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        if not row or not row[0]:
+            return None
+        return json.loads(row[0])
+
+    def update(self, job_id: str, **fields: object) -> JobRecord:
+        if not self._update_where(job_id, None, fields):
+            raise KeyError(job_id)
+        record = self.get(job_id)
+        if record is None:
+            raise KeyError(job_id)
+        return record
+
+    def compare_and_update(self, job_id: str, expected_status: str, **fields: object) -> bool:
+        """Apply fields only if the job is currently in expected_status."""
+        return self._update_where(job_id, expected_status, fields)
+
+    def _update_where(self, job_id: str, expected_status: str | None, fields: dict[str, object]) -> bool:
+        unknown = set(fields) - set(RECORD_FIELDS)
+        if unknown:
+            raise AttributeError(f"Unknown job fields: {sorted(unknown)}")
+        assignments = "".join(f"{key} = ?, " for key in fields)
+        sql = f"UPDATE jobs SET {assignments}updated_at = ? WHERE job_id = ?"
+        params = [*fields.values(), time.time(), job_id]
+        if expected_status is not None:
+            sql += " AND status = ?"
+            params.append(expected_status)
+        with self._write_lock:
+            cursor = self._conn().execute(sql, params)
+        if cursor.rowcount == 0:
+            return False
+        self.events.publish(job_id, terminal=fields.get("status") in TERMINAL_STATUSES)
+        return True
+
+    def asdict(self, job_id: str) -> dict:
+        record = self.get(job_id)
+        if record is None:
+            raise KeyError(job_id)
+        return asdict(record)
+
+    def list_by_status(self, status: str) -> list[JobRecord]:
+        rows = self._conn().execute(
+            f"SELECT {', '.join(RECORD_FIELDS)} FROM jobs WHERE status = ? ORDER BY created_at",
+            (status,),
+        ).fetchall()
+        return [self._to_record(row) for row in rows]
+
+    def fail_running(self, error_message: str) -> list[str]:
+        with self._write_lock:
+            conn = self._conn()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                job_ids = [
+                    row[0]
+                    for row in conn.execute("SELECT job_id FROM jobs WHERE status = 'running'")
+                ]
+                conn.execute(
+                    "UPDATE jobs SET status = 'failed', stage = 'failed', progress = 100, "
+                    "error_message = ?, updated_at = ? WHERE status = 'running'",
+                    (error_message, time.time()),
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        for job_id in job_ids:
+            self.events.publish(job_id, terminal=True)
+        return job_ids
+
+
+def create_job_store() -> JobStore | SqliteJobStore:
+    settings = get_settings()
+    if settings.job_store_backend == "sqlite":
+        return SqliteJobStore(Path(settings.job_store_path))
+    return JobStore()
@@ -0,0 +1,139 @@
+"""Shared poller for long-running Vertex operations (Veo renders)."""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import random
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from functools import lru_cache
+from threading import Condition, Thread
+from typing import Any, Callable
+
+from app.config import get_settings
+
+# operations.get failures in a row before the operation is given up on.
+MAX_CONSECUTIVE_POLL_ERRORS = 5
+
+
+@dataclass
+class _TrackedOperation:
+    operation: Any
+    refresh: Callable[[Any], Any]
+    future: Future[Any]
+    deadline: float
+    delay: float
+    polls: int = 0
+    errors: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+
+
+class OperationPoller:
+    """One daemon thread that polls every outstanding operation on its own schedule.
+
+    Each operation is polled with exponential backoff plus jitter, so concurrent renders
+    do not poll in lockstep, and fails with TimeoutError at a wall-clock deadline. Callers
+    get a Future and hold no thread while the operation runs.
+    """
+
+    def __init__(
+        self,
+        initial_delay_sec: float = 5.0,
+        max_delay_sec: float = 30.0,
+        multiplier: float = 1.5,
+        jitter: float = 0.2,
+    ) -> None:
+        self.initial_delay_sec = max(0.01, initial_delay_sec)
+        self.max_delay_sec = max(self.initial_delay_sec, max_delay_sec)
+        self.multiplier = max(1.0, multiplier)
+        self.jitter = min(max(jitter, 0.0), 1.0)
+        self._cond = Condition()
+        self._heap: list[tuple[float, int, _TrackedOperation]] = []
+        self._seq = itertools.count()
+        self._thread: Thread | None = None
+
+    def track(
+        self,
+        operation: Any,
+        refresh: Callable[[Any], Any],
+        deadline_sec: float,
+    ) -> Future[Any]:
+        """Poll operation via refresh until done; the Future resolves to the final operation."""
+        future: Future[Any] = Future()
+        future.set_running_or_notify_cancel()
+        if getattr(operation, "done", False):
+            future.set_result(operation)
+            return future
+        now = time.monotonic()
+        tracked = _TrackedOperation(
+            operation=operation,
+            refresh=refresh,
+            future=future,
+            deadline=now + max(0.0, deadline_sec),
+            delay=self.initial_delay_sec,
+        )
+        self._schedule(tracked, min(tracked.deadline, now + self._jittered(tracked.delay)))
+        return future
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._heap)
+
+    def _jittered(self, delay: float) -> float:
+        return delay * random.uniform(1.0 - self.jitter, 1.0 + self.jitter)
+
+    def _schedule(self, tracked: _TrackedOperation, poll_at: float) -> None:
+        with self._cond:
+            heapq.heappush(self._heap, (poll_at, next(self._seq), tracked))
+            if self._thread is None:
+                self._thread = Thread(target=self._run, name="operation-poller", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._heap or self._heap[0][0] > time.monotonic():
+                    timeout = self._heap[0][0] - time.monotonic() if self._heap else None
+                    self._cond.wait(timeout)
+                _, _, tracked = heapq.heappop(self._heap)
+            self._poll(tracked)
+
+    def _poll(self, tracked: _TrackedOperation) -> None:
+        try:
+            tracked.operation = tracked.refresh(tracked.operation)
+            tracked.polls += 1
+            tracked.errors = 0
+        except Exception as exc:
+            tracked.errors += 1
+            if tracked.errors >= MAX_CONSECUTIVE_POLL_ERRORS:
+                tracked.future.set_exception(exc)
+                return
+        else:
+            if getattr(tracked.operation, "done", False):
+                tracked.future.set_result(tracked.operation)
+                return
+
+        now = time.monotonic()
+        if now >= tracked.deadline:
+            elapsed = now - tracked.started_at
+            tracked.future.set_exception(
+                TimeoutError(f"Vertex operation not done after {elapsed:.0f}s ({tracked.polls} polls).")
+            )
+            return
+        tracked.delay = min(self.max_delay_sec, tracked.delay * self.multiplier)
+        # The last poll lands on the deadline itself rather than past it.
+        self._schedule(tracked, min(tracked.deadline, now + self._jittered(tracked.delay)))
+
+
+@lru_cache
+def get_operation_poller() -> OperationPoller:
+    settings = get_settings()
+    return OperationPoller(
+        initial_delay_sec=settings.veo_poll_initial_sec,
+        max_delay_sec=settings.veo_poll_max_sec,
+        multiplier=settings.veo_poll_multiplier,
+        jitter=settings.veo_poll_jitter,
+    )
@@ -1,14 +1,19 @@
 from __future__ import annotations
 
+import asyncio
+import io
 import json
-import re
 import time
-from concurrent.futures import ThreadPoolExecutor
+from collections.abc import AsyncIterator, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from pathlib import Path
+from contextlib import contextmanager
+from threading import Lock
 from typing import Any, Literal
 
-from moviepy import ImageClip, concatenate_videoclips
+from PIL import Image
 
+from app.clients import ClientRegistry, get_client_registry
 from app.config import get_settings
 from app.schemas import (
     AssetJobCreateRequest,
@@ -16,7 +21,9 @@ from app.schemas import (
     AssetJobStatusResponse,
     JobResultResponse,
 )
-from app.services.job_store import JobRecord, JobStore
+from app.services.checkpoint import StageCheckpoint
+from app.services.image_cache import ImageCache
+from app.services.job_store import TERMINAL_STATUSES, JobRecord, create_job_store
 from app.services.creator_reference import CreatorReferenceService
 from app.services.prompt_builder import (
     FRAME_COUNT,
@@ -29,34 +36,84 @@ from app.services.prompt_builder import (
     build_thumbnail_prompt,
     serialize_scene_plan,
 )
-from app.services.scene_planner import ScenePlannerService
+from app.services.rate_limiter import is_resource_exhausted
+from app.services.scheduler import ResourceClass, StageScheduler
+from app.services.scene_planner import ScenePlannerService, dump_scene_plan, load_scene_plan
+from app.services.slideshow import compose_slideshow
+from app.services.text_guard import TextGuard
 from app.services.vertex_provider import VertexProvider
 from app.utils.files import atomic_write_json, ensure_dir, make_request_id
 
 PipelineMode = Literal["storyboard", "storyboard_to_video"]
 
 
+def _elapsed_ms(started_at: float) -> int:
+    return int((time.perf_counter() - started_at) * 1000)
+
+
+class JobStateError(RuntimeError):
+    """Raised when a job cannot be resumed from its current status."""
+
+
 class PipelineService:
-    def __init__(self) -> None:
+    def __init__(self, clients: ClientRegistry | None = None) -> None:
         self.settings = get_settings()
         self.generated_dir = Path(self.settings.generated_dir)
         ensure_dir(self.generated_dir)
-        self.store = JobStore()
-        self.provider = VertexProvider()
-        self.scene_planner = ScenePlannerService()
-        self.creator_reference = CreatorReferenceService()
-        self.executor = ThreadPoolExecutor(max_workers=self.settings.max_worker_jobs)
-        self._ocr_warning = ""
-        try:
-            import pytesseract
-
-            _ = pytesseract.get_tesseract_version()
-            self._pytesseract = pytesseract
-            self._ocr_available = True
-        except Exception as exc:
-            self._pytesseract = None
-            self._ocr_available = False
-            self._ocr_warning = f"OCR unavailable: {exc}"
+        self.store = create_job_store()
+        clients = clients or get_client_registry()
+        genai_client = clients.genai()
+        self.provider = VertexProvider(client=genai_client, http_client=clients.http)
+        self.scene_planner = ScenePlannerService(client=genai_client)
+        self.creator_reference = CreatorReferenceService(client=genai_client)
+        self.scheduler = StageScheduler(self.settings)
+        active_jobs = max(1, self.settings.max_active_jobs)
+        self.planning_executor = ThreadPoolExecutor(
+            max_workers=max(2, active_jobs),
+            thread_name_prefix="planning",
+        )
+        # Sized for every active job; the scheduler's image/cpu slots bound the real concurrency.
+        self.frame_executor = ThreadPoolExecutor(
+            max_workers=max(1, self.settings.max_frame_workers) * active_jobs,
+            thread_name_prefix="frame",
+        )
+        self.image_cache: ImageCache | None = None
+        if self.settings.image_cache_enabled:
+            self.image_cache = ImageCache(
+                Path(self.settings.image_cache_dir or self.generated_dir / ".image_cache"),
+                max_bytes=self.settings.image_cache_max_bytes,
+            )
+        # Guards provider_trace/text_guard_summary, which frame workers mutate concurrently.
+        self._trace_lock = Lock()
+        self.text_guard = TextGuard(self.settings)
+        self._ocr_available = self.text_guard.available
+        self._ocr_warning = self.text_guard.warning
+        self._recover_jobs()
+
+    def _recover_jobs(self) -> None:
+        # Jobs that were mid-flight when the process died cannot be trusted; queued ones never started.
+        self.store.fail_running("Job interrupted by backend restart.")
+        for record in self.store.list_by_status("queued"):
+            raw_payload = self.store.get_payload(record.job_id)
+            mode: PipelineMode = (
+                "storyboard_to_video" if record.pipeline_mode == "storyboard_to_video" else "storyboard"
+            )
+            try:
+                payload = AssetJobCreateRequest.model_validate(raw_payload)
+            except Exception as exc:
+                self.store.update(
+                    record.job_id,
+                    status="failed",
+                    stage="failed",
+                    progress=100,
+                    error_message=f"Queued job could not be resumed: {exc}",
+                )
+                continue
+            # Resuming is a no-op for jobs that never started and keeps finished stages otherwise.
+            # Recovered jobs were already admitted once, so they bypass the queue-depth limit.
+            self.scheduler.submit(
+                mode, self._run_job, record.job_id, payload, mode, True, enforce_limit=False
+            )
 
     def create_job(
         self, payload: AssetJobCreateRequest, mode: PipelineMode = "storyboard"
@@ -71,8 +128,16 @@ class PipelineService:
             pipeline_mode=mode,
             result_path=f"/generated/{job_id}/result.json",
         )
-        self.store.put(record)
-        self.executor.submit(self._run_job, job_id, payload, mode)
+        raw_payload = payload.model_dump(mode="json")
+        # Admission comes first so a rejected (429) request leaves no record or directory behind.
+        self.scheduler.reserve(mode)
+        try:
+            atomic_write_json(self.generated_dir / job_id / "request.json", raw_payload)
+            self.store.put(record, payload=raw_payload)
+        except BaseException:
+            self.scheduler.unreserve(mode)
+            raise
+        self.scheduler.dispatch(mode, self._run_job, job_id, payload, mode, False)
         return AssetJobCreateResponse(
             job_id=job_id,
             status="queued",
@@ -81,12 +146,86 @@ class PipelineService:
             pipeline_mode=mode,
         )
 
+    def resume_job(self, job_id: str) -> AssetJobCreateResponse:
+        status = self.get_status(job_id)
+        if status.status != "failed":
+            raise JobStateError(f"Only failed jobs can be resumed (current status: {status.status}).")
+        raw_payload = self.store.get_payload(job_id)
+        request_file = self.generated_dir / job_id / "request.json"
+        if raw_payload is None and request_file.exists():
+            raw_payload = json.loads(request_file.read_text(encoding="utf-8"))
+        if raw_payload is None:
+            raise FileNotFoundError(job_id)
+        payload = AssetJobCreateRequest.model_validate(raw_payload)
+        mode: PipelineMode = (
+            "storyboard_to_video" if status.pipeline_mode == "storyboard_to_video" else "storyboard"
+        )
+        result_path = f"/generated/{job_id}/result.json"
+        fields = {
+            "status": "queued",
+            "stage": "queued",
+            "progress": 0,
+            "pipeline_mode": mode,
+            "error_message": None,
+        }
+        # A full queue rejects the resume before the job leaves its failed state.
+        self.scheduler.reserve(mode)
+        # Claim the job atomically so concurrent resumes cannot start two coordinators.
+        try:
+            if self.store.get(job_id):
+                claimed = self.store.compare_and_update(job_id, "failed", **fields)
+            else:
+                claimed = self.store.put_if_absent(
+                    JobRecord(job_id=job_id, result_path=result_path, **fields), payload=raw_payload
+                )
+        except BaseException:
+            self.scheduler.unreserve(mode)
+            raise
+        if not claimed:
+            self.scheduler.unreserve(mode)
+            raise JobStateError("Job is already being resumed.")
+        self.scheduler.dispatch(mode, self._run_job, job_id, payload, mode, True)
+        return AssetJobCreateResponse(
+            job_id=job_id,
+            status="queued",
+            status_path=f"/api/assets/jobs/{job_id}",
+            result_path=result_path,
+            pipeline_mode=mode,
+        )
+
+    @contextmanager
+    def _stage(
+        self, resource: ResourceClass, priority: int, provider_trace: dict[str, Any]
+    ) -> Iterator[None]:
+        with self.scheduler.stage(resource, priority) as waited_ms:
+            with self._trace_lock:
+                provider_trace["stage_wait_ms"][resource] += waited_ms
+            yield
+
     def get_status(self, job_id: str) -> AssetJobStatusResponse:
         record = self.store.get(job_id)
         if not record:
-            raise KeyError(job_id)
+            return self._status_from_result_file(job_id)
         return AssetJobStatusResponse(**self.store.asdict(job_id))
 
+    def _status_from_result_file(self, job_id: str) -> AssetJobStatusResponse:
+        result_file = self.generated_dir / job_id / "result.json"
+        if not result_file.exists():
+            raise KeyError(job_id)
+        payload = json.loads(result_file.read_text(encoding="utf-8"))
+        succeeded = payload.get("status") == "succeeded"
+        return AssetJobStatusResponse(
+            job_id=job_id,
+            status="succeeded" if succeeded else "failed",
+            stage="done" if succeeded else "failed",
+            progress=100,
+            pipeline_mode=payload.get("pipeline_mode", "unknown"),
+            output_mode=payload.get("output_mode", "unknown"),
+            video_path=payload.get("files", {}).get("video_path"),
+            result_path=f"/generated/{job_id}/result.json",
+            error_message=payload.get("error_message"),
+        )
+
     def get_result(self, job_id: str) -> JobResultResponse:
         result_file = self.generated_dir / job_id / "result.json"
         if not result_file.exists():
@@ -94,26 +233,53 @@ class PipelineService:
         payload = json.loads(result_file.read_text(encoding="utf-8"))
         return JobResultResponse(**payload)
 
-    def wait_for_legacy(
+    async def wait_for_change(self, job_id: str, timeout_sec: float) -> AssetJobStatusResponse:
+        """Return the status after the job's next transition, or as-is if terminal or timed out."""
+        version = self.store.events.version(job_id)
+        # Status reads hit SQLite or result.json, so they run off the event loop.
+        status = await asyncio.to_thread(self.get_status, job_id)
+        if status.status in TERMINAL_STATUSES or timeout_sec <= 0:
+            return status
+        await self.store.events.wait(job_id, version, timeout_sec)
+        return await asyncio.to_thread(self.get_status, job_id)
+
+    async def stream_status(
+        self, job_id: str, heartbeat_sec: float = 15.0
+    ) -> AsyncIterator[AssetJobStatusResponse | None]:
+        """Yield the current status, then one per transition until terminal; None is a heartbeat."""
+        version = self.store.events.version(job_id)
+        status = await asyncio.to_thread(self.get_status, job_id)
+        yield status
+        while status.status not in TERMINAL_STATUSES:
+            next_version = await self.store.events.wait(job_id, version, heartbeat_sec)
+            if next_version == version:
+                yield None
+                continue
+            # Transitions that land between two reads collapse into the latest state.
+            version = next_version
+            status = await asyncio.to_thread(self.get_status, job_id)
+            yield status
+
+    async def wait_for_legacy(
         self,
         payload: AssetJobCreateRequest,
         mode: PipelineMode = "storyboard",
         timeout_sec: int = 90,
     ) -> tuple[int, dict]:
-        created = self.create_job(payload, mode=mode)
-        deadline = time.time() + timeout_sec
-        while time.time() < deadline:
-            status = self.get_status(created.job_id)
-            if status.status == "succeeded":
-                return 200, {
-                    "request_id": created.job_id,
-                    "thumbnail_path": f"/generated/{created.job_id}/thumbnail.png",
-                    "video_path": f"/generated/{created.job_id}/preview_v1.mp4",
-                    "result_path": f"/generated/{created.job_id}/result.json",
-                }
-            if status.status == "failed":
-                return 500, {"detail": status.error_message or "Job failed."}
-            time.sleep(1.5)
+        created = await asyncio.to_thread(self.create_job, payload, mode)
+        deadline = time.monotonic() + timeout_sec
+        status = await asyncio.to_thread(self.get_status, created.job_id)
+        while status.status not in TERMINAL_STATUSES and time.monotonic() < deadline:
+            status = await self.wait_for_change(created.job_id, deadline - time.monotonic())
+        if status.status == "succeeded":
+            return 200, {
+                "request_id": created.job_id,
+                "thumbnail_path": f"/generated/{created.job_id}/thumbnail.png",
+                "video_path": f"/generated/{created.job_id}/preview_v1.mp4",
+                "result_path": f"/generated/{created.job_id}/result.json",
+            }
+        if status.status == "failed":
+            return 500, {"detail": status.error_message or "Job failed."}
         return 202, {
             "job_id": created.job_id,
             "status": "running",
@@ -121,7 +287,13 @@ class PipelineService:
             "result_path": created.result_path,
         }
 
-    def _run_job(self, job_id: str, payload: AssetJobCreateRequest, mode: PipelineMode) -> None:
+    def _run_job(
+        self,
+        job_id: str,
+        payload: AssetJobCreateRequest,
+        mode: PipelineMode,
+        resume: bool = False,
+    ) -> None:
         out_dir = ensure_dir(self.generated_dir / job_id)
         frames_dir = ensure_dir(out_dir / "frames")
 
@@ -148,7 +320,14 @@ class PipelineService:
             "text_guard_retries": 0,
             "text_guard_blocked_frames": [],
             "image_backoff_retries": 0,
+            "image_cache_hits": 0,
+            "image_cache_misses": 0,
+            "image_batch_calls": 0,
+            "image_batch_frames": 0,
+            "image_batch_fallback_frames": 0,
+            "stage_wait_ms": {"llm": 0, "image": 0, "cpu": 0, "veo": 0},
         }
+        priority = self.scheduler.priority_for(mode)
         veo_trace: dict[str, str | int | bool] = {"attempted": False, "success": False}
         frame_count = 0
         storyboard_scene_plan: list[dict[str, str | list[str]]] = []
@@ -156,174 +335,34 @@ class PipelineService:
         character_bible: dict[str, str | list[str]] = {}
         creator_reference: dict[str, Any] = {}
         partial_result = False
-        text_guard_summary: dict[str, int | list[str] | bool | str] = {
+        text_guard_summary: dict[str, Any] = {
             "thumbnail_retries": 0,
             "frame_retries": 0,
             "blocked_frames": [],
             "image_backoff_retries": 0,
             "ocr_available": self._ocr_available,
             "ocr_warning": self._ocr_warning,
+            "ocr_checked": 0,
+            "ocr_skipped": 0,
+            "ocr_skip_rate": 0.0,
+            "ocr_total_ms": 0,
+            "ocr_ms": {},
         }
 
-        try:
-            self.store.update(job_id, status="running", stage="planning", progress=5, pipeline_mode=mode)
-            try:
-                creator_reference = self.creator_reference.resolve(payload)
-                atomic_write_json(creator_reference_path, creator_reference)
-            except Exception as exc:
-                creator_reference = {"search_used": False, "error": str(exc)}
-            provider_trace["creator_search_called"] = True
-
-            scene_plan = self.scene_planner.plan(payload, creator_reference=creator_reference)
-            provider_trace["scene_planner_called"] = True
-            character_bible = {
-                str(k): v if isinstance(v, list) else str(v)
-                for k, v in scene_plan.character_bible.items()
-            }
-
-            storyboard_scene_plan = serialize_scene_plan(scene_plan)
-            scene_sources = [scene.source_span for scene in scene_plan.scenes]
-            atomic_write_json(
-                scene_plan_path,
-                {
-                    "character_bible": scene_plan.character_bible,
-                    "consistency_rules": scene_plan.consistency_rules,
-                    "thumbnail_plan": scene_plan.thumbnail_plan,
-                    "scene_plan": storyboard_scene_plan,
-                },
-            )
-
-            strategy_packet = {
-                "source_signal_id": payload.meta.source_signal_id,
-                "title": payload.script.title,
-                "hook": payload.script.hook_0_15s,
-                "key_messages": payload.assets.on_screen_bullets[:3],
-                "conclusion": payload.rationale_block.logic.conclusion,
-            }
-            atomic_write_json(strategy_packet_path, strategy_packet)
-            production_notes_path.write_text(build_production_notes_ko(), encoding="utf-8")
-
-            self.store.update(job_id, stage="thumbnail", progress=15)
-            thumb_prompt = build_thumbnail_prompt(payload, scene_plan)
-            self._generate_guarded_image(
-                prompt=thumb_prompt,
-                output_path=thumbnail_path,
-                provider_trace=provider_trace,
-                text_guard_summary=text_guard_summary,
-                max_allowed_chars=self.settings.max_allowed_text_chars_thumbnail,
-                retry_label="thumbnail_retries",
-            )
-
-            self.store.update(job_id, stage="anchor", progress=25)
-            anchor_prompt = build_character_anchor_prompt(scene_plan)
-            self._generate_guarded_image(
-                prompt=anchor_prompt,
-                output_path=character_anchor_path,
-                provider_trace=provider_trace,
-                text_guard_summary=text_guard_summary,
-                max_allowed_chars=self.settings.max_allowed_text_chars_frame,
-                retry_label="frame_retries",
-            )
-
-            self.store.update(job_id, stage="storyboard", progress=40)
-            frame_count = FRAME_COUNT
-            frame_prompts, scene_sources = build_storyboard_prompts(scene_plan)
-            frame_paths: list[Path] = []
-            for idx, prompt in enumerate(frame_prompts, start=1):
-                frame_path = frames_dir / f"frame_{idx:02d}.png"
-                self._generate_guarded_image(
-                    prompt=prompt,
-                    output_path=frame_path,
-                    provider_trace=provider_trace,
-                    text_guard_summary=text_guard_summary,
-                    max_allowed_chars=self.settings.max_allowed_text_chars_frame,
-                    retry_label="frame_retries",
-                    reference_images=[character_anchor_path],
-                    frame_name=f"frame_{idx:02d}",
-                )
-                frame_paths.append(frame_path)
-
-            self._compose_slideshow_video(
-                frame_paths=frame_paths,
-                output_path=preview_path,
-                duration_sec=options.max_video_seconds,
-            )
-            quality_scores["storyboard_video_quality_score"] = 0.60
+        checkpoint = StageCheckpoint(out_dir)
+        if not resume:
+            checkpoint.reset()
+        skipped_stages: list[str] = []
+        provider_trace["resumed"] = resume
+        provider_trace["skipped_stages"] = skipped_stages
 
-            output_mode: str = "storyboard"
-            video_public_path = f"/generated/{job_id}/preview_v1.mp4"
-            if mode == "storyboard_to_video":
-                self.store.update(job_id, stage="veo", progress=80)
-                attempts["video_attempts"] = 1
-                veo_trace["attempted"] = True
-                provider_trace["video_called"] = True
-                veo_prompt = build_storyboard_summary_for_veo(payload, scene_plan)
-                try:
-                    self.provider.generate_video(
-                        prompt=veo_prompt,
-                        output_path=veo_path,
-                        duration_sec=options.max_video_seconds,
-                        image_path=frame_paths[0] if frame_paths else None,
-                    )
-                    veo_trace["success"] = True
-                    output_mode = "storyboard_to_video"
-                    video_public_path = f"/generated/{job_id}/veo_v1.mp4"
-                    quality_scores["veo_video_quality_score"] = 0.70
-                except Exception as exc:
-                    partial_result = True
-                    veo_trace["success"] = False
-                    veo_trace["error"] = str(exc)
-                    raise RuntimeError(f"Veo generation failed after storyboard success: {exc}") from exc
+        def reuse(stage: str) -> bool:
+            if resume and checkpoint.is_valid(stage):
+                skipped_stages.append(stage)
+                return True
+            return False
 
-            result_payload = {
-                "job_id": job_id,
-                "status": "succeeded",
-                "pipeline_mode": mode,
-                "output_mode": output_mode,
-                "quality_scores": quality_scores,
-                "files": {
-                    "thumbnail_path": f"/generated/{job_id}/thumbnail.png",
-                    "video_path": video_public_path,
-                    "storyboard_video_path": f"/generated/{job_id}/preview_v1.mp4",
-                    "veo_video_path": f"/generated/{job_id}/veo_v1.mp4",
-                    "result_path": f"/generated/{job_id}/result.json",
-                    "strategy_packet_path": f"/generated/{job_id}/strategy_packet.json",
-                    "production_notes_path": f"/generated/{job_id}/production_notes.md",
-                    "scene_plan_path": f"/generated/{job_id}/scene_plan.json",
-                    "character_anchor_path": f"/generated/{job_id}/character_anchor.png",
-                    "creator_reference_path": f"/generated/{job_id}/creator_reference.json",
-                },
-                "attempts": attempts,
-                "fallback_reason": fallback_reason,
-                "provider_trace": provider_trace,
-                "prompt_version": PROMPT_VERSION,
-                "frame_count": frame_count,
-                "style_bible_applied": True,
-                "script_grounding_applied": True,
-                "scene_sources": scene_sources,
-                "storyboard_scene_plan": storyboard_scene_plan,
-                "image_model": self.settings.gcp_vertex_image_model,
-                "scene_planner_model": self.settings.scene_planner_model,
-                "character_bible": character_bible,
-                "creator_reference": creator_reference,
-                "scene_plan_path": f"/generated/{job_id}/scene_plan.json",
-                "character_anchor_path": f"/generated/{job_id}/character_anchor.png",
-                "text_guard_enabled": True,
-                "text_guard_summary": text_guard_summary,
-                "veo_trace": veo_trace,
-                "partial_result": partial_result,
-            }
-            atomic_write_json(result_path, result_payload)
-            self.store.update(
-                job_id,
-                status="succeeded",
-                stage="done",
-                progress=100,
-                output_mode=output_mode,
-                pipeline_mode=mode,
-                video_path=video_public_path,
-            )
-        except Exception as exc:
+        def fail(exc: Exception) -> None:
             error_result = {
                 "job_id": job_id,
                 "status": "failed",
@@ -376,74 +415,494 @@ class PipelineService:
                 pipeline_mode=mode,
             )
 
+        def finish(veo_future: Future[Any] | None = None) -> None:
+            # Runs inline, or on a scheduler worker once the Veo operation has settled.
+            nonlocal partial_result
+            output_mode: str = "storyboard"
+            video_public_path = f"/generated/{job_id}/preview_v1.mp4"
+            try:
+                if mode == "storyboard_to_video":
+                    try:
+                        if veo_future is not None:
+                            operation = veo_future.result()
+                            self.provider.save_video(operation, veo_path)
+                            checkpoint.mark_done(
+                                "veo", [veo_path], depends_on=["scene_plan", frame_paths[0].stem]
+                            )
+                        veo_trace["success"] = True
+                        output_mode = "storyboard_to_video"
+                        video_public_path = f"/generated/{job_id}/veo_v1.mp4"
+                        quality_scores["veo_video_quality_score"] = 0.70
+                    except Exception as exc:
+                        partial_result = True
+                        veo_trace["success"] = False
+                        veo_trace["error"] = str(exc)
+                        raise RuntimeError(f"Veo generation failed after storyboard success: {exc}") from exc
+
+                result_payload = {
+                    "job_id": job_id,
+                    "status": "succeeded",
+                    "pipeline_mode": mode,
+                    "output_mode": output_mode,
+                    "quality_scores": quality_scores,
+                    "files": {
+                        "thumbnail_path": f"/generated/{job_id}/thumbnail.png",
+                        "video_path": video_public_path,
+                        "storyboard_video_path": f"/generated/{job_id}/preview_v1.mp4",
+                        "veo_video_path": f"/generated/{job_id}/veo_v1.mp4",
+                        "result_path": f"/generated/{job_id}/result.json",
+                        "strategy_packet_path": f"/generated/{job_id}/strategy_packet.json",
+                        "production_notes_path": f"/generated/{job_id}/production_notes.md",
+                        "scene_plan_path": f"/generated/{job_id}/scene_plan.json",
+                        "character_anchor_path": f"/generated/{job_id}/character_anchor.png",
+                        "creator_reference_path": f"/generated/{job_id}/creator_reference.json",
+                    },
+                    "attempts": attempts,
+                    "fallback_reason": fallback_reason,
+                    "provider_trace": provider_trace,
+                    "prompt_version": PROMPT_VERSION,
+                    "frame_count": frame_count,
+                    "style_bible_applied": True,
+                    "script_grounding_applied": True,
+                    "scene_sources": scene_sources,
+                    "storyboard_scene_plan": storyboard_scene_plan,
+                    "image_model": self.settings.gcp_vertex_image_model,
+                    "scene_planner_model": self.settings.scene_planner_model,
+                    "character_bible": character_bible,
+                    "creator_reference": creator_reference,
+                    "scene_plan_path": f"/generated/{job_id}/scene_plan.json",
+                    "character_anchor_path": f"/generated/{job_id}/character_anchor.png",
+                    "text_guard_enabled": True,
+                    "text_guard_summary": text_guard_summary,
+                    "veo_trace": veo_trace,
+                    "partial_result": partial_result,
+                }
+                atomic_write_json(result_path, result_payload)
+                self.store.update(
+                    job_id,
+                    status="succeeded",
+                    stage="done",
+                    progress=100,
+                    output_mode=output_mode,
+                    pipeline_mode=mode,
+                    video_path=video_public_path,
+                )
+            except Exception as exc:
+                fail(exc)
+
+        try:
+            self.store.update(job_id, status="running", stage="planning", progress=5, pipeline_mode=mode)
+            # Planning graph: the job notes do not depend on the creator lookup, so they are
+            # written on the side while the lookup (and then the scene planner) runs here.
+            notes_future = self.planning_executor.submit(
+                self._write_job_notes, payload, strategy_packet_path, production_notes_path
+            )
+            if reuse("creator_reference"):
+                creator_reference = json.loads(creator_reference_path.read_text(encoding="utf-8"))
+            else:
+                creator_started_at = time.perf_counter()
+                creator_timings: dict[str, int] = {}
+                resolved_by, cache_hit = "none", False
+                try:
+                    with self._stage("llm", priority, provider_trace):
+                        resolved = self.creator_reference.resolve(payload, timings=creator_timings)
+                    creator_reference = resolved.reference
+                    resolved_by, cache_hit = resolved.resolved_by or "none", resolved.cache_hit
+                except Exception as exc:
+                    creator_reference = {"search_used": False, "error": str(exc)}
+                # The degraded result is checkpointed too: the scene plan was built from it, and
+                # a fresh lookup on resume would change its digest and invalidate every later stage.
+                atomic_write_json(creator_reference_path, creator_reference)
+                checkpoint.mark_done("creator_reference", [creator_reference_path])
+                provider_trace["creator_search_called"] = True
+                provider_trace["creator_reference_ms"] = _elapsed_ms(creator_started_at)
+                provider_trace.update(dict(creator_timings))
+                provider_trace["creator_resolved_by"] = resolved_by
+                provider_trace["creator_cache_hit"] = cache_hit
+
+            if reuse("scene_plan"):
+                saved_plan = json.loads(scene_plan_path.read_text(encoding="utf-8"))
+                scene_plan = load_scene_plan({**saved_plan, "scene_plan": saved_plan["planned_scenes"]})
+            else:
+                plan_started_at = time.perf_counter()
+                with self._stage("llm", priority, provider_trace):
+                    scene_plan = self.scene_planner.plan(payload, creator_reference=creator_reference)
+                provider_trace["scene_planner_called"] = True
+                provider_trace["scene_plan_ms"] = _elapsed_ms(plan_started_at)
+                atomic_write_json(
+                    scene_plan_path,
+                    {
+                        "character_bible": scene_plan.character_bible,
+                        "consistency_rules": scene_plan.consistency_rules,
+                        "thumbnail_plan": scene_plan.thumbnail_plan,
+                        "scene_plan": serialize_scene_plan(scene_plan),
+                        "planned_scenes": dump_scene_plan(scene_plan)["scene_plan"],
+                    },
+                )
+                checkpoint.mark_done("scene_plan", [scene_plan_path], depends_on=["creator_reference"])
+            character_bible = {
+                str(k): v if isinstance(v, list) else str(v)
+                for k, v in scene_plan.character_bible.items()
+            }
+            storyboard_scene_plan = serialize_scene_plan(scene_plan)
+            scene_sources = [scene.source_span for scene in scene_plan.scenes]
+            provider_trace["job_notes_ms"] = notes_future.result()
+
+            self.store.update(job_id, stage="thumbnail", progress=15)
+            if not reuse("thumbnail"):
+                thumb_prompt = build_thumbnail_prompt(payload, scene_plan)
+                self._generate_guarded_image(
+                    prompt=thumb_prompt,
+                    output_path=thumbnail_path,
+                    provider_trace=provider_trace,
+                    text_guard_summary=text_guard_summary,
+                    max_allowed_chars=self.settings.max_allowed_text_chars_thumbnail,
+                    retry_label="thumbnail_retries",
+                    priority=priority,
+                )
+                checkpoint.mark_done("thumbnail", [thumbnail_path], depends_on=["scene_plan"])
+
+            self.store.update(job_id, stage="anchor", progress=25)
+            if not reuse("anchor"):
+                anchor_prompt = build_character_anchor_prompt(scene_plan)
+                self._generate_guarded_image(
+                    prompt=anchor_prompt,
+                    output_path=character_anchor_path,
+                    provider_trace=provider_trace,
+                    text_guard_summary=text_guard_summary,
+                    max_allowed_chars=self.settings.max_allowed_text_chars_frame,
+                    retry_label="frame_retries",
+                    priority=priority,
+                )
+                checkpoint.mark_done("anchor", [character_anchor_path], depends_on=["scene_plan"])
+
+            self.store.update(job_id, stage="storyboard", progress=40)
+            frame_count = FRAME_COUNT
+            frame_prompts, scene_sources = build_storyboard_prompts(scene_plan)
+            frame_paths = [frames_dir / f"frame_{idx:02d}.png" for idx in range(1, len(frame_prompts) + 1)]
+            pending_frames = [
+                (prompt, frame_path)
+                for prompt, frame_path in zip(frame_prompts, frame_paths)
+                if not reuse(frame_path.stem)
+            ]
+            # The batch path looks every frame up in the image cache; its leftovers skip that
+            # first lookup so each frame is counted once in the hit/miss trace.
+            batched = self.settings.image_batch_enabled and len(pending_frames) > 1
+            if batched:
+                pending_frames = self._generate_frame_batch(
+                    checkpoint,
+                    pending_frames,
+                    provider_trace=provider_trace,
+                    text_guard_summary=text_guard_summary,
+                    reference_images=[character_anchor_path],
+                    priority=priority,
+                )
+            frame_futures: list[Future[None]] = [
+                self.frame_executor.submit(
+                    self._generate_checkpointed_frame,
+                    checkpoint=checkpoint,
+                    prompt=prompt,
+                    output_path=frame_path,
+                    provider_trace=provider_trace,
+                    text_guard_summary=text_guard_summary,
+                    reference_images=[character_anchor_path],
+                    priority=priority,
+                    cache_checked=batched,
+                )
+                for prompt, frame_path in pending_frames
+            ]
+            # Let every frame settle before surfacing the first failure (in frame order),
+            # so no worker is still writing into the trace dicts after the job fails.
+            wait(frame_futures)
+            for future in frame_futures:
+                future.result()
+
+            if not reuse("preview"):
+                with self._stage("cpu", priority, provider_trace):
+                    provider_trace["preview_encoder"] = self._compose_slideshow_video(
+                        frame_paths=frame_paths,
+                        output_path=preview_path,
+                        duration_sec=options.max_video_seconds,
+                    )
+                checkpoint.mark_done(
+                    "preview", [preview_path], depends_on=[frame_path.stem for frame_path in frame_paths]
+                )
+            quality_scores["storyboard_video_quality_score"] = 0.60
+
+            if mode == "storyboard_to_video":
+                self.store.update(job_id, stage="veo", progress=80)
+                attempts["video_attempts"] = 1
+                veo_trace["attempted"] = True
+                provider_trace["video_called"] = True
+                if not reuse("veo"):
+                    veo_future = self._start_veo(
+                        priority,
+                        provider_trace,
+                        prompt=build_storyboard_summary_for_veo(payload, scene_plan),
+                        duration_sec=options.max_video_seconds,
+                        image_path=frame_paths[0] if frame_paths else None,
+                    )
+                    # Free this worker while Veo renders; the job finishes once the poller settles.
+                    veo_future.add_done_callback(lambda done: self.scheduler.resume(finish, done))
+                    return
+            finish()
+        except Exception as exc:
+            fail(exc)
+
+    def _start_veo(
+        self, priority: int, provider_trace: dict[str, Any], **kwargs: Any
+    ) -> Future[Any]:
+        """Start a Veo render holding a veo slot until the operation settles."""
+        waited_ms = self.scheduler.acquire("veo", priority)
+        with self._trace_lock:
+            provider_trace["stage_wait_ms"]["veo"] += waited_ms
+        try:
+            operation_future = self.provider.start_video(**kwargs)
+        except Exception as exc:
+            self.scheduler.release("veo")
+            failed: Future[Any] = Future()
+            failed.set_exception(exc)
+            return failed
+        operation_future.add_done_callback(lambda _: self.scheduler.release("veo"))
+        return operation_future
+
+    @staticmethod
+    def _write_job_notes(
+        payload: AssetJobCreateRequest, strategy_packet_path: Path, production_notes_path: Path
+    ) -> int:
+        started_at = time.perf_counter()
+        strategy_packet = {
+            "source_signal_id": payload.meta.source_signal_id,
+            "title": payload.script.title,
+            "hook": payload.script.hook_0_15s,
+            "key_messages": payload.assets.on_screen_bullets[:3],
+            "conclusion": payload.rationale_block.logic.conclusion,
+        }
+        atomic_write_json(strategy_packet_path, strategy_packet)
+        production_notes_path.write_text(build_production_notes_ko(), encoding="utf-8")
+        return _elapsed_ms(started_at)
+
+    def _generate_checkpointed_frame(
+        self,
+        checkpoint: StageCheckpoint,
+        prompt: str,
+        output_path: Path,
+        provider_trace: dict[str, Any],
+        text_guard_summary: dict[str, Any],
+        reference_images: list[Path],
+        priority: int,
+        cache_checked: bool = False,
+    ) -> None:
+        self._generate_guarded_image(
+            prompt=prompt,
+            output_path=output_path,
+            provider_trace=provider_trace,
+            text_guard_summary=text_guard_summary,
+            max_allowed_chars=self.settings.max_allowed_text_chars_frame,
+            retry_label="frame_retries",
+            priority=priority,
+            reference_images=reference_images,
+            frame_name=output_path.stem,
+            cache_checked=cache_checked,
+        )
+        checkpoint.mark_done(output_path.stem, [output_path], depends_on=["scene_plan", "anchor"])
+
+    def _generate_frame_batch(
+        self,
+        checkpoint: StageCheckpoint,
+        frames: list[tuple[str, Path]],
+        provider_trace: dict[str, Any],
+        text_guard_summary: dict[str, Any],
+        reference_images: list[Path],
+        priority: int,
+    ) -> list[tuple[str, Path]]:
+        """Generate frames several per call; returns the frames left for per-frame generation.
+
+        A call whose image count does not match its prompts is dropped whole, since images
+        cannot be mapped back to scenes reliably. Frames that fail the text guard fall back
+        individually and get the per-frame retry prompts.
+        """
+        pending: list[tuple[str, Path, str]] = []
+        for prompt, output_path in frames:
+            cache_key = ""
+            if self.image_cache:
+                cache_key = self._image_cache_key(prompt, reference_images)
+                # Counted per lookup, as on the per-frame path, so traces compare across paths.
+                hit = self.image_cache.fetch(cache_key, output_path)
+                with self._trace_lock:
+                    provider_trace["image_cache_hits" if hit else "image_cache_misses"] += 1
+                if hit:
+                    checkpoint.mark_done(output_path.stem, [output_path], depends_on=["scene_plan", "anchor"])
+                    continue
+                output_path.unlink(missing_ok=True)
+            pending.append((prompt, output_path, cache_key))
+
+        remaining: list[tuple[str, Path]] = []
+        batch_size = max(2, self.settings.image_batch_max_frames)
+        for start in range(0, len(pending), batch_size):
+            chunk = pending[start : start + batch_size]
+            if len(chunk) < 2:
+                remaining.extend((prompt, output_path) for prompt, output_path, _ in chunk)
+                continue
+            try:
+                with self._stage("image", priority, provider_trace):
+                    images = self.provider.generate_image_batch(
+                        [prompt for prompt, _, _ in chunk], reference_images=reference_images
+                    )
+                with self._trace_lock:
+                    provider_trace["image_calls"] += 1
+                    provider_trace["image_batch_calls"] += 1
+            except Exception:
+                images = []
+            if len(images) != len(chunk):
+                with self._trace_lock:
+                    provider_trace["image_batch_fallback_frames"] += len(chunk)
+                remaining.extend((prompt, output_path) for prompt, output_path, _ in chunk)
+                continue
+            for (prompt, output_path, cache_key), image_bytes in zip(chunk, images):
+                try:
+                    self._accept_image(
+                        image_bytes,
+                        output_path,
+                        provider_trace=provider_trace,
+                        text_guard_summary=text_guard_summary,
+                        max_allowed_chars=self.settings.max_allowed_text_chars_frame,
+                        retry_label="frame_retries",
+                        priority=priority,
+                    )
+                except ValueError:
+                    with self._trace_lock:
+                        provider_trace["image_batch_fallback_frames"] += 1
+                    remaining.append((prompt, output_path))
+                    continue
+                with self._trace_lock:
+                    provider_trace["image_batch_frames"] += 1
+                if self.image_cache and cache_key:
+                    self.image_cache.store(cache_key, output_path)
+                checkpoint.mark_done(output_path.stem, [output_path], depends_on=["scene_plan", "anchor"])
+        return remaining
+
     def _generate_guarded_image(
         self,
         prompt: str,
         output_path: Path,
         provider_trace: dict[str, Any],
-        text_guard_summary: dict[str, int | list[str] | bool | str],
+        text_guard_summary: dict[str, Any],
         max_allowed_chars: int,
         retry_label: str,
+        priority: int,
         reference_images: list[Path] | None = None,
         frame_name: str = "",
+        cache_checked: bool = False,
     ) -> None:
         last_error: Exception | None = None
         for retry_idx in range(self.settings.max_image_generation_attempts):
             try:
                 retry_prompt = build_retry_prompt(prompt, retry_idx)
-                self.provider.generate_image(
-                    retry_prompt, output_path, reference_images=reference_images or []
+                cache_key = ""
+                if self.image_cache:
+                    cache_key = self._image_cache_key(retry_prompt, reference_images or [])
+                    # A batch leftover was already looked up (and counted) for its first prompt.
+                    if not (cache_checked and retry_idx == 0):
+                        hit = self.image_cache.fetch(cache_key, output_path)
+                        with self._trace_lock:
+                            provider_trace["image_cache_hits" if hit else "image_cache_misses"] += 1
+                        if hit:
+                            return
+                    # output_path may be a hardlink into the cache from an earlier run.
+                    output_path.unlink(missing_ok=True)
+                with self._stage("image", priority, provider_trace):
+                    image_bytes = self.provider.generate_image_bytes(
+                        retry_prompt, reference_images=reference_images or []
+                    )
+                with self._trace_lock:
+                    provider_trace["image_calls"] += 1
+                self._accept_image(
+                    image_bytes,
+                    output_path,
+                    provider_trace=provider_trace,
+                    text_guard_summary=text_guard_summary,
+                    max_allowed_chars=max_allowed_chars,
+                    retry_label=retry_label,
+                    priority=priority,
                 )
-                provider_trace["image_calls"] += 1
-                time.sleep(self.settings.image_request_interval_sec)
-                if not output_path.exists() or output_path.stat().st_size < 1024:
-                    raise ValueError("Generated image is missing or too small.")
-                self._resize_generated_image(output_path)
-                if self._ocr_available:
-                    detected_chars = self._detect_text_chars(output_path)
-                    if detected_chars > max_allowed_chars:
-                        provider_trace["text_guard_retries"] += 1
-                        text_guard_summary[retry_label] = int(text_guard_summary[retry_label]) + 1
-                        raise ValueError(
-                            f"Detected text chars {detected_chars} > allowed {max_allowed_chars}"
-                        )
+                if self.image_cache and cache_key:
+                    self.image_cache.store(cache_key, output_path)
                 return
             except Exception as exc:
                 last_error = exc
                 if self._is_resource_exhausted(exc) and retry_idx + 1 < self.settings.max_image_generation_attempts:
-                    provider_trace["image_backoff_retries"] += 1
-                    text_guard_summary["image_backoff_retries"] = int(
-                        text_guard_summary["image_backoff_retries"]
-                    ) + 1
+                    with self._trace_lock:
+                        provider_trace["image_backoff_retries"] += 1
+                        text_guard_summary["image_backoff_retries"] = int(
+                            text_guard_summary["image_backoff_retries"]
+                        ) + 1
                     time.sleep(self._retry_sleep_sec(retry_idx))
                     continue
                 if retry_idx + 1 < self.settings.max_image_generation_attempts:
                     continue
         if frame_name:
-            provider_trace["text_guard_blocked_frames"].append(frame_name)
-            text_guard_summary["blocked_frames"].append(frame_name)
+            with self._trace_lock:
+                provider_trace["text_guard_blocked_frames"].append(frame_name)
+                text_guard_summary["blocked_frames"].append(frame_name)
         raise RuntimeError(str(last_error))
 
-    def _detect_text_chars(self, image_path: Path) -> int:
-        if not self._ocr_available or not self._pytesseract:
-            return 0
-        try:
-            from PIL import Image
+    def _accept_image(
+        self,
+        image_bytes: bytes,
+        output_path: Path,
+        provider_trace: dict[str, Any],
+        text_guard_summary: dict[str, Any],
+        max_allowed_chars: int,
+        retry_label: str,
+        priority: int,
+    ) -> None:
+        """Decode, text-guard and save generated bytes; raises ValueError when a retry is needed."""
+        if len(image_bytes) < 1024:
+            raise ValueError("Generated image is missing or too small.")
+        # The image slot is already released, so decode/OCR/encode overlaps other calls.
+        with self._stage("cpu", priority, provider_trace):
+            # Decode once; the resized image feeds both the text guard and the PNG encode.
+            image = self._decode_resized_image(image_bytes)
+            if self._ocr_available:
+                detected_chars = self._detect_text_chars(image, output_path.stem, text_guard_summary)
+                if detected_chars > max_allowed_chars:
+                    with self._trace_lock:
+                        provider_trace["text_guard_retries"] += 1
+                        text_guard_summary[retry_label] = int(text_guard_summary[retry_label]) + 1
+                    raise ValueError(f"Detected text chars {detected_chars} > allowed {max_allowed_chars}")
+            self._save_png(image, output_path)
+
+    def _image_cache_key(self, prompt: str, reference_images: list[Path]) -> str:
+        return ImageCache.make_key(
+            prompt,
+            [self.provider.references.digest(reference) for reference in reference_images],
+            self.settings.gcp_vertex_image_model,
+            (self.settings.output_image_width, self.settings.output_image_height),
+        )
 
-            with Image.open(image_path) as image:
-                try:
-                    extracted = self._pytesseract.image_to_string(image, lang="eng+kor")
-                except Exception:
-                    extracted = self._pytesseract.image_to_string(image, lang="eng")
-            text_chars = re.findall(r"[A-Za-z0-9가-힣]", extracted)
-            return len(text_chars)
-        except Exception:
-            return 0
+    def _detect_text_chars(
+        self,
+        image: Image.Image,
+        image_name: str,
+        text_guard_summary: dict[str, Any],
+    ) -> int:
+        result = self.text_guard.check(image)
+        with self._trace_lock:
+            if result.skipped:
+                text_guard_summary["ocr_skipped"] += 1
+            else:
+                text_guard_summary["ocr_checked"] += 1
+                text_guard_summary["ocr_total_ms"] += result.ocr_ms
+                per_image = text_guard_summary["ocr_ms"]
+                per_image[image_name] = per_image.get(image_name, 0) + result.ocr_ms
+            total = text_guard_summary["ocr_checked"] + text_guard_summary["ocr_skipped"]
+            text_guard_summary["ocr_skip_rate"] = round(text_guard_summary["ocr_skipped"] / total, 3)
+        return result.text_chars
 
     @staticmethod
     def _is_resource_exhausted(exc: Exception) -> bool:
-        message = str(exc).upper()
-        return "RESOURCE_EXHAUSTED" in message or "429" in message
+        return is_resource_exhausted(exc)
 
     def _retry_sleep_sec(self, retry_idx: int) -> float:
         base = max(0.1, self.settings.image_retry_backoff_base_sec)
@@ -455,29 +914,26 @@ class PipelineService:
         frame_paths: list[Path],
         output_path: Path,
         duration_sec: int,
-    ) -> None:
-        clip_duration = duration_sec / max(1, len(frame_paths))
-        clips = [ImageClip(str(frame)).with_duration(clip_duration) for frame in frame_paths]
-        video = concatenate_videoclips(clips, method="compose")
-        video = video.resized(new_size=(self.settings.output_image_width, self.settings.output_image_height))
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        # Requested behavior: no voice/music generation, export silent storyboard preview.
-        video.write_videofile(
-            str(output_path),
+    ) -> str:
+        return compose_slideshow(
+            frame_paths,
+            output_path,
+            duration_sec,
+            size=(self.settings.output_image_width, self.settings.output_image_height),
             fps=self.settings.preview_video_fps,
-            codec="libx264",
-            audio=False,
             bitrate=self.settings.preview_video_bitrate,
-            logger=None,
+            encoder=self.settings.preview_video_encoder,
         )
-        video.close()
-
-    def _resize_generated_image(self, image_path: Path) -> None:
-        from PIL import Image
 
-        with Image.open(image_path) as image:
-            resized = image.convert("RGB").resize(
+    def _decode_resized_image(self, image_bytes: bytes) -> Image.Image:
+        with Image.open(io.BytesIO(image_bytes)) as image:
+            return image.convert("RGB").resize(
                 (self.settings.output_image_width, self.settings.output_image_height),
                 Image.Resampling.LANCZOS,
             )
-            resized.save(image_path, format="PNG", optimize=True)
+
+    def _save_png(self, image: Image.Image, output_path: Path) -> None:
+        ensure_dir(output_path.parent)
+        temp_path = output_path.with_name(f".{output_path.name}.tmp")
+        image.save(temp_path, format="PNG", optimize=self.settings.png_optimize)
+        temp_path.replace(output_path)
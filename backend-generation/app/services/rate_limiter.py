@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from threading import Lock
+
+from app.config import get_settings
+
+
+def is_resource_exhausted(exc: Exception) -> bool:
+    message = str(exc).upper()
+    return "RESOURCE_EXHAUSTED" in message or "429" in message
+
+
+@dataclass
+class _Bucket:
+    max_rate: float
+    rate: float
+    capacity: float
+    tokens: float
+    updated_at: float
+
+
+class AdaptiveRateLimiter:
+    """Process-wide token buckets keyed by model name.
+
+    Each bucket refills at its current rate. A RESOURCE_EXHAUSTED response
+    shrinks the rate multiplicatively; every success grows it back by a small
+    additive step until the configured requests/minute ceiling is reached.
+    """
+
+    def __init__(
+        self,
+        decrease_factor: float = 0.5,
+        recovery_step: float = 0.05,
+        min_requests_per_minute: float = 2.0,
+    ) -> None:
+        self._lock = Lock()
+        self._buckets: dict[str, _Bucket] = {}
+        self.decrease_factor = min(max(decrease_factor, 0.05), 1.0)
+        self.recovery_step = max(recovery_step, 0.0)
+        self.min_rate = max(min_requests_per_minute, 0.1) / 60.0
+
+    def configure(self, model: str, requests_per_minute: float, burst: int = 1) -> None:
+        max_rate = max(requests_per_minute / 60.0, self.min_rate)
+        capacity = float(max(1, burst))
+        with self._lock:
+            bucket = self._buckets.get(model)
+            if bucket is None:
+                self._buckets[model] = _Bucket(
+                    max_rate=max_rate,
+                    rate=max_rate,
+                    capacity=capacity,
+                    tokens=capacity,
+                    updated_at=time.monotonic(),
+                )
+                return
+            bucket.max_rate = max_rate
+            bucket.rate = min(bucket.rate, max_rate)
+            bucket.capacity = capacity
+            bucket.tokens = min(bucket.tokens, capacity)
+
+    def acquire(self, model: str) -> float:
+        """Block until a request token for `model` is available. Returns seconds waited."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                bucket = self._buckets.get(model)
+                if bucket is None:
+                    return waited
+                self._refill(bucket)
+                if bucket.tokens >= 1.0:
+                    bucket.tokens -= 1.0
+                    return waited
+                delay = (1.0 - bucket.tokens) / bucket.rate
+            time.sleep(delay)
+            waited += delay
+
+    def record_success(self, model: str) -> None:
+        with self._lock:
+            bucket = self._buckets.get(model)
+            if bucket is None:
+                return
+            bucket.rate = min(bucket.max_rate, bucket.rate + bucket.max_rate * self.recovery_step)
+
+    def record_exhausted(self, model: str) -> None:
+        with self._lock:
+            bucket = self._buckets.get(model)
+            if bucket is None:
+                return
+            self._refill(bucket)
+            bucket.rate = max(self.min_rate, bucket.rate * self.decrease_factor)
+            # Drop any saved-up burst so the other workers back off as well.
+            bucket.tokens = min(bucket.tokens, 0.0)
+
+    def current_rpm(self, model: str) -> float:
+        with self._lock:
+            bucket = self._buckets.get(model)
+            return round(bucket.rate * 60.0, 2) if bucket else 0.0
+
+    @staticmethod
+    def _refill(bucket: _Bucket) -> None:
+        now = time.monotonic()
+        elapsed = now - bucket.updated_at
+        bucket.updated_at = now
+        bucket.tokens = min(bucket.capacity, bucket.tokens + elapsed * bucket.rate)
+
+
+@lru_cache
+def get_rate_limiter() -> AdaptiveRateLimiter:
+    settings = get_settings()
+    return AdaptiveRateLimiter(
+        decrease_factor=settings.rate_limit_decrease_factor,
+        recovery_step=settings.rate_limit_recovery_step,
+        min_requests_per_minute=settings.rate_limit_min_requests_per_minute,
+    )
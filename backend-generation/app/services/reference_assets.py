@@ -0,0 +1,130 @@
+"""Reference images for image prompts, read and encoded once and optionally uploaded to GCS."""
+
+from __future__ import annotations
+
+import hashlib
+from collections import OrderedDict
+from pathlib import Path
+from threading import Lock
+from typing import Any
+
+import httpx
+from google.genai import types
+
+GCS_UPLOAD_URL = "https://storage.googleapis.com/upload/storage/v1/b/{bucket}/o"
+CLOUD_PLATFORM_SCOPE = "https://www.googleapis.com/auth/cloud-platform"
+MISS_LOCK_STRIPES = 16
+
+
+class ReferenceAssetRegistry:
+    """LRU of ready-to-send reference Parts and digests keyed by (path, mtime, size).
+
+    The character anchor is attached to every frame request and every retry, and its
+    digest feeds every image cache key, so it is read, hashed and wrapped once instead of
+    per call. With a GCS bucket configured the bytes are uploaded once per content digest
+    and requests carry only a gs:// URI; jobs whose anchors share bytes (e.g. through the
+    image cache) share the upload too. Upload failures fall back to inline bytes.
+    """
+
+    def __init__(
+        self,
+        http: httpx.Client,
+        bucket: str = "",
+        prefix: str = "references/",
+        max_entries: int = 32,
+    ) -> None:
+        self.http = http
+        self.bucket = bucket
+        self.prefix = prefix
+        self.max_entries = max(1, max_entries)
+        # _lock only guards the two LRUs. Misses are serialised per key through a striped
+        # lock, so concurrent frames of a job still read and upload their anchor once while
+        # other jobs' references are read and uploaded in parallel.
+        self._lock = Lock()
+        self._miss_locks = [Lock() for _ in range(MISS_LOCK_STRIPES)]
+        self._entries: OrderedDict[tuple[str, int, int], tuple[types.Part, str]] = OrderedDict()
+        self._uploads: OrderedDict[str, str] = OrderedDict()
+        self._credentials: Any = None
+        self._credentials_lock = Lock()
+
+    def part(self, path: Path, mime_type: str = "image/png") -> types.Part | None:
+        """Return the Part for a reference image, or None when the file is missing."""
+        entry = self._entry(path, mime_type)
+        return entry[0] if entry else None
+
+    def digest(self, path: Path) -> str | None:
+        """Return the SHA-256 hex digest of a reference image, or None when it is missing."""
+        entry = self._entry(path, "image/png")
+        return entry[1] if entry else None
+
+    def _entry(self, path: Path, mime_type: str) -> tuple[types.Part, str] | None:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        key = (str(path), stat.st_mtime_ns, stat.st_size)
+        cached = self._cached_entry(key)
+        if cached is not None:
+            return cached
+        with self._miss_locks[hash(key) % MISS_LOCK_STRIPES]:
+            # Another thread may have filled the entry while this one waited.
+            cached = self._cached_entry(key)
+            if cached is not None:
+                return cached
+            data = path.read_bytes()
+            digest = hashlib.sha256(data).hexdigest()
+            part = self._uploaded_part(digest, data, mime_type) if self.bucket else None
+            if part is None:
+                part = types.Part.from_bytes(data=data, mime_type=mime_type)
+            with self._lock:
+                self._entries[key] = (part, digest)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            return part, digest
+
+    def _cached_entry(self, key: tuple[str, int, int]) -> tuple[types.Part, str] | None:
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+            return cached
+
+    def _uploaded_part(self, digest: str, data: bytes, mime_type: str) -> types.Part | None:
+        with self._lock:
+            uri = self._uploads.get(digest)
+            if uri is not None:
+                self._uploads.move_to_end(digest)
+        if uri is None:
+            # Two paths with the same bytes may race here; the object name is the digest,
+            # so the second upload just overwrites the first.
+            try:
+                uri = self._upload(f"{self.prefix}{digest}.png", data, mime_type)
+            except Exception:
+                return None
+            with self._lock:
+                self._uploads[digest] = uri
+                while len(self._uploads) > self.max_entries:
+                    self._uploads.popitem(last=False)
+        return types.Part.from_uri(file_uri=uri, mime_type=mime_type)
+
+    def _upload(self, name: str, data: bytes, mime_type: str) -> str:
+        response = self.http.post(
+            GCS_UPLOAD_URL.format(bucket=self.bucket),
+            params={"uploadType": "media", "name": name},
+            content=data,
+            headers={"Authorization": f"Bearer {self._access_token()}", "Content-Type": mime_type},
+        )
+        response.raise_for_status()
+        return f"gs://{self.bucket}/{name}"
+
+    def _access_token(self) -> str:
+        import google.auth
+        import google.auth.transport.requests
+
+        # Frame workers upload concurrently; one thread loads or refreshes the credentials.
+        with self._credentials_lock:
+            if self._credentials is None:
+                self._credentials, _ = google.auth.default(scopes=[CLOUD_PLATFORM_SCOPE])
+            if not self._credentials.valid:
+                self._credentials.refresh(google.auth.transport.requests.Request())
+            return str(self._credentials.token)
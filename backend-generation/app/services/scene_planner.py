@@ -2,12 +2,13 @@ from __future__ import annotations
 
 import json
 import re
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from typing import Any
 
 from google import genai
 from google.genai import types
 
+from app.clients import get_client_registry
 from app.config import get_settings
 from app.schemas import AssetJobCreateRequest
 
@@ -34,14 +35,23 @@ class ScenePlanResult:
     scenes: list[PlannedScene]
 
 
+def dump_scene_plan(result: ScenePlanResult) -> dict[str, Any]:
+    return {
+        "character_bible": result.character_bible,
+        "consistency_rules": result.consistency_rules,
+        "thumbnail_plan": result.thumbnail_plan,
+        "scene_plan": [asdict(scene) for scene in result.scenes],
+    }
+
+
+def load_scene_plan(data: dict[str, Any]) -> ScenePlanResult:
+    return ScenePlannerService._validate(data)
+
+
 class ScenePlannerService:
-    def __init__(self) -> None:
+    def __init__(self, client: genai.Client | None = None) -> None:
         self.settings = get_settings()
-        self.client = genai.Client(
-            vertexai=True,
-            project=self.settings.gcp_project_id,
-            location=self.settings.gcp_location,
-        )
+        self.client = client or get_client_registry().genai()
 
     @staticmethod
     def _scene_sources(payload: AssetJobCreateRequest) -> list[str]:
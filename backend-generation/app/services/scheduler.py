@@ -0,0 +1,169 @@
+"""Stage-aware job scheduling: priority admission plus bounded per-resource stage pools."""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import time
+from collections import Counter
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from threading import Condition, Lock
+from typing import Any, Literal
+
+from app.config import Settings
+
+ResourceClass = Literal["llm", "image", "cpu", "veo"]
+
+# Lower runs first: interactive storyboard jobs overtake storyboard_to_video at every stage.
+MODE_PRIORITY = {"storyboard": 0, "storyboard_to_video": 1}
+
+
+class QueueFullError(RuntimeError):
+    """Raised when a pipeline mode already has its maximum number of queued jobs."""
+
+
+class PriorityGate:
+    """Bounded slots handed out by (priority, arrival order) rather than first-come."""
+
+    def __init__(self, name: str, slots: int) -> None:
+        self.name = name
+        self.slots = max(1, slots)
+        self._cond = Condition()
+        self._waiting: list[tuple[int, int]] = []
+        self._seq = itertools.count()
+        self._busy = 0
+
+    def acquire(self, priority: int) -> int:
+        """Block until a slot is free and no better ticket is waiting; return the wait in ms."""
+        started_at = time.perf_counter()
+        ticket = (priority, next(self._seq))
+        with self._cond:
+            heapq.heappush(self._waiting, ticket)
+            while self._busy >= self.slots or self._waiting[0] != ticket:
+                self._cond.wait()
+            heapq.heappop(self._waiting)
+            self._busy += 1
+            # The next ticket may also fit if more than one slot is free.
+            self._cond.notify_all()
+        return int((time.perf_counter() - started_at) * 1000)
+
+    def release(self) -> None:
+        with self._cond:
+            self._busy -= 1
+            self._cond.notify_all()
+
+    def snapshot(self) -> dict[str, int]:
+        with self._cond:
+            return {"slots": self.slots, "busy": self._busy, "waiting": len(self._waiting)}
+
+
+class StageScheduler:
+    """Runs job coordinators on a bounded pool and gates each stage by resource class.
+
+    A job holds a coordinator thread while it runs (a Veo job hands it back while the
+    render is polled and continues through resume()), but only occupies an LLM, image,
+    CPU or Veo slot while that stage is running. One job's Veo polling or
+    preview encode therefore no longer blocks another job's planning or image calls.
+    Coordinator admission and every stage slot are served in priority order.
+    """
+
+    def __init__(self, settings: Settings) -> None:
+        self._gates: dict[str, PriorityGate] = {
+            "llm": PriorityGate("llm", settings.llm_stage_workers),
+            "image": PriorityGate("image", settings.image_stage_workers),
+            "cpu": PriorityGate("cpu", settings.cpu_stage_workers),
+            "veo": PriorityGate("veo", settings.veo_stage_workers),
+        }
+        self._queue_limits = {
+            "storyboard": settings.max_queued_storyboard_jobs,
+            "storyboard_to_video": settings.max_queued_storyboard_to_video_jobs,
+        }
+        self._lock = Lock()
+        self._queue: list[tuple[int, int, str, Callable[[], Any]]] = []
+        self._queued_by_mode: Counter[str] = Counter()
+        self._seq = itertools.count()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, settings.max_active_jobs),
+            thread_name_prefix="job",
+        )
+
+    @staticmethod
+    def priority_for(mode: str) -> int:
+        return MODE_PRIORITY.get(mode, max(MODE_PRIORITY.values()))
+
+    def submit(
+        self,
+        mode: str,
+        fn: Callable[..., Any],
+        *args: Any,
+        enforce_limit: bool = True,
+    ) -> None:
+        """Queue a job coordinator; raises QueueFullError when the mode's queue is full."""
+        self.reserve(mode, enforce_limit=enforce_limit)
+        self.dispatch(mode, fn, *args)
+
+    def reserve(self, mode: str, enforce_limit: bool = True) -> None:
+        """Take a queue slot for mode before the job is persisted; raises QueueFullError when full.
+
+        Follow with dispatch() to queue the coordinator, or unreserve() if the job is abandoned.
+        """
+        with self._lock:
+            limit = self._queue_limits.get(mode, 0)
+            if enforce_limit and limit > 0 and self._queued_by_mode[mode] >= limit:
+                raise QueueFullError(f"Too many queued {mode} jobs ({limit}); retry later.")
+            self._queued_by_mode[mode] += 1
+
+    def unreserve(self, mode: str) -> None:
+        with self._lock:
+            self._queued_by_mode[mode] -= 1
+
+    def dispatch(self, mode: str, fn: Callable[..., Any], *args: Any) -> None:
+        """Queue a job coordinator on a slot already taken with reserve()."""
+        with self._lock:
+            heapq.heappush(
+                self._queue, (self.priority_for(mode), next(self._seq), mode, lambda: fn(*args))
+            )
+        # Each submission adds one pool task; whichever runs pops the best queued job.
+        self._executor.submit(self._run_next)
+
+    def resume(self, fn: Callable[..., Any], *args: Any) -> None:
+        """Queue the continuation of an already-admitted job ahead of every new job."""
+        with self._lock:
+            heapq.heappush(self._queue, (-1, next(self._seq), "", lambda: fn(*args)))
+        self._executor.submit(self._run_next)
+
+    def _run_next(self) -> None:
+        with self._lock:
+            _, _, mode, task = heapq.heappop(self._queue)
+            if mode:
+                self._queued_by_mode[mode] -= 1
+        task()
+
+    def acquire(self, resource: ResourceClass, priority: int) -> int:
+        """Take one slot of a resource class; returns the wait in ms. Any thread may release it."""
+        return self._gates[resource].acquire(priority)
+
+    def release(self, resource: ResourceClass) -> None:
+        self._gates[resource].release()
+
+    @contextmanager
+    def stage(self, resource: ResourceClass, priority: int) -> Iterator[int]:
+        """Hold one slot of a resource class for the body; yields the wait in ms."""
+        waited_ms = self.acquire(resource, priority)
+        try:
+            yield waited_ms
+        finally:
+            self.release(resource)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            queued = dict(self._queued_by_mode)
+        return {
+            "queued": queued,
+            "stages": {name: gate.snapshot() for name, gate in self._gates.items()},
+        }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import subprocess
+from pathlib import Path
+from typing import Literal
+
+
+def compose_slideshow(
+    frame_paths: list[Path],
+    output_path: Path,
+    duration_sec: int,
+    *,
+    size: tuple[int, int],
+    fps: int,
+    bitrate: str,
+    encoder: Literal["ffmpeg", "moviepy"] = "ffmpeg",
+) -> Literal["ffmpeg", "moviepy"]:
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    if encoder == "ffmpeg":
+        try:
+            compose_slideshow_ffmpeg(frame_paths, output_path, duration_sec, size=size, fps=fps, bitrate=bitrate)
+            return "ffmpeg"
+        except Exception:
+            # Missing binary or an ffmpeg failure: the moviepy path below still works.
+            output_path.unlink(missing_ok=True)
+    compose_slideshow_moviepy(frame_paths, output_path, duration_sec, size=size, fps=fps, bitrate=bitrate)
+    return "moviepy"
+
+
+def compose_slideshow_ffmpeg(
+    frame_paths: list[Path],
+    output_path: Path,
+    duration_sec: int,
+    *,
+    size: tuple[int, int],
+    fps: int,
+    bitrate: str,
+) -> None:
+    """Encode the PNGs through ffmpeg's concat demuxer so no pixels pass through Python."""
+    import imageio_ffmpeg
+
+    clip_duration = duration_sec / max(1, len(frame_paths))
+    lines = ["ffconcat version 1.0"]
+    for frame in frame_paths:
+        escaped = str(frame.resolve()).replace("'", "'\\''")
+        lines.append(f"file '{escaped}'")
+        lines.append(f"duration {clip_duration:.6f}")
+    if frame_paths:
+        # The concat demuxer ignores the last duration unless the final file is repeated.
+        lines.append(lines[-2])
+    concat_path = output_path.with_name(f"{output_path.stem}.ffconcat")
+    concat_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    width, height = size
+    command = [
+        imageio_ffmpeg.get_ffmpeg_exe(),
+        "-y",
+        "-loglevel",
+        "error",
+        "-f",
+        "concat",
+        "-safe",
+        "0",
+        "-i",
+        str(concat_path),
+        "-vf",
+        f"scale={width}:{height},fps={fps},format=yuv420p",
+        "-t",
+        str(duration_sec),
+        "-c:v",
+        "libx264",
+        "-b:v",
+        bitrate,
+        "-an",
+        "-movflags",
+        "+faststart",
+        str(output_path),
+    ]
+    try:
+        completed = subprocess.run(command, capture_output=True, text=True, check=False)
+    finally:
+        concat_path.unlink(missing_ok=True)
+    if completed.returncode != 0:
+        raise RuntimeError(f"ffmpeg slideshow encode failed: {completed.stderr.strip()[-500:]}")
+
+
+def compose_slideshow_moviepy(
+    frame_paths: list[Path],
+    output_path: Path,
+    duration_sec: int,
+    *,
+    size: tuple[int, int],
+    fps: int,
+    bitrate: str,
+) -> None:
+    from moviepy import ImageClip, concatenate_videoclips
+
+    clip_duration = duration_sec / max(1, len(frame_paths))
+    clips = [ImageClip(str(frame)).with_duration(clip_duration) for frame in frame_paths]
+    video = concatenate_videoclips(clips, method="compose")
+    video = video.resized(new_size=size)
+    # Requested behavior: no voice/music generation, export silent storyboard preview.
+    video.write_videofile(
+        str(output_path),
+        fps=fps,
+        codec="libx264",
+        audio=False,
+        bitrate=bitrate,
+        logger=None,
+    )
+    video.close()
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import multiprocessing
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+from PIL import Image
+
+from app.config import Settings
+
+TEXT_CHAR_PATTERN = re.compile(r"[A-Za-z0-9가-힣]")
+
+
+@dataclass(frozen=True)
+class TextGuardResult:
+    text_chars: int
+    ocr_ms: int
+    skipped: bool
+
+
+def count_text_like_blocks(
+    image: Image.Image,
+    block_size: int = 16,
+    edge_threshold: int = 60,
+    min_edge_density: float = 0.08,
+) -> int:
+    """Count blocks with dense, sharp edges in both directions (a cheap text heatmap).
+
+    Glyph strokes give strong horizontal and vertical gradients packed into small
+    areas; smooth photographic regions and soft bokeh rarely do both at once.
+    """
+    gray = np.asarray(image.convert("L"), dtype=np.int16)
+    height = gray.shape[0] - gray.shape[0] % block_size
+    width = gray.shape[1] - gray.shape[1] % block_size
+    if height == 0 or width == 0:
+        return 0
+    gray = gray[:height, :width]
+    grad_x = np.zeros_like(gray, dtype=bool)
+    grad_y = np.zeros_like(gray, dtype=bool)
+    grad_x[:, 1:] = np.abs(np.diff(gray, axis=1)) > edge_threshold
+    grad_y[1:, :] = np.abs(np.diff(gray, axis=0)) > edge_threshold
+    shape = (height // block_size, block_size, width // block_size, block_size)
+    density_x = grad_x.reshape(shape).mean(axis=(1, 3))
+    density_y = grad_y.reshape(shape).mean(axis=(1, 3))
+    text_like = (density_x >= min_edge_density) & (density_y >= min_edge_density)
+    return int(text_like.sum())
+
+
+def run_ocr(image: Image.Image) -> tuple[int, int]:
+    """Return (text char count, OCR milliseconds). Runs inside the OCR worker process."""
+    import pytesseract
+
+    started_at = time.perf_counter()
+    try:
+        try:
+            extracted = pytesseract.image_to_string(image, lang="eng+kor")
+        except Exception:
+            extracted = pytesseract.image_to_string(image, lang="eng")
+    except Exception:
+        extracted = ""
+    elapsed_ms = int((time.perf_counter() - started_at) * 1000)
+    return len(TEXT_CHAR_PATTERN.findall(extracted)), elapsed_ms
+
+
+class TextGuard:
+    def __init__(self, settings: Settings) -> None:
+        self.settings = settings
+        self.warning = ""
+        try:
+            import pytesseract
+
+            _ = pytesseract.get_tesseract_version()
+            self.available = True
+        except Exception as exc:
+            self.available = False
+            self.warning = f"OCR unavailable: {exc}"
+        self._pool: ProcessPoolExecutor | None = None
+        if self.available and settings.ocr_workers > 0:
+            # spawn: the parent is multi-threaded, so forking it is not safe.
+            self._pool = ProcessPoolExecutor(
+                max_workers=settings.ocr_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+
+    def check(self, image: Image.Image) -> TextGuardResult:
+        if not self.available:
+            return TextGuardResult(text_chars=0, ocr_ms=0, skipped=True)
+        if (
+            self.settings.ocr_prefilter_enabled
+            and count_text_like_blocks(image) < self.settings.ocr_prefilter_min_blocks
+        ):
+            return TextGuardResult(text_chars=0, ocr_ms=0, skipped=True)
+
+        ocr_image = image.convert("L") if self.settings.ocr_grayscale else image
+        scale = self.settings.ocr_scale
+        if 0 < scale < 1:
+            ocr_image = ocr_image.resize(
+                (max(1, int(image.width * scale)), max(1, int(image.height * scale))),
+                Image.Resampling.BILINEAR,
+            )
+        if self._pool is None:
+            text_chars, ocr_ms = run_ocr(ocr_image)
+        else:
+            try:
+                text_chars, ocr_ms = self._pool.submit(run_ocr, ocr_image).result()
+            except Exception:
+                # A crashed worker breaks the pool; keep guarding in-thread rather than failing the image.
+                text_chars, ocr_ms = run_ocr(ocr_image)
+        return TextGuardResult(text_chars=text_chars, ocr_ms=ocr_ms, skipped=False)
@@ -1,63 +1,137 @@
 from __future__ import annotations
 
-import urllib.request
+from concurrent.futures import Future
 from pathlib import Path
+from typing import Any, Callable
 
+import httpx
 from google import genai
 from google.genai import types
 
+from app.clients import get_client_registry
 from app.config import get_settings
+from app.services.operation_poller import get_operation_poller
+from app.services.rate_limiter import get_rate_limiter, is_resource_exhausted
+from app.services.reference_assets import ReferenceAssetRegistry
+
+BATCH_IMAGE_INSTRUCTION = (
+    "아래 {count}개 장면을 순서대로 각각 이미지 1장씩, 총 {count}장 생성한다.\n"
+    "첨부된 참조 이미지의 인물 외형을 모든 장면에서 동일하게 유지한다.\n"
+    "장면을 합치거나 건너뛰지 말고, 이미지 외 설명 텍스트는 최소화한다."
+)
 
 
 class VertexProvider:
-    def __init__(self) -> None:
+    def __init__(self, client: genai.Client | None = None, http_client: httpx.Client | None = None) -> None:
         settings = get_settings()
         if not settings.gcp_project_id:
             raise ValueError("GCP_PROJECT_ID is required.")
         self.settings = settings
-        self.client = genai.Client(
-            vertexai=True,
-            project=settings.gcp_project_id,
-            location=settings.gcp_location,
+        registry = get_client_registry()
+        self.client = client or registry.genai()
+        self.http = http_client or registry.http
+        self.rate_limiter = get_rate_limiter()
+        self.operation_poller = get_operation_poller()
+        self.references = ReferenceAssetRegistry(
+            self.http,
+            bucket=settings.reference_gcs_bucket,
+            prefix=settings.reference_gcs_prefix,
+            max_entries=settings.reference_cache_max_entries,
+        )
+        self.rate_limiter.configure(
+            settings.gcp_vertex_image_model,
+            settings.image_requests_per_minute,
+            burst=settings.image_request_burst,
+        )
+        self.rate_limiter.configure(
+            settings.gcp_vertex_video_model,
+            settings.video_requests_per_minute,
         )
 
+    def _call_limited(self, model: str, func: Callable[..., Any], **kwargs: Any) -> Any:
+        self.rate_limiter.acquire(model)
+        try:
+            result = func(model=model, **kwargs)
+        except Exception as exc:
+            if is_resource_exhausted(exc):
+                self.rate_limiter.record_exhausted(model)
+            raise
+        self.rate_limiter.record_success(model)
+        return result
+
     def generate_image(
         self,
         prompt: str,
         output_path: Path,
         reference_images: list[Path] | None = None,
     ) -> Path:
+        image_bytes = self.generate_image_bytes(prompt, reference_images=reference_images)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_bytes(image_bytes)
+        return output_path
+
+    def generate_image_bytes(
+        self,
+        prompt: str,
+        reference_images: list[Path] | None = None,
+    ) -> bytes:
         contents: list[object] = [prompt]
-        for reference in reference_images or []:
-            if not reference.exists():
-                continue
-            contents.append(
-                types.Part.from_bytes(data=reference.read_bytes(), mime_type="image/png")
-            )
+        contents.extend(self._reference_parts(reference_images))
 
-        response = self.client.models.generate_content(
-            model=self.settings.gcp_vertex_image_model,
+        response = self._call_limited(
+            self.settings.gcp_vertex_image_model,
+            self.client.models.generate_content,
             contents=contents,
             config=types.GenerateContentConfig(response_modalities=[types.Modality.IMAGE]),
         )
-        image_bytes = None
+        images = self._inline_images(response)
+        if not images:
+            raise ValueError("Gemini image payload missing.")
+        return images[0]
+
+    def generate_image_batch(
+        self,
+        prompts: list[str],
+        reference_images: list[Path] | None = None,
+    ) -> list[bytes]:
+        """Request one image per prompt in a single call; images come back in response order.
+
+        References are sent once for the whole batch. The caller must check the count,
+        because the model may return fewer or more images than asked for.
+        """
+        contents: list[object] = [BATCH_IMAGE_INSTRUCTION.format(count=len(prompts))]
+        contents.extend(self._reference_parts(reference_images))
+        for idx, prompt in enumerate(prompts, start=1):
+            contents.append(f"[이미지 {idx}/{len(prompts)}]\n{prompt}")
+
+        response = self._call_limited(
+            self.settings.gcp_vertex_image_model,
+            self.client.models.generate_content,
+            contents=contents,
+            config=types.GenerateContentConfig(
+                response_modalities=[types.Modality.TEXT, types.Modality.IMAGE]
+            ),
+        )
+        return self._inline_images(response)
+
+    def _reference_parts(self, reference_images: list[Path] | None) -> list[types.Part]:
+        parts = [self.references.part(reference) for reference in reference_images or []]
+        return [part for part in parts if part is not None]
+
+    @staticmethod
+    def _inline_images(response: Any) -> list[bytes]:
+        # Images from the first candidate that has any; other candidates are alternatives.
         for candidate in response.candidates or []:
             if not candidate.content:
                 continue
-            for part in candidate.content.parts or []:
-                inline_data = getattr(part, "inline_data", None)
-                if inline_data and inline_data.data:
-                    image_bytes = inline_data.data
-                    break
-            if image_bytes:
-                break
-
-        if not image_bytes:
-            raise ValueError("Gemini image payload missing.")
-
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        output_path.write_bytes(image_bytes)
-        return output_path
+            images = [
+                part.inline_data.data
+                for part in candidate.content.parts or []
+                if getattr(part, "inline_data", None) and part.inline_data.data
+            ]
+            if images:
+                return images
+        return []
 
     def generate_video(
         self,
@@ -66,8 +140,17 @@ class VertexProvider:
         duration_sec: int,
         image_path: Path | None = None,
     ) -> Path:
+        operation = self.start_video(prompt, duration_sec, image_path=image_path).result()
+        return self.save_video(operation, output_path)
+
+    def start_video(
+        self,
+        prompt: str,
+        duration_sec: int,
+        image_path: Path | None = None,
+    ) -> Future[Any]:
+        """Submit a Veo render; the Future resolves to the finished operation."""
         kwargs: dict[str, object] = {
-            "model": self.settings.gcp_vertex_video_model,
             "prompt": prompt,
             "config": types.GenerateVideosConfig(
                 duration_seconds=duration_sec,
@@ -81,15 +164,21 @@ class VertexProvider:
             except TypeError:
                 kwargs["image"] = types.Image.from_file(str(image_path))
 
-        operation = self.client.models.generate_videos(**kwargs)
-        max_polls = 45
-        for _ in range(max_polls):
-            operation = self.client.operations.get(operation=operation)
-            if operation.done:
-                break
-        if not operation.done:
-            raise TimeoutError("Vertex video generation timed out.")
+        operation = self._call_limited(
+            self.settings.gcp_vertex_video_model,
+            self.client.models.generate_videos,
+            **kwargs,
+        )
+        return self.operation_poller.track(
+            operation,
+            lambda current: self.client.operations.get(operation=current),
+            deadline_sec=self.settings.veo_operation_deadline_sec,
+        )
 
+    def save_video(self, operation: Any, output_path: Path) -> Path:
+        error = getattr(operation, "error", None)
+        if error:
+            raise RuntimeError(f"Vertex video generation failed: {error}")
         response_payload = getattr(operation, "response", None)
         if not response_payload or not getattr(response_payload, "generated_videos", None):
             raise ValueError("Vertex video generation returned no output.")
@@ -105,7 +194,11 @@ class VertexProvider:
         if not video_uri:
             raise ValueError("Generated video URI not found.")
 
-        urllib.request.urlretrieve(video_uri, output_path)
+        with self.http.stream("GET", video_uri) as response:
+            response.raise_for_status()
+            with output_path.open("wb") as handle:
+                for chunk in response.iter_bytes():
+                    handle.write(chunk)
         return output_path
 
     def generate_tts_wav(self, script_text: str, output_path: Path) -> Path:
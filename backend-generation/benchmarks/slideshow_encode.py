@@ -0,0 +1,112 @@
+"""Compare the ffmpeg concat-demuxer and moviepy slideshow encoders.
+
+Run from backend-generation/:
+
+    python -m benchmarks.slideshow_encode [--frames DIR] [--runs 3]
+
+Each encode runs in a fresh interpreter so peak RSS (the worker plus any
+ffmpeg child) is measured per backend instead of accumulating across runs.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from app.config import get_settings
+
+
+def _make_frames(target_dir: Path, count: int, size: tuple[int, int]) -> list[Path]:
+    import numpy as np
+    from PIL import Image
+
+    rng = np.random.default_rng(7)
+    paths: list[Path] = []
+    for idx in range(1, count + 1):
+        pixels = rng.integers(0, 255, size=(size[1], size[0], 3), dtype=np.uint8)
+        path = target_dir / f"frame_{idx:02d}.png"
+        Image.fromarray(pixels).save(path, format="PNG")
+        paths.append(path)
+    return paths
+
+
+def _encode_once(encoder: str, frames: list[str], output: str) -> None:
+    from app.services.slideshow import compose_slideshow_ffmpeg, compose_slideshow_moviepy
+
+    settings = get_settings()
+    encode = compose_slideshow_ffmpeg if encoder == "ffmpeg" else compose_slideshow_moviepy
+    started_at = time.perf_counter()
+    encode(
+        [Path(frame) for frame in frames],
+        Path(output),
+        settings.default_max_video_seconds,
+        size=(settings.output_image_width, settings.output_image_height),
+        fps=settings.preview_video_fps,
+        bitrate=settings.preview_video_bitrate,
+    )
+    elapsed = time.perf_counter() - started_at
+    # ru_maxrss is KiB on Linux; report the larger of this process and its children.
+    peak_kib = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    print(json.dumps({"elapsed_sec": elapsed, "peak_rss_mib": peak_kib / 1024}))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=Path, help="Directory of frame_*.png files to encode.")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--worker", nargs=3, metavar=("ENCODER", "FRAMES_JSON", "OUTPUT"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        encoder, frames_json, output = args.worker
+        _encode_once(encoder, json.loads(frames_json), output)
+        return
+
+    settings = get_settings()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        work_dir = Path(temp_dir)
+        if args.frames:
+            frames = sorted(args.frames.glob("frame_*.png"))
+        else:
+            frames = _make_frames(work_dir, 5, (settings.output_image_width, settings.output_image_height))
+        if not frames:
+            raise SystemExit("No frame_*.png files found.")
+
+        print(f"{len(frames)} frames, {settings.preview_video_fps} fps, {settings.preview_video_bitrate}")
+        for encoder in ("ffmpeg", "moviepy"):
+            samples = []
+            for run in range(args.runs):
+                output = work_dir / f"{encoder}_{run}.mp4"
+                completed = subprocess.run(
+                    [
+                        sys.executable,
+                        "-m",
+                        "benchmarks.slideshow_encode",
+                        "--worker",
+                        encoder,
+                        json.dumps([str(frame) for frame in frames]),
+                        str(output),
+                    ],
+                    capture_output=True,
+                    text=True,
+                    check=True,
+                )
+                samples.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+            print(
+                f"{encoder:8s} encode median {statistics.median(s['elapsed_sec'] for s in samples):.3f}s"
+                f"  peak RSS max {max(s['peak_rss_mib'] for s in samples):.1f} MiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+import io
+import json
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from PIL import Image
+
+from app.clients import get_client_registry
+from app.config import get_settings
+from app.services.creator_reference import CreatorReferenceResult, CreatorReferenceService
+from app.services.operation_poller import get_operation_poller
+from app.services.payload_normalizer import normalize_asset_job_payload
+from app.services.rate_limiter import get_rate_limiter
+from app.services.scene_planner import PlannedScene, ScenePlannerService, ScenePlanResult
+
+SAMPLE_SCRIPT = Path(__file__).resolve().parents[1] / "examples" / "sample_script.json"
+SOURCE_SPANS = ["hook", "body_0", "body_1", "body_2_or_conclusion", "closing+conclusion"]
+TERMINAL = ("succeeded", "failed")
+
+
+def _clear_caches() -> None:
+    for cached in (get_settings, get_client_registry, get_rate_limiter, get_operation_poller):
+        cached.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def settings_env(monkeypatch, tmp_path):
+    monkeypatch.setenv("GCP_PROJECT_ID", "test-project")
+    monkeypatch.setenv("GENERATED_DIR", str(tmp_path / "generated"))
+    monkeypatch.setenv("JOB_STORE_PATH", str(tmp_path / "jobs.sqlite3"))
+    monkeypatch.setenv("CREATOR_REFERENCE_CACHE_PATH", "")
+    monkeypatch.setenv("IMAGE_REQUESTS_PER_MINUTE", "60000")
+    monkeypatch.setenv("IMAGE_REQUEST_BURST", "100")
+    monkeypatch.setenv("OCR_WORKERS", "0")
+    _clear_caches()
+    yield
+    _clear_caches()
+
+
+def png_bytes(color=(120, 30, 200)) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (1024, 576), color).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+class FakeModels:
+    """Stands in for client.models: every generate_content call returns one PNG."""
+
+    def __init__(self) -> None:
+        self.image_calls = 0
+
+    def generate_content(self, model, contents, config=None):
+        self.image_calls += 1
+        part = SimpleNamespace(text=None, inline_data=SimpleNamespace(data=png_bytes(), mime_type="image/png"))
+        return SimpleNamespace(text="", candidates=[SimpleNamespace(content=SimpleNamespace(parts=[part]))])
+
+
+class FakeClients:
+    def __init__(self) -> None:
+        self.models = FakeModels()
+        self.http = httpx.Client()
+
+    def genai(self, *args, **kwargs):
+        return SimpleNamespace(models=self.models)
+
+
+def fake_plan(self, payload, creator_reference=None):
+    scenes = [
+        PlannedScene(index, span, "intent", "subject", "action", "location", ["prop"], "camera", "angle", "face")
+        for index, span in enumerate(SOURCE_SPANS, 1)
+    ]
+    return ScenePlanResult({"identity": "host"}, ["same host"], {"intent": "thumbnail"}, scenes)
+
+
+def fake_resolve(self, payload, timings=None):
+    return CreatorReferenceResult(
+        reference={"creator_name": "host", "search_used": False}, resolved_by="no_search", cache_hit=False
+    )
+
+
+@pytest.fixture
+def fake_clients(monkeypatch):
+    monkeypatch.setattr(ScenePlannerService, "plan", fake_plan)
+    monkeypatch.setattr(CreatorReferenceService, "resolve", fake_resolve)
+    clients = FakeClients()
+    yield clients
+    clients.http.close()
+
+
+@pytest.fixture
+def make_pipeline(fake_clients):
+    from app.services.pipeline import PipelineService
+
+    services = []
+
+    def make():
+        service = PipelineService(clients=fake_clients)
+        services.append(service)
+        return service
+
+    yield make
+    for service in services:
+        service.scheduler.shutdown()
+
+
+@pytest.fixture
+def job_payload():
+    return normalize_asset_job_payload(json.loads(SAMPLE_SCRIPT.read_text(encoding="utf-8")))
+
+
+def wait_for_terminal(service, job_id: str, timeout_sec: float = 30.0):
+    deadline = time.monotonic() + timeout_sec
+    while time.monotonic() < deadline:
+        status = service.get_status(job_id)
+        if status.status in TERMINAL:
+            return status
+        time.sleep(0.02)
+    raise AssertionError(f"job {job_id} did not finish: {service.get_status(job_id)}")
+
+
+def read_result(service, job_id: str) -> dict:
+    return json.loads((service.generated_dir / job_id / "result.json").read_text(encoding="utf-8"))
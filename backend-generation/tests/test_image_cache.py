@@ -0,0 +1,78 @@
+import os
+import time
+
+from app.services.image_cache import ImageCache
+
+
+def write(path, size: int):
+    path.write_bytes(b"\0" * size)
+    return path
+
+
+def age(cache: ImageCache, key: str, seconds: float) -> None:
+    entry = cache.cache_dir / f"{key}.png"
+    stamp = time.time() - seconds
+    os.utime(entry, (stamp, stamp))
+
+
+def test_evicts_least_recently_used_entries_by_total_bytes(tmp_path):
+    cache = ImageCache(tmp_path / "cache", max_bytes=250)
+    cache.store("a", write(tmp_path / "a.png", 100))
+    age(cache, "a", 30)
+    cache.store("b", write(tmp_path / "b.png", 100))
+    age(cache, "b", 20)
+    # A hit refreshes recency, so b becomes the oldest entry.
+    assert cache.fetch("a", tmp_path / "out" / "a.png")
+
+    cache.store("c", write(tmp_path / "c.png", 100))
+
+    assert cache.fetch("a", tmp_path / "out" / "a2.png")
+    assert not cache.fetch("b", tmp_path / "out" / "b.png")
+    assert cache.fetch("c", tmp_path / "out" / "c.png")
+    assert cache._total_bytes == 200
+
+
+def test_one_large_entry_can_evict_several_small_ones(tmp_path):
+    cache = ImageCache(tmp_path / "cache", max_bytes=300)
+    for index, key in enumerate(["a", "b", "c"]):
+        cache.store(key, write(tmp_path / f"{key}.png", 80))
+        age(cache, key, 30 - index)
+
+    cache.store("big", write(tmp_path / "big.png", 150))
+
+    fetched = [cache.fetch(key, tmp_path / "out" / f"{key}.png") for key in ["a", "b", "c", "big"]]
+    assert fetched == [False, False, True, True]
+    assert cache._total_bytes == 230
+
+
+def test_entry_larger_than_the_cache_is_not_stored(tmp_path):
+    cache = ImageCache(tmp_path / "cache", max_bytes=100)
+    cache.store("huge", write(tmp_path / "huge.png", 101))
+
+    assert not cache.fetch("huge", tmp_path / "out.png")
+    assert cache._total_bytes == 0
+
+
+def test_sizes_and_recency_survive_a_restart(tmp_path):
+    cache = ImageCache(tmp_path / "cache", max_bytes=250)
+    cache.store("old", write(tmp_path / "old.png", 100))
+    age(cache, "old", 60)
+    cache.store("new", write(tmp_path / "new.png", 100))
+
+    reopened = ImageCache(tmp_path / "cache", max_bytes=250)
+    reopened.store("next", write(tmp_path / "next.png", 100))
+
+    assert not reopened.fetch("old", tmp_path / "out" / "old.png")
+    assert reopened.fetch("new", tmp_path / "out" / "new.png")
+
+
+def test_fetched_file_does_not_share_writes_with_the_cache(tmp_path):
+    cache = ImageCache(tmp_path / "cache", max_bytes=1000)
+    cache.store("a", write(tmp_path / "a.png", 10))
+    output = tmp_path / "job" / "frame.png"
+    assert cache.fetch("a", output)
+
+    output.unlink()
+    write(output, 20)
+
+    assert (cache.cache_dir / "a.png").stat().st_size == 10
@@ -0,0 +1,60 @@
+import asyncio
+
+from app.services.job_store import JobEventHub, JobRecord, JobStore
+
+
+def test_other_jobs_do_not_wake_an_unpublished_job():
+    async def run() -> int:
+        hub = JobEventHub()
+        version = hub.version("recovered")
+        waiter = asyncio.create_task(hub.wait("recovered", version, timeout_sec=0.2))
+        await asyncio.sleep(0)
+        hub.publish("other")
+        hub.publish("other", terminal=True)
+        return await waiter
+
+    assert asyncio.run(run()) == 0
+
+
+def test_first_publish_wakes_an_unpublished_job():
+    async def run() -> int:
+        hub = JobEventHub()
+        waiter = asyncio.create_task(hub.wait("recovered", hub.version("recovered"), timeout_sec=5))
+        await asyncio.sleep(0)
+        hub.publish("recovered")
+        return await asyncio.wait_for(waiter, 1)
+
+    assert asyncio.run(run()) > 0
+
+
+def test_terminal_job_keeps_only_a_bounded_final_version():
+    hub = JobEventHub(max_finished=2)
+    for job_id in ("a", "b", "c"):
+        hub.publish(job_id)
+        hub.publish(job_id, terminal=True)
+
+    assert hub._versions == {}
+    assert list(hub._finished) == ["b", "c"]
+
+
+def test_waiter_that_read_before_terminal_returns_at_once():
+    async def run() -> tuple[int, int]:
+        store = JobStore()
+        store.put(JobRecord(job_id="job"))
+        seen = store.events.version("job")
+        store.update("job", status="succeeded", stage="done", progress=100)
+        return seen, await asyncio.wait_for(store.events.wait("job", seen, timeout_sec=5), 1)
+
+    seen, current = asyncio.run(run())
+    assert current > seen
+
+
+def test_resumed_job_versions_keep_increasing():
+    hub = JobEventHub()
+    hub.publish("job")
+    hub.publish("job", terminal=True)
+    final = hub.version("job")
+    hub.publish("job")
+
+    assert hub.version("job") > final
+    assert "job" not in hub._finished
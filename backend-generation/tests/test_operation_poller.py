@@ -0,0 +1,80 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.operation_poller import MAX_CONSECUTIVE_POLL_ERRORS, OperationPoller
+
+
+class FakeOperation:
+    """Finishes after done_after refreshes; records when each refresh happened."""
+
+    def __init__(self, done_after: int | None = None, fail_with: Exception | None = None) -> None:
+        self.done_after = done_after
+        self.fail_with = fail_with
+        self.poll_times: list[float] = []
+
+    def refresh(self, operation):
+        self.poll_times.append(time.monotonic())
+        if self.fail_with is not None:
+            raise self.fail_with
+        done = self.done_after is not None and len(self.poll_times) >= self.done_after
+        return SimpleNamespace(done=done, polls=len(self.poll_times))
+
+
+def test_polls_with_growing_delays_until_done():
+    poller = OperationPoller(initial_delay_sec=0.02, max_delay_sec=1.0, multiplier=2.0, jitter=0.0)
+    operation = FakeOperation(done_after=4)
+    started_at = time.monotonic()
+
+    result = poller.track(SimpleNamespace(done=False), operation.refresh, deadline_sec=10).result(5)
+
+    assert result.done and result.polls == 4
+    gaps = [b - a for a, b in zip([started_at, *operation.poll_times], operation.poll_times)]
+    # 0.02, 0.04, 0.08, 0.16: each wait at least the scheduled delay and longer than the last.
+    for gap, expected in zip(gaps, [0.02, 0.04, 0.08, 0.16]):
+        assert gap >= expected * 0.9
+    assert gaps == sorted(gaps)
+    assert poller.pending() == 0
+
+
+def test_delay_is_capped_at_max_delay():
+    poller = OperationPoller(initial_delay_sec=0.01, max_delay_sec=0.02, multiplier=10.0, jitter=0.0)
+    operation = FakeOperation(done_after=4)
+
+    poller.track(SimpleNamespace(done=False), operation.refresh, deadline_sec=10).result(5)
+
+    gaps = [b - a for a, b in zip(operation.poll_times, operation.poll_times[1:])]
+    assert max(gaps) < 0.2
+
+
+def test_times_out_at_the_deadline():
+    poller = OperationPoller(initial_delay_sec=0.02, max_delay_sec=0.05, multiplier=1.5, jitter=0.0)
+    operation = FakeOperation()
+    started_at = time.monotonic()
+    future = poller.track(SimpleNamespace(done=False), operation.refresh, deadline_sec=0.3)
+
+    with pytest.raises(TimeoutError):
+        future.result(5)
+    elapsed = time.monotonic() - started_at
+    assert 0.3 <= elapsed < 1.0
+    # The last poll lands on the deadline itself.
+    assert operation.poll_times[-1] - started_at >= 0.29
+
+
+def test_gives_up_after_consecutive_poll_errors():
+    poller = OperationPoller(initial_delay_sec=0.01, max_delay_sec=0.01, jitter=0.0)
+    operation = FakeOperation(fail_with=ConnectionError("reset"))
+
+    with pytest.raises(ConnectionError):
+        poller.track(SimpleNamespace(done=False), operation.refresh, deadline_sec=10).result(5)
+    assert len(operation.poll_times) == MAX_CONSECUTIVE_POLL_ERRORS
+
+
+def test_already_done_operation_is_not_polled():
+    poller = OperationPoller()
+    operation = FakeOperation()
+    done = SimpleNamespace(done=True)
+
+    assert poller.track(done, operation.refresh, deadline_sec=10).result(0) is done
+    assert operation.poll_times == []
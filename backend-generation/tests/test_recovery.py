@@ -0,0 +1,57 @@
+from pathlib import Path
+
+from app.services.job_store import JobRecord, SqliteJobStore
+
+from conftest import wait_for_terminal
+
+
+def seed(store: SqliteJobStore, job_id: str, status: str, payload: dict) -> None:
+    store.put(
+        JobRecord(
+            job_id=job_id,
+            status=status,
+            stage=status,
+            pipeline_mode="storyboard",
+            result_path=f"/generated/{job_id}/result.json",
+        ),
+        payload=payload,
+    )
+
+
+def test_restart_fails_running_jobs_and_resumes_queued_ones(monkeypatch, tmp_path, make_pipeline, job_payload):
+    monkeypatch.setenv("JOB_STORE_BACKEND", "sqlite")
+    payload = job_payload.model_dump(mode="json")
+    store = SqliteJobStore(tmp_path / "jobs.sqlite3")
+    seed(store, "running1", "running", payload)
+    seed(store, "queued01", "queued", payload)
+    seed(store, "broken01", "queued", {"not": "a payload"})
+
+    service = make_pipeline()
+
+    interrupted = service.get_status("running1")
+    assert interrupted.status == "failed"
+    assert interrupted.error_message == "Job interrupted by backend restart."
+    assert service.get_status("broken01").status == "failed"
+    assert wait_for_terminal(service, "queued01").status == "succeeded"
+    assert Path(service.generated_dir / "queued01" / "result.json").exists()
+
+
+def test_interrupted_job_can_be_resumed_once(monkeypatch, tmp_path, make_pipeline, job_payload):
+    monkeypatch.setenv("JOB_STORE_BACKEND", "sqlite")
+    store = SqliteJobStore(tmp_path / "jobs.sqlite3")
+    seed(store, "running1", "running", job_payload.model_dump(mode="json"))
+    service = make_pipeline()
+
+    service.resume_job("running1")
+
+    # The claim is a compare-and-set on "failed", so a second resume cannot start another run.
+    assert not service.store.compare_and_update("running1", "failed", status="queued")
+    assert wait_for_terminal(service, "running1").status == "succeeded"
+
+
+def test_put_if_absent_does_not_overwrite(tmp_path):
+    store = SqliteJobStore(tmp_path / "jobs.sqlite3")
+
+    assert store.put_if_absent(JobRecord(job_id="job1", status="queued"))
+    assert not store.put_if_absent(JobRecord(job_id="job1", status="failed"))
+    assert store.get("job1").status == "queued"
@@ -0,0 +1,32 @@
+from app.services.pipeline import PipelineService
+
+from conftest import read_result, wait_for_terminal
+
+
+def test_resume_skips_completed_stages(monkeypatch, make_pipeline, fake_clients, job_payload):
+    compose = PipelineService._compose_slideshow_video
+    calls = {"count": 0}
+
+    def flaky_compose(self, *args, **kwargs):
+        calls["count"] += 1
+        if calls["count"] == 1:
+            raise RuntimeError("ffmpeg crashed")
+        return compose(self, *args, **kwargs)
+
+    monkeypatch.setattr(PipelineService, "_compose_slideshow_video", flaky_compose)
+    service = make_pipeline()
+
+    job_id = service.create_job(job_payload).job_id
+    failed = wait_for_terminal(service, job_id)
+    assert failed.status == "failed"
+    assert "ffmpeg crashed" in failed.error_message
+    first_run_calls = fake_clients.models.image_calls
+    assert first_run_calls > 0
+
+    service.resume_job(job_id)
+
+    assert wait_for_terminal(service, job_id).status == "succeeded"
+    trace = read_result(service, job_id)["provider_trace"]
+    assert trace["resumed"] is True
+    assert {"scene_plan", "thumbnail", "anchor", "frame_01"} <= set(trace["skipped_stages"])
+    assert fake_clients.models.image_calls == first_run_calls
@@ -0,0 +1,104 @@
+import threading
+import time
+
+import pytest
+
+from app.config import get_settings
+from app.services.scheduler import PriorityGate, QueueFullError, StageScheduler
+
+
+def wait_until(predicate, timeout_sec: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout_sec
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not reached")
+        time.sleep(0.005)
+
+
+def make_scheduler(monkeypatch, **env) -> StageScheduler:
+    for key, value in env.items():
+        monkeypatch.setenv(key, str(value))
+    get_settings.cache_clear()
+    return StageScheduler(get_settings())
+
+
+def test_gate_serves_waiters_by_priority_then_arrival():
+    gate = PriorityGate("image", slots=1)
+    gate.acquire(priority=0)
+    order: list[str] = []
+    threads = []
+    for name, priority in [("video-1", 1), ("storyboard", 0), ("video-2", 1)]:
+        thread = threading.Thread(target=lambda n=name, p=priority: (gate.acquire(p), order.append(n), gate.release()))
+        thread.start()
+        threads.append(thread)
+        wait_until(lambda count=len(threads): gate.snapshot()["waiting"] == count)
+
+    gate.release()
+    for thread in threads:
+        thread.join(5)
+
+    assert order == ["storyboard", "video-1", "video-2"]
+    assert gate.snapshot() == {"slots": 1, "busy": 0, "waiting": 0}
+
+
+def test_queued_storyboard_job_overtakes_video_job(monkeypatch):
+    scheduler = make_scheduler(monkeypatch, MAX_ACTIVE_JOBS=1)
+    release = threading.Event()
+    order: list[str] = []
+    scheduler.submit("storyboard", release.wait)
+    scheduler.submit("storyboard_to_video", order.append, "video")
+    scheduler.submit("storyboard", order.append, "storyboard")
+    release.set()
+    wait_until(lambda: len(order) == 2)
+    scheduler.shutdown()
+
+    assert order == ["storyboard", "video"]
+
+
+def test_resumed_continuation_runs_before_new_jobs(monkeypatch):
+    scheduler = make_scheduler(monkeypatch, MAX_ACTIVE_JOBS=1)
+    release = threading.Event()
+    order: list[str] = []
+    scheduler.submit("storyboard", release.wait)
+    scheduler.submit("storyboard", order.append, "new")
+    scheduler.resume(order.append, "continuation")
+    release.set()
+    wait_until(lambda: len(order) == 2)
+    scheduler.shutdown()
+
+    assert order == ["continuation", "new"]
+
+
+def test_full_queue_rejects_until_a_reservation_is_released(monkeypatch):
+    scheduler = make_scheduler(monkeypatch, MAX_QUEUED_STORYBOARD_TO_VIDEO_JOBS=2)
+    scheduler.reserve("storyboard_to_video")
+    scheduler.reserve("storyboard_to_video")
+
+    with pytest.raises(QueueFullError):
+        scheduler.reserve("storyboard_to_video")
+    # Other modes have their own limit.
+    scheduler.reserve("storyboard")
+
+    scheduler.unreserve("storyboard_to_video")
+    scheduler.reserve("storyboard_to_video")
+    assert scheduler.snapshot()["queued"] == {"storyboard_to_video": 2, "storyboard": 1}
+    scheduler.shutdown()
+
+
+def test_dispatched_jobs_free_their_queue_slot_when_they_start(monkeypatch):
+    scheduler = make_scheduler(monkeypatch, MAX_ACTIVE_JOBS=1, MAX_QUEUED_STORYBOARD_JOBS=1)
+    started = threading.Event()
+    release = threading.Event()
+    scheduler.submit("storyboard", lambda: (started.set(), release.wait()))
+    started.wait(5)
+
+    # The running job no longer counts against the queue; one more may wait.
+    scheduler.submit("storyboard", lambda: None)
+    with pytest.raises(QueueFullError):
+        scheduler.submit("storyboard", lambda: None)
+    # Recovered jobs were admitted before the restart and bypass the limit.
+    scheduler.submit("storyboard", lambda: None, enforce_limit=False)
+
+    release.set()
+    wait_until(lambda: scheduler.snapshot()["queued"]["storyboard"] == 0)
+    scheduler.shutdown()
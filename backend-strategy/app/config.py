@@ -1,4 +1,5 @@
 from functools import lru_cache
+from typing import Literal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -12,8 +13,34 @@ class Settings(BaseSettings):
     gcp_project_id: str = ""
     gcp_location: str = "us-central1"
     strategy_vertex_text_model: str = "gemini-2.5-flash"
+    llm_max_concurrency: int = 16
+    signal_prompt_char_budget: int = 120_000
+    signal_map_chunk_chars: int = 40_000
+    signal_map_max_workers: int = 6
+    script_prefetch_top_n: int = 3
+    script_prefetch_workers: int = 4
+    script_cache_ttl_sec: float = 3600.0
+    script_cache_max_entries: int = 256
     youtube_data_api_key: str = ""
     youtube_api_base_url: str = "https://www.googleapis.com/youtube/v3"
+    youtube_max_concurrency: int = 8
+    youtube_api_max_concurrency: int = 32
+    youtube_video_source: Literal["uploads", "search"] = "uploads"
+    youtube_comment_scan_budget: int = 500
+    youtube_max_replies_per_thread: int = 5
+    youtube_cache_enabled: bool = True
+    youtube_cache_path: str = "data/youtube_cache.sqlite3"
+    youtube_cache_ttl_channels_sec: float = 3600.0
+    youtube_cache_ttl_search_sec: float = 900.0
+    youtube_cache_ttl_playlist_items_sec: float = 900.0
+    youtube_cache_ttl_comment_threads_sec: float = 300.0
+    youtube_cache_ttl_comments_sec: float = 300.0
+    youtube_cache_retention_sec: float = 86400.0
+    youtube_cache_max_rows: int = 20_000
+    strategy_http_timeout_sec: float = 15.0
+    strategy_http_max_connections: int = 32
+    strategy_http_max_keepalive_connections: int = 16
+    strategy_http_keepalive_expiry_sec: float = 60.0
 
 
 @lru_cache
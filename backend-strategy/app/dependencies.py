@@ -0,0 +1,30 @@
+from fastapi import Depends, HTTPException, Request
+
+from app.clients import ClientRegistry
+from app.services.strategy_ai_service import StrategyAIService
+from app.services.youtube_cache import get_youtube_cache
+from app.services.youtube_service import YouTubeCommentService
+
+
+def get_clients(request: Request) -> ClientRegistry:
+    return request.app.state.clients
+
+
+def get_strategy_ai_service(clients: ClientRegistry = Depends(get_clients)) -> StrategyAIService:
+    try:
+        return StrategyAIService(client=clients.genai(), upstream_limit=clients.upstream_limits["genai"])
+    except ValueError as exc:
+        raise HTTPException(status_code=500, detail=f"Strategy service unavailable: {exc}") from exc
+
+
+def get_youtube_comment_service(
+    clients: ClientRegistry = Depends(get_clients),
+) -> YouTubeCommentService:
+    try:
+        return YouTubeCommentService(
+            http_client=clients.async_http,
+            cache=get_youtube_cache(),
+            upstream_limit=clients.upstream_limits["youtube"],
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
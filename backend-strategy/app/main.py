@@ -1,17 +1,35 @@
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.clients import get_client_registry
 from app.config import get_settings
 from app.routers.health import router as health_router
 from app.routers.strategy import router as strategy_router
+from app.services.script_cache import get_script_cache
 
 settings = get_settings()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    clients = get_client_registry()
+    app.state.clients = clients
+    yield
+    get_script_cache().shutdown()
+    get_script_cache.cache_clear()
+    await clients.aclose()
+    get_client_registry.cache_clear()
+
+
 app = FastAPI(
     title=settings.strategy_app_name,
     debug=settings.strategy_app_debug,
     version="0.1.0",
     description="Strategy planning backend (teammate service)",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
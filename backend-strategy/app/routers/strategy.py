@@ -1,9 +1,14 @@
+import asyncio
+import json
 import logging
 import time
 import uuid
+from collections.abc import AsyncIterator
+from contextlib import aclosing
 from typing import Any
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 
 from app.schemas import (
     ChannelPipelineRequest,
@@ -20,6 +25,9 @@ from app.schemas import (
     YouTubeCommentsRequest,
     YouTubeCommentsResponse,
 )
+from app.config import get_settings
+from app.dependencies import get_strategy_ai_service, get_youtube_comment_service
+from app.services.script_cache import ScriptCache, get_script_cache, script_cache_key
 from app.services.strategy_ai_service import StrategyAIService
 from app.services.youtube_service import YouTubeCommentService, YouTubeDataAPIError
 
@@ -148,8 +156,104 @@ def _enrich_signals_with_video_context(
     return signal_output
 
 
+def _signal_request_from_comments(
+    comments_response: dict[str, Any], language: str
+) -> SignalOutputRequest:
+    return SignalOutputRequest(
+        videos=[
+            {
+                "video_id": v["video_id"],
+                "title": v.get("video_title"),
+                "thumbnail_url": v.get("thumbnail_url"),
+                "published_at": v.get("published_at"),
+                "comments": [
+                    {
+                        "author": c.get("author"),
+                        "text": c["text"],
+                        "published_at": c.get("published_at"),
+                        "like_count": c.get("like_count", 0),
+                    }
+                    for c in v.get("comments", [])
+                    # Replies would compete with top-level comments in the top-k and like
+                    # ranking without their thread context, so signals use top-level only.
+                    if not c.get("parent_comment_id")
+                ],
+                "comment_error": v.get("comment_error"),
+            }
+            for v in comments_response.get("videos", [])
+        ],
+        language=language,
+    )
+
+
+def _select_signal(
+    signals: list[dict[str, Any]], requested_signal_id: str | None
+) -> tuple[str, dict[str, Any]]:
+    if not signals:
+        raise HTTPException(status_code=422, detail="No signals generated from comments.")
+    selected_signal_id = requested_signal_id or signals[0].get("signal_id")
+    selected_signal = next(
+        (s for s in signals if s.get("signal_id") == selected_signal_id),
+        None,
+    )
+    if not selected_signal:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Requested signal_id '{requested_signal_id}' not found.",
+        )
+    return selected_signal_id, selected_signal
+
+
+def _script_request(signal: dict[str, Any], payload: ChannelPipelineRequest) -> ScriptOutputRequest:
+    return ScriptOutputRequest(
+        signal=signal,
+        signal_id=signal["signal_id"],
+        language=payload.language,
+        target_length_sec=payload.target_length_sec,
+        style=payload.style,
+    )
+
+
+def _prefetch_scripts(
+    payload: ChannelPipelineRequest,
+    signals: list[dict[str, Any]],
+    selected_signal: dict[str, Any],
+    strategy_service: StrategyAIService,
+    script_cache: ScriptCache,
+) -> dict[str, str]:
+    """Submit speculative script generation for the top-N signals other than the selected one."""
+    prefetch_count = (
+        payload.prefetch_scripts
+        if payload.prefetch_scripts is not None
+        else get_settings().script_prefetch_top_n
+    )
+    script_keys: dict[str, str] = {}
+    if script_cache.max_pending == 0:
+        return script_keys
+    for signal in signals[:prefetch_count]:
+        if signal is selected_signal or not signal.get("signal_id"):
+            continue
+        script_request = _script_request(signal, payload)
+        cache_key = script_cache_key(script_request)
+        script_cache.get_or_submit(
+            cache_key,
+            lambda req=script_request: strategy_service.generate_script_output_v2(req),
+            speculative=True,
+        )
+        script_keys.setdefault(signal["signal_id"], cache_key)
+    return script_keys
+
+
+def _sse_event(event: str, data: dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+def _elapsed_ms(started_at: float) -> int:
+    return int((time.perf_counter() - started_at) * 1000)
+
+
 @router.post("/plan", response_model=StrategyResponse)
-def build_strategy(payload: StrategyRequest) -> StrategyResponse:
+async def build_strategy(payload: StrategyRequest) -> StrategyResponse:
     items = [
         StrategyItem(
             step=1,
@@ -177,17 +281,22 @@ def build_strategy(payload: StrategyRequest) -> StrategyResponse:
 
 
 @router.post("/next-video-script", response_model=CommentBasedStrategyResponse)
-def build_next_video_script(payload: CommentBasedStrategyRequest) -> CommentBasedStrategyResponse:
+async def build_next_video_script(
+    payload: CommentBasedStrategyRequest,
+    service: StrategyAIService = Depends(get_strategy_ai_service),
+) -> CommentBasedStrategyResponse:
     try:
-        service = StrategyAIService()
-        result = service.generate_next_video_script(payload)
+        result = await service.generate_next_video_script(payload)
         return CommentBasedStrategyResponse(**result)
     except Exception as exc:
         raise HTTPException(status_code=500, detail=f"Strategy generation failed: {exc}") from exc
 
 
 @router.post("/signals/from-comments", response_model=SignalOutputResponse)
-def build_signal_output(payload: SignalOutputRequest) -> SignalOutputResponse:
+async def build_signal_output(
+    payload: SignalOutputRequest,
+    service: StrategyAIService = Depends(get_strategy_ai_service),
+) -> SignalOutputResponse:
     request_id = str(uuid.uuid4())[:8]
     started_at = time.perf_counter()
     logger.info(
@@ -197,8 +306,7 @@ def build_signal_output(payload: SignalOutputRequest) -> SignalOutputResponse:
         payload.language,
     )
     try:
-        service = StrategyAIService()
-        result = service.generate_signal_output_v2(payload)
+        result = await service.generate_signal_output_v2(payload)
         result = _enrich_signals_with_video_context(result, payload.videos)
         elapsed = time.perf_counter() - started_at
         logger.info(
@@ -220,7 +328,11 @@ def build_signal_output(payload: SignalOutputRequest) -> SignalOutputResponse:
 
 
 @router.post("/scripts/from-signal", response_model=ScriptOutputResponse)
-def build_script_output(payload: ScriptOutputRequest) -> ScriptOutputResponse:
+async def build_script_output(
+    payload: ScriptOutputRequest,
+    service: StrategyAIService = Depends(get_strategy_ai_service),
+    script_cache: ScriptCache = Depends(get_script_cache),
+) -> ScriptOutputResponse:
     request_id = str(uuid.uuid4())[:8]
     started_at = time.perf_counter()
     logger.info(
@@ -231,8 +343,12 @@ def build_script_output(payload: ScriptOutputRequest) -> ScriptOutputResponse:
         payload.style,
     )
     try:
-        service = StrategyAIService()
-        result = service.generate_script_output_v2(payload)
+        result = await asyncio.shield(
+            script_cache.get_or_submit(
+                script_cache_key(payload),
+                lambda: service.generate_script_output_v2(payload),
+            )
+        )
         elapsed = time.perf_counter() - started_at
         logger.info(
             "[%s] scripts/from-signal:done has_script=%s elapsed=%.2fs",
@@ -252,8 +368,33 @@ def build_script_output(payload: ScriptOutputRequest) -> ScriptOutputResponse:
         raise HTTPException(status_code=500, detail=f"Script generation failed: {exc}") from exc
 
 
+@router.get("/scripts/{signal_id}", response_model=ScriptOutputResponse)
+async def get_prefetched_script(
+    signal_id: str,
+    run_id: str = Query(..., description="run_id returned by /pipeline/from-handle"),
+    script_cache: ScriptCache = Depends(get_script_cache),
+) -> ScriptOutputResponse:
+    future = script_cache.lookup(run_id, signal_id)
+    if future is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No script for signal_id '{signal_id}' in run '{run_id}' (expired or not prefetched).",
+        )
+    try:
+        # Still generating: wait for the in-flight call rather than starting a new one.
+        return ScriptOutputResponse(**await asyncio.shield(future))
+    except Exception as exc:
+        logger.exception("scripts/lookup:error run_id=%s signal_id=%s detail=%s", run_id, signal_id, exc)
+        raise HTTPException(status_code=500, detail=f"Script generation failed: {exc}") from exc
+
+
 @router.post("/pipeline/from-handle", response_model=ChannelPipelineResponse)
-def build_pipeline_from_handle(payload: ChannelPipelineRequest) -> ChannelPipelineResponse:
+async def build_pipeline_from_handle(
+    payload: ChannelPipelineRequest,
+    strategy_service: StrategyAIService = Depends(get_strategy_ai_service),
+    comment_service: YouTubeCommentService = Depends(get_youtube_comment_service),
+    script_cache: ScriptCache = Depends(get_script_cache),
+) -> ChannelPipelineResponse:
     request_id = str(uuid.uuid4())[:8]
     started_at = time.perf_counter()
     logger.info(
@@ -268,15 +409,13 @@ def build_pipeline_from_handle(payload: ChannelPipelineRequest) -> ChannelPipeli
         payload.target_length_sec,
     )
     try:
-        comment_service = YouTubeCommentService()
-        strategy_service = StrategyAIService()
-
         step_started_at = time.perf_counter()
-        comments_response = comment_service.fetch_channel_comments(
+        comments_response = await comment_service.fetch_channel_comments(
             channel_handle=payload.channel_handle,
             max_videos=payload.max_videos,
             max_comments_per_video=payload.max_comments_per_video,
             comment_order=payload.comment_order,
+            include_replies=payload.include_replies,
         )
         logger.info(
             "[%s] pipeline:comments_collected videos=%s elapsed=%.2fs",
@@ -286,29 +425,8 @@ def build_pipeline_from_handle(payload: ChannelPipelineRequest) -> ChannelPipeli
         )
 
         step_started_at = time.perf_counter()
-        signal_request = SignalOutputRequest(
-            videos=[
-                {
-                    "video_id": v["video_id"],
-                    "title": v.get("video_title"),
-                    "thumbnail_url": v.get("thumbnail_url"),
-                    "published_at": v.get("published_at"),
-                    "comments": [
-                        {
-                            "author": c.get("author"),
-                            "text": c["text"],
-                            "published_at": c.get("published_at"),
-                            "like_count": c.get("like_count", 0),
-                        }
-                        for c in v.get("comments", [])
-                    ],
-                    "comment_error": None,
-                }
-                for v in comments_response.get("videos", [])
-            ],
-            language=payload.language,
-        )
-        signal_output = strategy_service.generate_signal_output_v2(signal_request)
+        signal_request = _signal_request_from_comments(comments_response, payload.language)
+        signal_output = await strategy_service.generate_signal_output_v2(signal_request)
         signal_output = _enrich_signals_with_video_context(signal_output, signal_request.videos)
         logger.info(
             "[%s] pipeline:signals_generated signals=%s elapsed=%.2fs",
@@ -317,33 +435,25 @@ def build_pipeline_from_handle(payload: ChannelPipelineRequest) -> ChannelPipeli
             time.perf_counter() - step_started_at,
         )
         signals = signal_output.get("signals", [])
-        if not signals:
-            raise HTTPException(status_code=422, detail="No signals generated from comments.")
-
-        selected_signal_id = payload.signal_id or signals[0].get("signal_id")
-        selected_signal = next(
-            (s for s in signals if s.get("signal_id") == selected_signal_id),
-            None,
-        )
-        if not selected_signal:
-            raise HTTPException(
-                status_code=422,
-                detail=f"Requested signal_id '{payload.signal_id}' not found.",
-            )
+        selected_signal_id, selected_signal = _select_signal(signals, payload.signal_id)
 
         step_started_at = time.perf_counter()
-        script_request = ScriptOutputRequest(
-            signal=selected_signal,
-            signal_id=selected_signal_id,
-            language=payload.language,
-            target_length_sec=payload.target_length_sec,
-            style=payload.style,
+        # The selected signal is submitted first so it is never queued behind speculative work.
+        selected_request = _script_request(selected_signal, payload)
+        selected_key = script_cache_key(selected_request)
+        selected_future = script_cache.get_or_submit(
+            selected_key,
+            lambda: strategy_service.generate_script_output_v2(selected_request),
         )
-        script_output = strategy_service.generate_script_output_v2(script_request)
+        prefetched = _prefetch_scripts(payload, signals, selected_signal, strategy_service, script_cache)
+        run_id = uuid.uuid4().hex
+        script_cache.register_run(run_id, {selected_signal_id: selected_key, **prefetched})
+        script_output = await asyncio.shield(selected_future)
         logger.info(
-            "[%s] pipeline:script_generated signal_id=%s elapsed=%.2fs",
+            "[%s] pipeline:script_generated signal_id=%s prefetching=%s elapsed=%.2fs",
             request_id,
             selected_signal_id,
+            len(prefetched),
             time.perf_counter() - step_started_at,
         )
 
@@ -364,6 +474,9 @@ def build_pipeline_from_handle(payload: ChannelPipelineRequest) -> ChannelPipeli
             signal_output=signal_output,
             selected_signal_id=selected_signal_id,
             script_output=script_output,
+            youtube_cache_stats=comments_response.get("cache_stats", {}),
+            run_id=run_id,
+            prefetched_signal_ids=list(prefetched),
         )
     except HTTPException:
         logger.exception("[%s] pipeline:http_error", request_id)
@@ -386,8 +499,125 @@ def build_pipeline_from_handle(payload: ChannelPipelineRequest) -> ChannelPipeli
         raise HTTPException(status_code=500, detail=f"Pipeline generation failed: {exc}") from exc
 
 
+@router.post("/pipeline/from-handle/stream")
+async def stream_pipeline_from_handle(
+    payload: ChannelPipelineRequest,
+    strategy_service: StrategyAIService = Depends(get_strategy_ai_service),
+    comment_service: YouTubeCommentService = Depends(get_youtube_comment_service),
+    script_cache: ScriptCache = Depends(get_script_cache),
+) -> StreamingResponse:
+    """Server-Sent Events variant of /pipeline/from-handle.
+
+    Events: comments_collected, signals_generated, script_chunk (raw JSON text as the
+    model streams it), script_generated, done; or error with status_code/detail.
+    """
+    request_id = str(uuid.uuid4())[:8]
+
+    async def events() -> AsyncIterator[str]:
+        started_at = time.perf_counter()
+        logger.info("[%s] pipeline:stream:start handle=%s", request_id, payload.channel_handle)
+        try:
+            step_started_at = time.perf_counter()
+            comments_response = await comment_service.fetch_channel_comments(
+                channel_handle=payload.channel_handle,
+                max_videos=payload.max_videos,
+                max_comments_per_video=payload.max_comments_per_video,
+                comment_order=payload.comment_order,
+                include_replies=payload.include_replies,
+            )
+            yield _sse_event(
+                "comments_collected",
+                {
+                    **YouTubeCommentsResponse(**comments_response).model_dump(mode="json"),
+                    "elapsed_ms": _elapsed_ms(step_started_at),
+                },
+            )
+
+            step_started_at = time.perf_counter()
+            signal_request = _signal_request_from_comments(comments_response, payload.language)
+            signal_output = await strategy_service.generate_signal_output_v2(signal_request)
+            signal_output = _enrich_signals_with_video_context(signal_output, signal_request.videos)
+            signals = signal_output.get("signals", [])
+            selected_signal_id, selected_signal = _select_signal(signals, payload.signal_id)
+            yield _sse_event(
+                "signals_generated",
+                {
+                    "signal_output": signal_output,
+                    "selected_signal_id": selected_signal_id,
+                    "elapsed_ms": _elapsed_ms(step_started_at),
+                },
+            )
+
+            step_started_at = time.perf_counter()
+            selected_request = _script_request(selected_signal, payload)
+            selected_key = script_cache_key(selected_request)
+            cached = script_cache.get(selected_key)
+            prefetched = _prefetch_scripts(payload, signals, selected_signal, strategy_service, script_cache)
+            if cached is not None:
+                script_output = await asyncio.shield(cached)
+            else:
+                parts: list[str] = []
+                # aclosing releases the LLM slot as soon as this generator is closed on a
+                # client disconnect, instead of whenever the inner generator is collected.
+                async with aclosing(strategy_service.stream_script_output_v2(selected_request)) as chunks:
+                    async for text in chunks:
+                        parts.append(text)
+                        yield _sse_event("script_chunk", {"signal_id": selected_signal_id, "text": text})
+                script_output = strategy_service.parse_script_output("".join(parts))
+                script_cache.put(selected_key, script_output)
+            run_id = uuid.uuid4().hex
+            script_cache.register_run(run_id, {selected_signal_id: selected_key, **prefetched})
+            yield _sse_event(
+                "script_generated",
+                {
+                    "signal_id": selected_signal_id,
+                    "script_output": ScriptOutputResponse(**script_output).model_dump(mode="json"),
+                    "cached": cached is not None,
+                    "elapsed_ms": _elapsed_ms(step_started_at),
+                },
+            )
+            yield _sse_event(
+                "done",
+                {
+                    "channel_handle": comments_response["channel_handle"],
+                    "channel_id": comments_response["channel_id"],
+                    "video_count": comments_response["video_count"],
+                    "selected_signal_id": selected_signal_id,
+                    "run_id": run_id,
+                    "prefetched_signal_ids": list(prefetched),
+                    "youtube_cache_stats": comments_response.get("cache_stats", {}),
+                    "total_ms": _elapsed_ms(started_at),
+                },
+            )
+            logger.info(
+                "[%s] pipeline:stream:done total_elapsed=%.2fs",
+                request_id,
+                time.perf_counter() - started_at,
+            )
+        except HTTPException as exc:
+            logger.exception("[%s] pipeline:stream:http_error", request_id)
+            yield _sse_event("error", {"status_code": exc.status_code, "detail": exc.detail})
+        except (YouTubeDataAPIError, ValueError) as exc:
+            logger.exception("[%s] pipeline:stream:bad_request detail=%s", request_id, exc)
+            yield _sse_event("error", {"status_code": 400, "detail": str(exc)})
+        except Exception as exc:
+            logger.exception("[%s] pipeline:stream:error detail=%s", request_id, exc)
+            yield _sse_event(
+                "error", {"status_code": 500, "detail": f"Pipeline generation failed: {exc}"}
+            )
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.post("/youtube/comments", response_model=YouTubeCommentsResponse)
-def collect_youtube_comments(payload: YouTubeCommentsRequest) -> YouTubeCommentsResponse:
+async def collect_youtube_comments(
+    payload: YouTubeCommentsRequest,
+    service: YouTubeCommentService = Depends(get_youtube_comment_service),
+) -> YouTubeCommentsResponse:
     request_id = str(uuid.uuid4())[:8]
     started_at = time.perf_counter()
     logger.info(
@@ -399,12 +629,12 @@ def collect_youtube_comments(payload: YouTubeCommentsRequest) -> YouTubeComments
         payload.comment_order,
     )
     try:
-        service = YouTubeCommentService()
-        response = service.fetch_channel_comments(
+        response = await service.fetch_channel_comments(
             channel_handle=payload.channel_handle,
             max_videos=payload.max_videos,
             max_comments_per_video=payload.max_comments_per_video,
             comment_order=payload.comment_order,
+            include_replies=payload.include_replies,
         )
         logger.info(
             "[%s] youtube/comments:done videos=%s elapsed=%.2fs",
@@ -60,6 +60,10 @@ class YouTubeCommentsRequest(BaseModel):
         default="top",
         description="Comment ordering mode: top (like/relevance-first) or latest (time-first)",
     )
+    include_replies: bool = Field(
+        default=False,
+        description="Also collect replies of the selected comments (parent_comment_id is set)",
+    )
 
 
 class YouTubeComment(BaseModel):
@@ -78,6 +82,7 @@ class VideoComments(BaseModel):
     published_at: datetime | None = None
     comment_count: int
     comments: list[YouTubeComment]
+    comment_error: str | None = None
 
 
 class YouTubeCommentsResponse(BaseModel):
@@ -88,6 +93,7 @@ class YouTubeCommentsResponse(BaseModel):
     subscriber_count: int | None = None
     video_count: int
     videos: list[VideoComments]
+    cache_stats: dict[str, int] = Field(default_factory=dict)
 
 
 class SignalComment(BaseModel):
@@ -126,6 +132,8 @@ class SignalOutputResponse(BaseModel):
     signals: list[dict[str, Any]]
     quality_checks: dict[str, Any]
     model: str
+    prefilter: dict[str, Any] = Field(default_factory=dict)
+    extraction: dict[str, Any] = Field(default_factory=dict)
 
 
 class ScriptOutputRequest(BaseModel):
@@ -164,10 +172,20 @@ class ChannelPipelineRequest(BaseModel):
         default="top",
         description="Comment ordering mode: top (like/relevance-first) or latest (time-first)",
     )
+    include_replies: bool = Field(
+        default=False,
+        description="Also collect replies of the selected comments (parent_comment_id is set)",
+    )
     language: str = "ko"
     target_length_sec: int = 180
     style: str = "informative"
     signal_id: str | None = None
+    prefetch_scripts: int | None = Field(
+        default=None,
+        ge=0,
+        le=10,
+        description="Also generate scripts for the top-N signals in the background (default from settings)",
+    )
 
 
 class ChannelPipelineResponse(BaseModel):
@@ -177,3 +195,6 @@ class ChannelPipelineResponse(BaseModel):
     signal_output: dict[str, Any]
     selected_signal_id: str
     script_output: dict[str, Any]
+    youtube_cache_stats: dict[str, int] = Field(default_factory=dict)
+    run_id: str | None = None
+    prefetched_signal_ids: list[str] = Field(default_factory=list)
@@ -0,0 +1,201 @@
+"""Deterministic comment pre-filtering applied before the signal prompt is built."""
+
+from __future__ import annotations
+
+import random
+import re
+import time
+import zlib
+from collections import Counter
+from typing import Any
+
+from app.schemas import SignalFilters, SignalOutputRequest
+
+# Lexicons follow the "Filtering policy" section of SIGNAL_OUTPUT_PROMPT. A comment is only
+# dropped when the matched tokens are its whole meaning: the patterns are stripped from the
+# whitespace-free text and at most a particle or ending may remain. Anything else, including
+# every negated or contrasted comment, is left for the model to judge.
+NOISE_PATTERN = re.compile(r"[\s\W_]+", re.UNICODE)
+LAUGHTER_PATTERN = re.compile(r"[ㄱ-ㅎㅏ-ㅣ]+|(?:하하|크크|lol)+", re.IGNORECASE)
+MEME_PATTERN = re.compile(r"개추|ㄹㅇ|ㅇㅈ|인정|레전드|킹받|실화냐|미쳤|1빠|첫댓|나만그런")
+THUMBNAIL_META_PATTERN = re.compile(
+    r"썸네일|썸넬|섬네일|제목|어그로|낚시|낚였|thumbnail|clickbait|프롬프트", re.IGNORECASE
+)
+PRAISE_PATTERN = re.compile(
+    r"잘(?:봤|보고|보았|봅)\w*?(?:갑니다|가요|어요|습니다|니다|다)?|"
+    r"감사(?:합니다|해요|드려요|드립니다)?|고마(?:워요|워|웠어요)|고맙(?:습니다|네요)|"
+    r"유익(?:해요|합니다|하네요|했어요|하고|한)?|최고(?:예요|에요|입니다|네요|다|야)?|"
+    r"좋은영상|좋아요|좋네요|좋습니다|응원(?:합니다|해요|할게요)?|"
+    r"구독(?:했어요|합니다|하고갑니다|박고갑니다|완료)?|"
+    r"재밌(?:어요|네요|습니다|다)?|재미있(?:어요|네요|습니다|다)?|"
+    r"멋져요|멋지네요|멋있(?:어요|네요|다)|대박|힐링(?:돼요|됩니다|하고갑니다)?|굿|짱"
+)
+PRAISE_FILLER_PATTERN = re.compile(r"진짜|정말|너무|항상|오늘도|늘|매번|완전|영상|님|최고의")
+# Negation or contrast anywhere means the comment carries a complaint, e.g. "안 좋아요",
+# "구독 취소", "재밌는데 너무 길어요".
+NEGATION_PATTERN = re.compile(r"안\s*\S|못\s*\S|않|취소|별로|아니|싫|는데|지만|근데|그런데|다만|아쉽")
+REQUEST_PATTERN = re.compile(
+    r"[?？]|궁금|알려|해\s*주세요|해주시|다뤄|부탁|어떻게|왜|언제|뭐가|무엇|추천|how|why|please",
+    re.IGNORECASE,
+)
+
+MEME_MAX_CHARS = 20
+THUMBNAIL_META_MAX_CHARS = 20
+PRAISE_MAX_CHARS = 30
+RESIDUAL_MAX_CHARS = 2  # A trailing particle or ending such as "요" or "다".
+
+SHINGLE_SIZE = 3
+MINHASH_BANDS = 4
+MINHASH_ROWS = 4  # 4 bands x 4 rows puts the LSH threshold near Jaccard 0.7.
+DUPLICATE_JACCARD = 0.7
+_MINHASH_MASKS = tuple(
+    random.Random(20240901).getrandbits(32) for _ in range(MINHASH_BANDS * MINHASH_ROWS)
+)
+
+
+def _core_text(text: str) -> str:
+    return NOISE_PATTERN.sub("", text.lower())
+
+
+def _residual(core: str, *patterns: re.Pattern[str]) -> str:
+    for pattern in patterns:
+        core = pattern.sub("", core)
+    return core
+
+
+def classify_comment(text: str, filters: SignalFilters) -> str | None:
+    """Return the exclusion category for a low-information comment, or None to keep it."""
+    core = _core_text(text)
+    is_request = bool(REQUEST_PATTERN.search(text))
+    if filters.exclude_meme and not is_request:
+        # Laughter, bare jamo and emoji-only comments; short real words like "2편" stay.
+        if not LAUGHTER_PATTERN.sub("", core):
+            return "meme"
+        if (
+            len(core) <= MEME_MAX_CHARS
+            and MEME_PATTERN.search(core)
+            and len(_residual(core, MEME_PATTERN, LAUGHTER_PATTERN)) <= RESIDUAL_MAX_CHARS
+        ):
+            return "meme"
+    if (
+        filters.exclude_thumbnail_meta
+        and not is_request
+        and len(core) <= THUMBNAIL_META_MAX_CHARS
+        and THUMBNAIL_META_PATTERN.search(text)
+    ):
+        return "thumbnail_meta"
+    if (
+        filters.exclude_pure_praise
+        and not is_request
+        and len(core) <= PRAISE_MAX_CHARS
+        and PRAISE_PATTERN.search(core)
+        and not NEGATION_PATTERN.search(text)
+        and len(_residual(core, PRAISE_PATTERN, PRAISE_FILLER_PATTERN, LAUGHTER_PATTERN))
+        <= RESIDUAL_MAX_CHARS
+    ):
+        return "pure_praise"
+    return None
+
+
+def _shingles(text: str) -> set[str]:
+    core = LAUGHTER_PATTERN.sub("", _core_text(text)) or _core_text(text)
+    if len(core) <= SHINGLE_SIZE:
+        return {core}
+    return {core[i : i + SHINGLE_SIZE] for i in range(len(core) - SHINGLE_SIZE + 1)}
+
+
+def _minhash(shingles: set[str]) -> tuple[int, ...]:
+    hashes = [zlib.crc32(shingle.encode("utf-8")) for shingle in shingles]
+    return tuple(min(value ^ mask for value in hashes) for mask in _MINHASH_MASKS)
+
+
+def _jaccard(left: set[str], right: set[str]) -> float:
+    if not left or not right:
+        return 0.0
+    return len(left & right) / len(left | right)
+
+
+def collapse_near_duplicates(comments: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Collapse near-duplicate comments across all videos into their most-liked representative.
+
+    Candidates come from MinHash LSH buckets and are confirmed with exact shingle Jaccard,
+    so the cost stays close to linear in the number of comments. Representatives carry a
+    ``similar_count`` so recurrence is still visible to the model.
+    """
+    ranked = sorted(comments, key=lambda c: int(c.get("like_count") or 0), reverse=True)
+    buckets: dict[tuple[int, tuple[int, ...]], list[int]] = {}
+    representatives: list[tuple[dict[str, Any], set[str]]] = []
+    for comment in ranked:
+        shingles = _shingles(comment.get("text", ""))
+        signature = _minhash(shingles)
+        bands = [
+            (band, signature[band * MINHASH_ROWS : (band + 1) * MINHASH_ROWS])
+            for band in range(MINHASH_BANDS)
+        ]
+        candidates = {index for key in bands for index in buckets.get(key, [])}
+        match = next(
+            (
+                index
+                for index in sorted(candidates)
+                if _jaccard(shingles, representatives[index][1]) >= DUPLICATE_JACCARD
+            ),
+            None,
+        )
+        if match is not None:
+            representative = representatives[match][0]
+            representative["similar_count"] = representative.get("similar_count", 0) + 1
+            continue
+        for key in bands:
+            buckets.setdefault(key, []).append(len(representatives))
+        representatives.append((comment, shingles))
+    kept_ids = {id(comment) for comment, _ in representatives}
+    return [comment for comment in comments if id(comment) in kept_ids]
+
+
+def prefilter_signal_request(request: SignalOutputRequest) -> tuple[dict[str, Any], dict[str, Any]]:
+    """Apply SignalFilters locally and return (prompt payload, removal stats)."""
+    started_at = time.perf_counter()
+    filters = request.filters
+    payload = request.model_dump(mode="json")
+    removed: Counter[str] = Counter()
+    input_count = 0
+    for video in payload.get("videos", []):
+        kept: list[dict[str, Any]] = []
+        for comment in video.get("comments", []):
+            input_count += 1
+            if int(comment.get("like_count") or 0) < filters.min_like:
+                removed["below_min_like"] += 1
+                continue
+            category = classify_comment(comment.get("text", ""), filters)
+            if category:
+                removed[category] += 1
+                continue
+            kept.append(comment)
+        # Stable sort keeps the collector's order among equally liked comments.
+        kept.sort(key=lambda c: int(c.get("like_count") or 0), reverse=True)
+        if filters.topk_per_video > 0 and len(kept) > filters.topk_per_video:
+            removed["over_topk"] += len(kept) - filters.topk_per_video
+            kept = kept[: filters.topk_per_video]
+        video["comments"] = kept
+
+    if filters.dedupe.lower() not in ("", "none", "off", "false"):
+        all_comments = [comment for video in payload["videos"] for comment in video["comments"]]
+        unique = collapse_near_duplicates(all_comments)
+        if len(unique) < len(all_comments):
+            removed["near_duplicate"] = len(all_comments) - len(unique)
+            unique_ids = {id(comment) for comment in unique}
+            for video in payload["videos"]:
+                video["comments"] = [c for c in video["comments"] if id(c) in unique_ids]
+
+    kept_count = sum(len(video["comments"]) for video in payload["videos"])
+    stats: dict[str, Any] = {
+        "input_comments": input_count,
+        "kept_comments": kept_count,
+        "removed": dict(removed),
+        "filter_ms": int((time.perf_counter() - started_at) * 1000),
+    }
+    if input_count and not kept_count:
+        # Nothing survived; let the model see the raw comments rather than an empty prompt.
+        stats["fallback_unfiltered"] = True
+        payload = request.model_dump(mode="json")
+    return payload, stats
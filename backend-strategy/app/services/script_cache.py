@@ -0,0 +1,119 @@
+"""In-process cache of generated scripts, including ones still being generated."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from functools import lru_cache
+from typing import Any
+
+from app.config import get_settings
+from app.schemas import ScriptOutputRequest
+
+
+def script_cache_key(request: ScriptOutputRequest) -> str:
+    """Key by signal content rather than signal_id; ids like "S1" repeat across runs."""
+    material = {
+        "signal": request.signal,
+        "style": request.style,
+        "target_length_sec": request.target_length_sec,
+        "language": request.language,
+    }
+    encoded = json.dumps(material, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class ScriptCache:
+    """TTL + LRU map of script tasks plus a run_id -> {signal_id: key} index.
+
+    Storing tasks means a lookup for a script that is still being speculatively
+    generated waits for that call instead of starting a second one. Tasks run on the
+    app event loop, so speculative generation keeps going after the response is sent.
+    """
+
+    def __init__(self, *, ttl_sec: float, max_entries: int, max_pending: int) -> None:
+        self.ttl_sec = ttl_sec
+        self.max_entries = max(1, max_entries)
+        # 0 disables speculative generation; see get_script_cache.
+        self.max_pending = max(0, max_pending)
+        self._pending_limit = asyncio.Semaphore(max(1, self.max_pending))
+        self._entries: OrderedDict[str, tuple[float, asyncio.Future[dict[str, Any]]]] = OrderedDict()
+        self._runs: OrderedDict[str, dict[str, str]] = OrderedDict()
+
+    def get_or_submit(
+        self,
+        key: str,
+        generate: Callable[[], Awaitable[dict[str, Any]]],
+        *,
+        speculative: bool = False,
+    ) -> asyncio.Future[dict[str, Any]]:
+        """Return the cached task for key or start one; await it through asyncio.shield."""
+        existing = self.get(key)
+        if existing is not None:
+            return existing
+
+        async def run() -> dict[str, Any]:
+            if not speculative:
+                return await generate()
+            # Speculative work is capped so it cannot crowd out scripts a user is waiting on.
+            async with self._pending_limit:
+                return await generate()
+
+        task = asyncio.ensure_future(run())
+        self._store(key, task)
+        task.add_done_callback(lambda done: self._drop_failed(key, done))
+        return task
+
+    def put(self, key: str, result: dict[str, Any]) -> None:
+        future: asyncio.Future[dict[str, Any]] = asyncio.get_running_loop().create_future()
+        future.set_result(result)
+        self._store(key, future)
+
+    def get(self, key: str) -> asyncio.Future[dict[str, Any]] | None:
+        entry = self._entries.get(key)
+        if not entry or time.monotonic() - entry[0] >= self.ttl_sec:
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def register_run(self, run_id: str, keys_by_signal: dict[str, str]) -> None:
+        self._runs[run_id] = dict(keys_by_signal)
+        while len(self._runs) > self.max_entries:
+            self._runs.popitem(last=False)
+
+    def lookup(self, run_id: str, signal_id: str) -> asyncio.Future[dict[str, Any]] | None:
+        key = self._runs.get(run_id, {}).get(signal_id)
+        return self.get(key) if key else None
+
+    def shutdown(self) -> None:
+        for _, future in self._entries.values():
+            future.cancel()
+        self._entries.clear()
+
+    def _store(self, key: str, future: asyncio.Future[dict[str, Any]]) -> None:
+        self._entries[key] = (time.monotonic(), future)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _drop_failed(self, key: str, future: asyncio.Future[dict[str, Any]]) -> None:
+        if future.cancelled() or future.exception() is not None:
+            entry = self._entries.get(key)
+            if entry and entry[1] is future:
+                del self._entries[key]
+
+
+@lru_cache
+def get_script_cache() -> ScriptCache:
+    settings = get_settings()
+    return ScriptCache(
+        ttl_sec=settings.script_cache_ttl_sec,
+        max_entries=settings.script_cache_max_entries,
+        # Speculative scripts share the LLM semaphore with interactive calls, so they are
+        # capped below it and can never hold every slot a user-facing call would wait on.
+        max_pending=min(settings.script_prefetch_workers, settings.llm_max_concurrency - 1),
+    )
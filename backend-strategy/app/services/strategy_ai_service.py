@@ -1,5 +1,9 @@
+import asyncio
 import json
 import logging
+import time
+from collections.abc import AsyncIterator
+from contextlib import aclosing
 from typing import Any
 
 from google import genai
@@ -11,6 +15,7 @@ from app.schemas import (
     ScriptOutputRequest,
     SignalOutputRequest,
 )
+from app.services.comment_filter import prefilter_signal_request
 
 SIGNAL_OUTPUT_PROMPT = """You are an analyst who extracts practical audience demand signals from YouTube comments.
 
@@ -47,6 +52,7 @@ Hard constraints:
 Scoring guidance (internal):
 - evidence_strength: 0~1 (like_count strength + clarity + representativeness)
 - recurrence_score: 0~1 (theme repetition across comments/videos)
+  - Input comments are pre-filtered; similar_count = near-identical comments merged into that comment.
 - confidence.score: 0~1 based on evidence quality + recurrence + counterpoint handling
 
 Filtering policy:
@@ -70,6 +76,30 @@ Validation rules (must pass before final output):
 - If any rule fails, regenerate once internally and output corrected JSON only.
 """
 
+SIGNAL_MAP_PROMPT = """You are an analyst reading ONE chunk of a larger YouTube comment corpus.
+Other chunks are analysed separately and merged later, so only extract candidates; do not rank globally.
+
+Task:
+Given a JSON input of videos and comments, return exactly one JSON object:
+{"candidates": [{"theme": str, "category": str, "demand": str, "recurrence": int,
+  "supporting_comments": [{"video_id": str, "text": str, "like_count": int}],
+  "counterpoints": [{"video_id": str, "text": str, "like_count": int}]}]}
+
+Rules:
+1) Return ONLY valid JSON. No markdown, no explanation.
+2) Group comments of this chunk by semantic theme; one candidate per theme.
+3) Copy supporting/counterpoint comment text and like_count verbatim from the input (max 4 each).
+4) recurrence = number of comments in this chunk that express the theme (include similar_count).
+5) Exclude meme / thumbnail_meta / pure_praise / low_info comments from supporting_comments.
+6) Write theme/demand in Korean (ko), from the channel owner's perspective.
+"""
+
+SIGNAL_REDUCE_PREFIX = """The input below is NOT raw comments. It holds candidate signals that were extracted
+from separate comment chunks of the same channel ("candidates"), plus the video list.
+Merge candidates that describe the same theme (sum their recurrence, keep the strongest
+supporting comments), then produce the final output under the rules that follow.
+"""
+
 SCRIPT_OUTPUT_PROMPT = """You are a scriptwriter who turns one audience-demand signal into a 3-minute YouTube script.
 
 Input:
@@ -132,19 +162,25 @@ logger = logging.getLogger("uvicorn.error")
 
 
 class StrategyAIService:
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        client: genai.Client | None = None,
+        upstream_limit: asyncio.Semaphore | None = None,
+    ) -> None:
         settings = get_settings()
         if not settings.gcp_project_id:
             raise ValueError("GCP_PROJECT_ID is required for strategy backend.")
 
         self.settings = settings
-        self.client = genai.Client(
+        self.client = client or genai.Client(
             vertexai=True,
             project=settings.gcp_project_id,
             location=settings.gcp_location,
         )
+        # App-wide cap on in-flight Gemini calls, shared across concurrent requests.
+        self.upstream_limit = upstream_limit or asyncio.Semaphore(settings.llm_max_concurrency)
 
-    def generate_next_video_script(self, request: CommentBasedStrategyRequest) -> dict[str, Any]:
+    async def generate_next_video_script(self, request: CommentBasedStrategyRequest) -> dict[str, Any]:
         model = self.settings.strategy_vertex_text_model
         comments_block = "\n".join(f"- {c}" for c in request.comments)
         prompt = (
@@ -161,26 +197,50 @@ class StrategyAIService:
             f"{comments_block}\n"
         )
 
-        response = self.client.models.generate_content(
-            model=model,
-            contents=prompt,
-            config=types.GenerateContentConfig(
-                response_mime_type="application/json",
-                temperature=0.7,
-            ),
-        )
+        async with self.upstream_limit:
+            response = await self.client.aio.models.generate_content(
+                model=model,
+                contents=prompt,
+                config=types.GenerateContentConfig(
+                    response_mime_type="application/json",
+                    temperature=0.7,
+                ),
+            )
         text = response.text or ""
         data = json.loads(text)
         data["model"] = model
         return data
 
-    def generate_signal_output_v2(self, request: SignalOutputRequest) -> dict[str, Any]:
+    async def generate_signal_output_v2(self, request: SignalOutputRequest) -> dict[str, Any]:
         model = self.settings.strategy_vertex_text_model
-        payload = request.model_dump(mode="json")
+        # CPU-bound (regex + MinHash over every comment); keep it off the event loop.
+        payload, prefilter_stats = await asyncio.to_thread(prefilter_signal_request, request)
+        logger.info("llm:signals prefilter=%s", prefilter_stats)
+        input_json = json.dumps(payload, ensure_ascii=False)
+        if len(input_json) <= self.settings.signal_prompt_char_budget:
+            started_at = time.perf_counter()
+            data = await self._generate_signals_single_shot(model, payload, input_json)
+            extraction = {
+                "mode": "single_shot",
+                "input_chars": len(input_json),
+                "total_ms": int((time.perf_counter() - started_at) * 1000),
+            }
+        else:
+            data, extraction = await self._generate_signals_map_reduce(model, payload)
+            extraction["input_chars"] = len(input_json)
+        logger.info("llm:signals extraction=%s", extraction)
+        data["model"] = model
+        data["prefilter"] = prefilter_stats
+        data["extraction"] = extraction
+        return data
+
+    async def _generate_signals_single_shot(
+        self, model: str, payload: dict[str, Any], input_json: str
+    ) -> dict[str, Any]:
         prompt = (
             f"{SIGNAL_OUTPUT_PROMPT}\n\n"
             "Input JSON:\n"
-            f"{json.dumps(payload, ensure_ascii=False)}"
+            f"{input_json}"
         )
         logger.info(
             "llm:signals request model=%s videos=%s prompt_chars=%s",
@@ -189,25 +249,119 @@ class StrategyAIService:
             len(prompt),
         )
         logger.info("llm:signals prompt_preview=%s", prompt[:1800])
+        data = await self._generate_json(model, prompt, temperature=0.4, label="signals")
+        logger.info("llm:signals response_keys=%s", list(data.keys()))
+        return data
+
+    async def _generate_signals_map_reduce(
+        self, model: str, payload: dict[str, Any]
+    ) -> tuple[dict[str, Any], dict[str, Any]]:
+        chunks = chunk_signal_payload(payload, self.settings.signal_map_chunk_chars)
+        logger.info("llm:signals map_reduce model=%s chunks=%s", model, len(chunks))
 
-        response = self.client.models.generate_content(
-            model=model,
-            contents=prompt,
-            config=types.GenerateContentConfig(
-                response_mime_type="application/json",
-                temperature=0.4,
-            ),
+        map_limit = asyncio.Semaphore(max(1, self.settings.signal_map_max_workers))
+
+        async def run_map(chunk: dict[str, Any]) -> list[dict[str, Any]]:
+            prompt = (
+                f"{SIGNAL_MAP_PROMPT}\n\n"
+                "Input JSON:\n"
+                f"{json.dumps(chunk, ensure_ascii=False)}"
+            )
+            try:
+                async with map_limit:
+                    data = await self._generate_json(
+                        model, prompt, temperature=0.3, label="signals:map"
+                    )
+            except Exception:
+                # One bad chunk should not sink the whole run; the reduce step works with the rest.
+                logger.exception("llm:signals:map chunk_failed videos=%s", len(chunk["videos"]))
+                return []
+            return [c for c in data.get("candidates", []) if isinstance(c, dict)]
+
+        map_started_at = time.perf_counter()
+        chunk_candidates = list(await asyncio.gather(*(run_map(chunk) for chunk in chunks)))
+        map_ms = int((time.perf_counter() - map_started_at) * 1000)
+        candidates = [candidate for batch in chunk_candidates for candidate in batch]
+        if not candidates:
+            raise RuntimeError("Signal map step returned no candidates for any chunk.")
+
+        reduce_payload = {
+            "language": payload.get("language"),
+            "videos": [
+                {key: value for key, value in video.items() if key != "comments"}
+                for video in payload.get("videos", [])
+            ],
+            "candidates": candidates,
+        }
+        prompt = (
+            f"{SIGNAL_REDUCE_PREFIX}\n{SIGNAL_OUTPUT_PROMPT}\n\n"
+            "Input JSON:\n"
+            f"{json.dumps(reduce_payload, ensure_ascii=False)}"
         )
+        logger.info("llm:signals:reduce candidates=%s prompt_chars=%s", len(candidates), len(prompt))
+        reduce_started_at = time.perf_counter()
+        data = await self._generate_json(model, prompt, temperature=0.4, label="signals:reduce")
+        extraction = {
+            "mode": "map_reduce",
+            "chunks": len(chunks),
+            "failed_chunks": sum(1 for batch in chunk_candidates if not batch),
+            "candidates": len(candidates),
+            "map_ms": map_ms,
+            "reduce_ms": int((time.perf_counter() - reduce_started_at) * 1000),
+        }
+        extraction["total_ms"] = extraction["map_ms"] + extraction["reduce_ms"]
+        return data, extraction
+
+    async def _generate_json(
+        self, model: str, prompt: str, *, temperature: float, label: str
+    ) -> dict[str, Any]:
+        async with self.upstream_limit:
+            response = await self.client.aio.models.generate_content(
+                model=model,
+                contents=prompt,
+                config=types.GenerateContentConfig(
+                    response_mime_type="application/json",
+                    temperature=temperature,
+                ),
+            )
         text = response.text or ""
-        logger.info("llm:signals response_chars=%s", len(text))
-        logger.info("llm:signals response_preview=%s", text[:3000])
-        data = json.loads(text)
-        logger.info("llm:signals response_keys=%s", list(data.keys()))
+        logger.info("llm:%s response_chars=%s", label, len(text))
+        logger.info("llm:%s response_preview=%s", label, text[:3000])
+        return json.loads(text)
+
+    async def generate_script_output_v2(self, request: ScriptOutputRequest) -> dict[str, Any]:
+        model = self.settings.strategy_vertex_text_model
+        prompt = self._script_prompt(model, request)
+        data = await self._generate_json(model, prompt, temperature=0.5, label="script")
+        logger.info("llm:script response_keys=%s", list(data.keys()))
         data["model"] = model
         return data
 
-    def generate_script_output_v2(self, request: ScriptOutputRequest) -> dict[str, Any]:
+    async def stream_script_output_v2(self, request: ScriptOutputRequest) -> AsyncIterator[str]:
+        """Yield raw JSON text chunks as the model produces them; see parse_script_output."""
         model = self.settings.strategy_vertex_text_model
+        prompt = self._script_prompt(model, request)
+        async with self.upstream_limit:
+            stream = await self.client.aio.models.generate_content_stream(
+                model=model,
+                contents=prompt,
+                config=types.GenerateContentConfig(
+                    response_mime_type="application/json",
+                    temperature=0.5,
+                ),
+            )
+            async with aclosing(stream):
+                async for chunk in stream:
+                    if chunk.text:
+                        yield chunk.text
+
+    def parse_script_output(self, text: str) -> dict[str, Any]:
+        logger.info("llm:script:stream response_chars=%s", len(text))
+        data = json.loads(text)
+        data["model"] = self.settings.strategy_vertex_text_model
+        return data
+
+    def _script_prompt(self, model: str, request: ScriptOutputRequest) -> str:
         payload = request.model_dump(mode="json")
         prompt = (
             f"{SCRIPT_OUTPUT_PROMPT}\n\n"
@@ -221,19 +375,51 @@ class StrategyAIService:
             len(prompt),
         )
         logger.info("llm:script prompt_preview=%s", prompt[:1800])
+        return prompt
 
-        response = self.client.models.generate_content(
-            model=model,
-            contents=prompt,
-            config=types.GenerateContentConfig(
-                response_mime_type="application/json",
-                temperature=0.5,
-            ),
-        )
-        text = response.text or ""
-        logger.info("llm:script response_chars=%s", len(text))
-        logger.info("llm:script response_preview=%s", text[:3000])
-        data = json.loads(text)
-        logger.info("llm:script response_keys=%s", list(data.keys()))
-        data["model"] = model
-        return data
+
+def chunk_signal_payload(payload: dict[str, Any], max_chars: int) -> list[dict[str, Any]]:
+    """Split a signal payload into chunks of whole videos (or comment batches) under max_chars.
+
+    Videos are packed greedily in order; a single video larger than the budget is split into
+    comment batches that each repeat the video metadata.
+    """
+    base = {key: value for key, value in payload.items() if key != "videos"}
+    base_chars = len(json.dumps(base, ensure_ascii=False))
+    budget = max(1, max_chars - base_chars)
+
+    def size(value: Any) -> int:
+        return len(json.dumps(value, ensure_ascii=False)) + 2
+
+    pieces: list[dict[str, Any]] = []
+    for video in payload.get("videos", []):
+        if size(video) <= budget:
+            pieces.append(video)
+            continue
+        meta = {key: value for key, value in video.items() if key != "comments"}
+        batch: list[dict[str, Any]] = []
+        batch_chars = size({**meta, "comments": []})
+        for comment in video.get("comments", []):
+            comment_chars = size(comment)
+            if batch and batch_chars + comment_chars > budget:
+                pieces.append({**meta, "comments": batch})
+                batch = []
+                batch_chars = size({**meta, "comments": []})
+            batch.append(comment)
+            batch_chars += comment_chars
+        if batch:
+            pieces.append({**meta, "comments": batch})
+
+    chunks: list[dict[str, Any]] = []
+    current: list[dict[str, Any]] = []
+    current_chars = 0
+    for piece in pieces:
+        piece_chars = size(piece)
+        if current and current_chars + piece_chars > budget:
+            chunks.append({**base, "videos": current})
+            current, current_chars = [], 0
+        current.append(piece)
+        current_chars += piece_chars
+    if current:
+        chunks.append({**base, "videos": current})
+    return chunks
@@ -0,0 +1,140 @@
+"""Persistent response cache for YouTube Data API calls."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from threading import Lock, local
+from typing import Any
+
+from app.config import get_settings
+
+# Pruning runs at startup and then once per this many writes.
+PRUNE_EVERY_PUTS = 200
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    etag: str | None
+    body: dict[str, Any]
+    fetched_at: float
+
+
+class YouTubeResponseCache:
+    """SQLite-backed store of API responses plus a never-expiring handle -> channel id table.
+
+    Freshness is decided by the caller (per-endpoint TTL); stale entries keep their
+    ETag so they can be revalidated with If-None-Match instead of refetched. Keys include
+    page tokens, so rows not refreshed within retention_sec are deleted and the table is
+    capped at max_rows, oldest first.
+    """
+
+    def __init__(self, db_path: Path, retention_sec: float = 86400.0, max_rows: int = 20_000) -> None:
+        self.db_path = db_path
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.retention_sec = retention_sec
+        self.max_rows = max(1, max_rows)
+        self._write_lock = Lock()
+        self._puts = 0
+        self._local = local()
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                cache_key TEXT PRIMARY KEY,
+                endpoint TEXT NOT NULL,
+                etag TEXT,
+                body TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS responses_fetched_at ON responses (fetched_at);
+            CREATE TABLE IF NOT EXISTS channel_handles (
+                handle TEXT PRIMARY KEY,
+                channel_id TEXT NOT NULL,
+                resolved_at REAL NOT NULL
+            );
+            """
+        )
+        self.prune()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30.0, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def make_key(endpoint: str, params: dict[str, Any]) -> str:
+        return f"{endpoint}?{json.dumps(params, sort_keys=True, ensure_ascii=False, default=str)}"
+
+    def get(self, cache_key: str) -> CachedResponse | None:
+        row = self._conn().execute(
+            "SELECT etag, body, fetched_at FROM responses WHERE cache_key = ?", (cache_key,)
+        ).fetchone()
+        if not row:
+            return None
+        return CachedResponse(etag=row[0], body=json.loads(row[1]), fetched_at=float(row[2]))
+
+    def put(self, cache_key: str, endpoint: str, etag: str | None, body: dict[str, Any]) -> None:
+        with self._write_lock:
+            self._conn().execute(
+                "INSERT OR REPLACE INTO responses (cache_key, endpoint, etag, body, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (cache_key, endpoint, etag, json.dumps(body, ensure_ascii=False), time.time()),
+            )
+            self._puts += 1
+            due = self._puts % PRUNE_EVERY_PUTS == 0
+        if due:
+            self.prune()
+
+    def prune(self) -> int:
+        """Delete rows past retention, then the oldest rows over max_rows; return the count."""
+        with self._write_lock:
+            conn = self._conn()
+            deleted = conn.execute(
+                "DELETE FROM responses WHERE fetched_at < ?", (time.time() - self.retention_sec,)
+            ).rowcount
+            deleted += conn.execute(
+                "DELETE FROM responses WHERE cache_key IN ("
+                "SELECT cache_key FROM responses ORDER BY fetched_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_rows,),
+            ).rowcount
+        return deleted
+
+    def touch(self, cache_key: str) -> None:
+        with self._write_lock:
+            self._conn().execute(
+                "UPDATE responses SET fetched_at = ? WHERE cache_key = ?", (time.time(), cache_key)
+            )
+
+    def get_channel_id(self, handle: str) -> str | None:
+        row = self._conn().execute(
+            "SELECT channel_id FROM channel_handles WHERE handle = ?", (handle.lower(),)
+        ).fetchone()
+        return row[0] if row else None
+
+    def put_channel_id(self, handle: str, channel_id: str) -> None:
+        with self._write_lock:
+            self._conn().execute(
+                "INSERT OR REPLACE INTO channel_handles (handle, channel_id, resolved_at) VALUES (?, ?, ?)",
+                (handle.lower(), channel_id, time.time()),
+            )
+
+
+@lru_cache
+def get_youtube_cache() -> YouTubeResponseCache | None:
+    settings = get_settings()
+    if not settings.youtube_cache_enabled:
+        return None
+    return YouTubeResponseCache(
+        Path(settings.youtube_cache_path),
+        retention_sec=settings.youtube_cache_retention_sec,
+        max_rows=settings.youtube_cache_max_rows,
+    )
@@ -2,20 +2,37 @@
 
 from __future__ import annotations
 
+import asyncio
+import heapq
+import time
+from collections.abc import AsyncIterator
+from contextlib import aclosing
 from typing import Literal
 from typing import Any
 
 import httpx
 
 from app.config import get_settings
+from app.services.youtube_cache import YouTubeResponseCache, get_youtube_cache
 
 
 class YouTubeDataAPIError(RuntimeError):
     """Raised when YouTube Data API returns an error response."""
 
 
+async def _no_replies() -> list[dict[str, Any]]:
+    return []
+
+
 class YouTubeCommentService:
-    def __init__(self, *, timeout: float = 15.0) -> None:
+    def __init__(
+        self,
+        *,
+        timeout: float = 15.0,
+        http_client: httpx.AsyncClient | None = None,
+        cache: YouTubeResponseCache | None = None,
+        upstream_limit: asyncio.Semaphore | None = None,
+    ) -> None:
         settings = get_settings()
         if not settings.youtube_data_api_key:
             raise ValueError("YOUTUBE_DATA_API_KEY is required to call YouTube Data API.")
@@ -23,13 +40,49 @@ class YouTubeCommentService:
         self.api_key = settings.youtube_data_api_key
         self.base_url = settings.youtube_api_base_url.rstrip("/")
         self.timeout = timeout
+        self.max_concurrency = max(1, settings.youtube_max_concurrency)
+        self.video_source = settings.youtube_video_source
+        self.comment_scan_budget = max(1, settings.youtube_comment_scan_budget)
+        self.max_replies_per_thread = max(1, settings.youtube_max_replies_per_thread)
+        self.cache = cache if cache is not None else get_youtube_cache()
+        # Negative TTL disables caching for the endpoint; 0 always revalidates via ETag.
+        self.cache_ttls: dict[str, float] = {
+            "channels": settings.youtube_cache_ttl_channels_sec,
+            "search": settings.youtube_cache_ttl_search_sec,
+            "playlistItems": settings.youtube_cache_ttl_playlist_items_sec,
+            "commentThreads": settings.youtube_cache_ttl_comment_threads_sec,
+            "comments": settings.youtube_cache_ttl_comments_sec,
+        }
+        self.cache_stats = {"hits": 0, "misses": 0, "revalidated": 0}
+        # App-wide cap on in-flight YouTube requests, shared across concurrent pipeline requests.
+        self.upstream_limit = upstream_limit or asyncio.Semaphore(self.max_concurrency)
+        # The app injects its pooled client; a standalone service owns and closes its own.
+        self._owns_client = http_client is None
+        self.client = http_client or httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=self.max_concurrency,
+                max_keepalive_connections=self.max_concurrency,
+            ),
+        )
+
+    async def aclose(self) -> None:
+        if self._owns_client:
+            await self.client.aclose()
 
-    def fetch_channel_comments(
+    async def __aenter__(self) -> "YouTubeCommentService":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
+    async def fetch_channel_comments(
         self,
         channel_handle: str,
         max_videos: int = 10,
         max_comments_per_video: int = 10,
         comment_order: Literal["top", "latest"] = "top",
+        include_replies: bool = False,
     ) -> dict[str, Any]:
         handle = channel_handle.strip()
         if not handle:
@@ -37,27 +90,37 @@ class YouTubeCommentService:
         if not handle.startswith("@"):
             handle = f"@{handle}"
 
-        channel_info = self._resolve_channel_info(handle)
+        channel_info = await self._resolve_channel_info(handle)
         channel_id = channel_info["channel_id"]
-        videos = self._fetch_latest_videos(channel_id, max_videos)
-
-        video_payloads: list[dict[str, Any]] = []
-        for video in videos:
-            comments = self._fetch_comments_for_video(
-                video["id"],
-                max_comments_per_video=max_comments_per_video,
-                comment_order=comment_order,
-            )
-            video_payloads.append(
-                {
-                    "video_id": video["id"],
-                    "video_title": video["title"],
-                    "thumbnail_url": video["thumbnail_url"],
-                    "published_at": video["published_at"],
-                    "comment_count": len(comments),
-                    "comments": comments,
-                }
-            )
+        videos = await self._fetch_latest_videos(channel_info, max_videos)
+        request_limit = asyncio.Semaphore(self.max_concurrency)
+
+        async def collect(video: dict[str, Any]) -> dict[str, Any]:
+            comments: list[dict[str, Any]] = []
+            comment_error: str | None = None
+            try:
+                async with request_limit:
+                    comments = await self._fetch_comments_for_video(
+                        video["id"],
+                        max_comments_per_video=max_comments_per_video,
+                        comment_order=comment_order,
+                        include_replies=include_replies,
+                    )
+            except (YouTubeDataAPIError, httpx.HTTPError) as exc:
+                # e.g. comments disabled on one video; keep the rest of the channel.
+                comment_error = str(exc)
+            return {
+                "video_id": video["id"],
+                "video_title": video["title"],
+                "thumbnail_url": video["thumbnail_url"],
+                "published_at": video["published_at"],
+                "comment_count": len(comments),
+                "comments": comments,
+                "comment_error": comment_error,
+            }
+
+        # gather() returns results in argument order, so the latest-first video order is kept.
+        video_payloads = list(await asyncio.gather(*(collect(video) for video in videos)))
 
         return {
             "channel_handle": handle,
@@ -67,37 +130,82 @@ class YouTubeCommentService:
             "subscriber_count": channel_info.get("subscriber_count"),
             "video_count": len(video_payloads),
             "videos": video_payloads,
+            "cache_stats": dict(self.cache_stats),
         }
 
-    def _resolve_channel_info(self, handle: str) -> dict[str, Any]:
-        data = self._get(
-            "channels",
-            {
-                "part": "id,snippet,statistics",
-                "forHandle": handle,
-            },
-        )
+    async def _resolve_channel_info(self, handle: str) -> dict[str, Any]:
+        # Handles map to a fixed channel id, so once resolved the lookup is by id and
+        # every spelling of the handle shares the same cached channels response.
+        known_channel_id = await asyncio.to_thread(self.cache.get_channel_id, handle) if self.cache else None
+        lookup = {"id": known_channel_id} if known_channel_id else {"forHandle": handle}
+        data = await self._get("channels", {"part": "id,snippet,statistics,contentDetails", **lookup})
         items = data.get("items", [])
         if not items:
             raise YouTubeDataAPIError(f"Could not resolve channel id for handle '{handle}'.")
         channel = items[0]
+        if self.cache and not known_channel_id and channel.get("id"):
+            await asyncio.to_thread(self.cache.put_channel_id, handle, channel["id"])
         snippet = channel.get("snippet", {})
         statistics = channel.get("statistics", {})
-        thumbnails = snippet.get("thumbnails", {})
-        thumb = (
-            thumbnails.get("high", {}).get("url")
-            or thumbnails.get("medium", {}).get("url")
-            or thumbnails.get("default", {}).get("url")
-        )
         subscriber_count = statistics.get("subscriberCount")
+        uploads_playlist_id = (
+            channel.get("contentDetails", {}).get("relatedPlaylists", {}).get("uploads")
+        )
         return {
             "channel_id": channel.get("id", ""),
+            "uploads_playlist_id": uploads_playlist_id,
             "channel_name": snippet.get("title"),
-            "channel_thumbnail_url": thumb,
+            "channel_thumbnail_url": self._pick_thumbnail(snippet),
             "subscriber_count": int(subscriber_count) if str(subscriber_count).isdigit() else None,
         }
 
-    def _fetch_latest_videos(self, channel_id: str, max_videos: int) -> list[dict[str, Any]]:
+    async def _fetch_latest_videos(self, channel_info: dict[str, Any], max_videos: int) -> list[dict[str, Any]]:
+        uploads_playlist_id = channel_info.get("uploads_playlist_id")
+        if self.video_source == "uploads" and uploads_playlist_id:
+            return await self._fetch_uploads_videos(uploads_playlist_id, max_videos)
+        return await self._search_latest_videos(channel_info["channel_id"], max_videos)
+
+    async def _fetch_uploads_videos(self, playlist_id: str, max_videos: int) -> list[dict[str, Any]]:
+        # playlistItems costs 1 quota unit per page (search costs 100) and is not capped at 50.
+        videos: list[dict[str, Any]] = []
+        params = {
+            "part": "snippet,contentDetails",
+            "playlistId": playlist_id,
+            "maxResults": min(max_videos, 50),
+        }
+        async with aclosing(self._iter_pages("playlistItems", params)) as items:
+            async for item in items:
+                details = item.get("contentDetails", {})
+                video_id = details.get("videoId")
+                # Private and deleted uploads stay in the playlist but carry no videoPublishedAt.
+                if not video_id or not details.get("videoPublishedAt"):
+                    continue
+                snippet = item.get("snippet", {})
+                videos.append(
+                    {
+                        "id": video_id,
+                        "title": snippet.get("title", ""),
+                        "thumbnail_url": self._pick_thumbnail(snippet),
+                        "published_at": details.get("videoPublishedAt"),
+                    }
+                )
+                if len(videos) >= max_videos:
+                    break
+        return videos
+
+    async def _iter_pages(self, endpoint: str, params: dict[str, Any]) -> AsyncIterator[dict[str, Any]]:
+        """Yield items across pages, fetching the next page only when the caller asks for it."""
+        page_token: str | None = None
+        while True:
+            page_params = {**params, "pageToken": page_token} if page_token else params
+            data = await self._get(endpoint, page_params)
+            for item in data.get("items", []):
+                yield item
+            page_token = data.get("nextPageToken")
+            if not page_token:
+                return
+
+    async def _search_latest_videos(self, channel_id: str, max_videos: int) -> list[dict[str, Any]]:
         params = {
             "part": "snippet",
             "channelId": channel_id,
@@ -105,7 +213,7 @@ class YouTubeCommentService:
             "type": "video",
             "maxResults": min(max_videos, 50),
         }
-        data = self._get("search", params)
+        data = await self._get("search", params)
         videos: list[dict[str, Any]] = []
         for item in data.get("items", []):
             video_id = item.get("id", {}).get("videoId")
@@ -116,11 +224,7 @@ class YouTubeCommentService:
                 {
                     "id": video_id,
                     "title": snippet.get("title", ""),
-                    "thumbnail_url": (
-                        snippet.get("thumbnails", {}).get("high", {}).get("url")
-                        or snippet.get("thumbnails", {}).get("medium", {}).get("url")
-                        or snippet.get("thumbnails", {}).get("default", {}).get("url")
-                    ),
+                    "thumbnail_url": self._pick_thumbnail(snippet),
                     "published_at": snippet.get("publishedAt"),
                 }
             )
@@ -128,35 +232,98 @@ class YouTubeCommentService:
                 break
         return videos
 
-    def _fetch_comments_for_video(
+    @staticmethod
+    def _pick_thumbnail(snippet: dict[str, Any]) -> str | None:
+        thumbnails = snippet.get("thumbnails", {})
+        return (
+            thumbnails.get("high", {}).get("url")
+            or thumbnails.get("medium", {}).get("url")
+            or thumbnails.get("default", {}).get("url")
+        )
+
+    async def _fetch_comments_for_video(
         self,
         video_id: str,
         *,
         max_comments_per_video: int = 10,
         comment_order: Literal["top", "latest"] = "top",
+        include_replies: bool = False,
     ) -> list[dict[str, Any]]:
         youtube_order = "relevance" if comment_order == "top" else "time"
         params = {
             "part": "snippet",
             "videoId": video_id,
             "textFormat": "plainText",
-            "maxResults": min(max_comments_per_video, 100),
+            "maxResults": 100 if comment_order == "top" else min(max_comments_per_video, 100),
             "order": youtube_order,
         }
+        # latest: the API order is already what we want, so stop after the first K threads.
+        # top: scan up to the budget and keep the K most-liked in a min-heap (O(K) memory).
+        scan_limit = (
+            max(self.comment_scan_budget, max_comments_per_video)
+            if comment_order == "top"
+            else max_comments_per_video
+        )
+        heap: list[tuple[int, int, dict[str, Any], int]] = []
+        scanned = 0
+        async with aclosing(self._iter_pages("commentThreads", params)) as items:
+            async for item in items:
+                scanned += 1
+                thread_snippet = item.get("snippet", {})
+                comment_payload = self._build_comment_payload(
+                    thread_snippet.get("topLevelComment"), parent_id=None
+                )
+                if comment_payload is not None:
+                    # -scanned breaks like ties in favour of the earlier (more relevant / newer) thread.
+                    entry = (
+                        int(comment_payload.get("like_count") or 0) if comment_order == "top" else 0,
+                        -scanned,
+                        comment_payload,
+                        int(thread_snippet.get("totalReplyCount") or 0),
+                    )
+                    if len(heap) < max_comments_per_video:
+                        heapq.heappush(heap, entry)
+                    else:
+                        heapq.heappushpop(heap, entry)
+                # Checked here rather than at the loop head so no extra page is requested.
+                if scanned >= scan_limit:
+                    break
+
+        ranked = sorted(heap, key=lambda entry: (entry[0], entry[1]), reverse=True)
+        reply_lists: list[list[dict[str, Any]]] = [[] for _ in ranked]
+        if include_replies:
+            reply_lists = list(
+                await asyncio.gather(
+                    *(
+                        self._fetch_replies(payload["comment_id"]) if reply_count else _no_replies()
+                        for _, _, payload, reply_count in ranked
+                    )
+                )
+            )
         comments: list[dict[str, Any]] = []
-        data = self._get("commentThreads", params)
-        for item in data.get("items", []):
-            top_level = item.get("snippet", {}).get("topLevelComment", {})
-            comment_payload = self._build_comment_payload(top_level, parent_id=None)
-            if comment_payload:
-                comments.append(comment_payload)
-            if len(comments) >= max_comments_per_video:
-                break
+        for (_, _, comment_payload, _), replies in zip(ranked, reply_lists):
+            comments.append(comment_payload)
+            comments.extend(replies)
+        return comments
 
-        # Keep top mode deterministic by explicitly prioritizing higher like_count.
-        if comment_order == "top":
-            comments.sort(key=lambda c: int(c.get("like_count", 0)), reverse=True)
-        return comments[:max_comments_per_video]
+    async def _fetch_replies(self, parent_id: str) -> list[dict[str, Any]]:
+        params = {
+            "part": "snippet",
+            "parentId": parent_id,
+            "textFormat": "plainText",
+            "maxResults": min(self.max_replies_per_thread, 100),
+        }
+        try:
+            data = await self._get("comments", params)
+        except (YouTubeDataAPIError, httpx.HTTPError):
+            # Replies are supplementary; a failed thread should not drop the video's comments.
+            return []
+        replies: list[dict[str, Any]] = []
+        for item in data.get("items", [])[: self.max_replies_per_thread]:
+            reply_payload = self._build_comment_payload(item, parent_id=parent_id)
+            if reply_payload:
+                replies.append(reply_payload)
+        return replies
 
     def _build_comment_payload(
         self, comment: dict[str, Any] | None, *, parent_id: str | None
@@ -173,10 +340,43 @@ class YouTubeCommentService:
             "published_at": snippet.get("publishedAt"),
         }
 
-    def _get(self, endpoint: str, params: dict[str, Any]) -> dict[str, Any]:
+    def _count(self, stat: str) -> None:
+        self.cache_stats[stat] += 1
+
+    async def _get(self, endpoint: str, params: dict[str, Any]) -> dict[str, Any]:
+        ttl = self.cache_ttls.get(endpoint, -1.0)
+        if self.cache is None or ttl < 0:
+            return self._parse_response(await self._request(endpoint, params))
+
+        cache_key = YouTubeResponseCache.make_key(endpoint, params)
+        # SQLite reads and writes go to a worker thread so disk I/O never stalls the loop.
+        cached = await asyncio.to_thread(self.cache.get, cache_key)
+        if cached and time.time() - cached.fetched_at < ttl:
+            self._count("hits")
+            return cached.body
+
+        headers = {"If-None-Match": cached.etag} if cached and cached.etag else None
+        response = await self._request(endpoint, params, headers=headers)
+        if cached and response.status_code == httpx.codes.NOT_MODIFIED:
+            await asyncio.to_thread(self.cache.touch, cache_key)
+            self._count("revalidated")
+            return cached.body
+        data = self._parse_response(response)
+        etag = response.headers.get("ETag") or data.get("etag")
+        await asyncio.to_thread(self.cache.put, cache_key, endpoint, etag, data)
+        self._count("misses")
+        return data
+
+    async def _request(
+        self, endpoint: str, params: dict[str, Any], headers: dict[str, str] | None = None
+    ) -> httpx.Response:
         url = f"{self.base_url}/{endpoint}"
         query = {**params, "key": self.api_key}
-        response = httpx.get(url, params=query, timeout=self.timeout)
+        async with self.upstream_limit:
+            return await self.client.get(url, params=query, headers=headers)
+
+    @staticmethod
+    def _parse_response(response: httpx.Response) -> dict[str, Any]:
         if response.status_code != httpx.codes.OK:
             try:
                 payload = response.json()
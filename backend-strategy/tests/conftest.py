@@ -0,0 +1,11 @@
+import pytest
+
+from app.config import get_settings
+
+
+@pytest.fixture(autouse=True)
+def settings_env(monkeypatch):
+    monkeypatch.setenv("GCP_PROJECT_ID", "test-project")
+    get_settings.cache_clear()
+    yield
+    get_settings.cache_clear()
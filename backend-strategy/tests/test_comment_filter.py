@@ -0,0 +1,71 @@
+import pytest
+
+from app.schemas import SignalFilters
+from app.services.comment_filter import classify_comment
+
+FILTERS = SignalFilters()
+
+KEPT = [
+    # Complaints: negation or contrast around praise words.
+    "음질이 안 좋아요",
+    "구독 취소합니다",
+    "재밌는데 너무 길어요",
+    "편집 최고인데 소리가 작아요",
+    "좋은 영상이지만 자막이 너무 빨라요",
+    "별로 유익하지 않네요",
+    "예전만큼 재밌지 않아요",
+    # Short requests and questions.
+    "2편",
+    "자막 좀",
+    "왜요?",
+    "How?",
+    "다음 편 언제 나와요",
+    "레전드 2편 언제 나와요?",
+    "출처 알려주세요",
+    # Praise with content the model should see.
+    "잘 봤습니다 다음엔 가격 비교도 해주세요",
+    "감사합니다 덕분에 환불 받았어요",
+    "최고예요 근데 배경음악이 커요",
+    # Longer meta comments are left to the model.
+    "썸네일 보고 들어왔는데 실제로 필요한 정보가 많아서 끝까지 봤습니다 다음 주제도 기대해요",
+]
+
+DROPPED = [
+    ("ㅋㅋㅋㅋㅋ", "meme"),
+    ("ㅎㅎ", "meme"),
+    ("ㅠㅠㅠ", "meme"),
+    ("👍👍", "meme"),
+    ("하하하하", "meme"),
+    ("ㄹㅇ 인정", "meme"),
+    ("레전드ㅋㅋ", "meme"),
+    ("1빠", "meme"),
+    ("첫 댓", "meme"),
+    ("미쳤다 ㅋㅋㅋ", "meme"),
+    ("썸네일 뭐임ㅋㅋ", "thumbnail_meta"),
+    ("제목 어그로 오지네", "thumbnail_meta"),
+    ("잘 봤습니다", "pure_praise"),
+    ("잘 보고 갑니다!", "pure_praise"),
+    ("감사합니다~", "pure_praise"),
+    ("오늘도 유익한 영상 감사합니다", "pure_praise"),
+    ("최고예요 👍", "pure_praise"),
+    ("항상 응원합니다", "pure_praise"),
+    ("구독하고 갑니다", "pure_praise"),
+    ("진짜 재밌어요 ㅎㅎ", "pure_praise"),
+    ("대박", "pure_praise"),
+]
+
+
+@pytest.mark.parametrize("text", KEPT)
+def test_informative_comments_are_kept(text: str) -> None:
+    assert classify_comment(text, FILTERS) is None
+
+
+@pytest.mark.parametrize(("text", "category"), DROPPED)
+def test_low_information_comments_are_dropped(text: str, category: str) -> None:
+    assert classify_comment(text, FILTERS) == category
+
+
+def test_disabled_filters_keep_everything() -> None:
+    filters = SignalFilters(exclude_meme=False, exclude_thumbnail_meta=False, exclude_pure_praise=False)
+    for text, _ in DROPPED:
+        assert classify_comment(text, filters) is None
@@ -0,0 +1,38 @@
+import asyncio
+
+from app.services.script_cache import ScriptCache, get_script_cache
+
+
+def test_prefetch_is_capped_below_llm_concurrency(monkeypatch):
+    monkeypatch.setenv("LLM_MAX_CONCURRENCY", "3")
+    monkeypatch.setenv("SCRIPT_PREFETCH_WORKERS", "4")
+    get_script_cache.cache_clear()
+
+    assert get_script_cache().max_pending == 2
+
+
+def test_single_llm_slot_disables_prefetch(monkeypatch):
+    monkeypatch.setenv("LLM_MAX_CONCURRENCY", "1")
+    get_script_cache.cache_clear()
+
+    assert get_script_cache().max_pending == 0
+
+
+def test_speculative_scripts_run_at_most_max_pending_at_once():
+    async def run() -> int:
+        cache = ScriptCache(ttl_sec=60, max_entries=8, max_pending=2)
+        running = peak = 0
+
+        async def generate() -> dict:
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return {}
+
+        tasks = [cache.get_or_submit(f"key{index}", generate, speculative=True) for index in range(5)]
+        await asyncio.gather(*tasks)
+        return peak
+
+    assert asyncio.run(run()) == 2
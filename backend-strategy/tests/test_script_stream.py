@@ -0,0 +1,112 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+from app.routers.strategy import stream_pipeline_from_handle
+from app.schemas import ChannelPipelineRequest
+from app.services.script_cache import ScriptCache
+from app.services.strategy_ai_service import StrategyAIService
+
+SIGNALS = {"signals": [{"signal_id": "S1", "title": "2편 요청", "evidence": {"supporting_comments": []}}]}
+SCRIPT_PARTS = ['{"meta": {}, ', '"rationale_block": {}, ', '"script": {}, ', '"assets": {}}']
+
+
+class FakeModels:
+    def __init__(self) -> None:
+        self.stream_closed = asyncio.Event()
+
+    async def generate_content(self, **kwargs):
+        return SimpleNamespace(text=json.dumps(SIGNALS))
+
+    async def generate_content_stream(self, **kwargs):
+        async def chunks():
+            try:
+                for part in SCRIPT_PARTS:
+                    yield SimpleNamespace(text=part)
+                    await asyncio.sleep(0)
+            finally:
+                self.stream_closed.set()
+
+        return chunks()
+
+
+class FakeCommentService:
+    async def fetch_channel_comments(self, **kwargs):
+        return {
+            "channel_handle": "@test",
+            "channel_id": "UC1",
+            "video_count": 1,
+            "videos": [
+                {
+                    "video_id": "v1",
+                    "comment_count": 1,
+                    "comments": [{"comment_id": "c1", "text": "2편 언제 나와요?", "like_count": 3}],
+                }
+            ],
+        }
+
+
+def make_service(slots: int) -> tuple[StrategyAIService, FakeModels]:
+    models = FakeModels()
+    client = SimpleNamespace(aio=SimpleNamespace(models=models))
+    return StrategyAIService(client=client, upstream_limit=asyncio.Semaphore(slots)), models
+
+
+async def open_stream(service: StrategyAIService):
+    response = await stream_pipeline_from_handle(
+        ChannelPipelineRequest(channel_handle="@test", prefetch_scripts=0),
+        strategy_service=service,
+        comment_service=FakeCommentService(),
+        script_cache=ScriptCache(ttl_sec=60, max_entries=8, max_pending=1),
+    )
+    return response.body_iterator
+
+
+def test_closing_stream_mid_script_releases_llm_slot():
+    async def run() -> None:
+        service, models = make_service(slots=2)
+        events = await open_stream(service)
+        async for event in events:
+            if event.startswith("event: script_chunk"):
+                break
+        assert service.upstream_limit._value == 1
+        # What Starlette does when the client disconnects.
+        await events.aclose()
+        assert service.upstream_limit._value == 2
+        assert models.stream_closed.is_set()
+
+    asyncio.run(run())
+
+
+def test_cancelling_stream_consumer_releases_llm_slot():
+    async def run() -> None:
+        service, _ = make_service(slots=2)
+        events = await open_stream(service)
+        first_chunk = asyncio.Event()
+
+        async def consume() -> None:
+            async for event in events:
+                if event.startswith("event: script_chunk"):
+                    first_chunk.set()
+                    await asyncio.Event().wait()
+
+        task = asyncio.create_task(consume())
+        await first_chunk.wait()
+        assert service.upstream_limit._value == 1
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        await events.aclose()
+        assert service.upstream_limit._value == 2
+
+    asyncio.run(run())
+
+
+def test_full_stream_releases_llm_slot():
+    async def run() -> None:
+        service, _ = make_service(slots=1)
+        events = await open_stream(service)
+        names = [event.split("\n", 1)[0] async for event in events]
+        assert names[-1] == "event: done"
+        assert service.upstream_limit._value == 1
+
+    asyncio.run(run())
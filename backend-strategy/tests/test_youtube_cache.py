@@ -0,0 +1,121 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.services.youtube_cache import YouTubeResponseCache
+from app.services.youtube_service import YouTubeCommentService
+
+PARAMS = {"part": "snippet", "playlistId": "UU1"}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return YouTubeResponseCache(tmp_path / "cache.sqlite3", retention_sec=3600, max_rows=3)
+
+
+class FakeYouTube:
+    """MockTransport handler that serves a versioned playlistItems body with an ETag."""
+
+    def __init__(self) -> None:
+        self.etag = '"v1"'
+        self.requests: list[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if request.headers.get("If-None-Match") == self.etag:
+            return httpx.Response(304)
+        return httpx.Response(200, json={"items": [self.etag]}, headers={"ETag": self.etag})
+
+
+def make_service(monkeypatch, cache, ttl_sec):
+    monkeypatch.setenv("YOUTUBE_DATA_API_KEY", "test-key")
+    monkeypatch.setenv("YOUTUBE_CACHE_TTL_PLAYLIST_ITEMS_SEC", str(ttl_sec))
+    upstream = FakeYouTube()
+    client = httpx.AsyncClient(transport=httpx.MockTransport(upstream))
+    return YouTubeCommentService(http_client=client, cache=cache), upstream
+
+
+def age_rows(cache, seconds):
+    cache._conn().execute("UPDATE responses SET fetched_at = fetched_at - ?", (seconds,))
+
+
+def test_fresh_entry_is_served_without_a_request(monkeypatch, cache):
+    service, upstream = make_service(monkeypatch, cache, ttl_sec=300)
+
+    first = asyncio.run(service._get("playlistItems", PARAMS))
+    second = asyncio.run(service._get("playlistItems", PARAMS))
+
+    assert first == second == {"items": ['"v1"']}
+    assert len(upstream.requests) == 1
+    assert service.cache_stats == {"hits": 1, "misses": 1, "revalidated": 0}
+
+
+def test_stale_entry_is_revalidated_with_its_etag(monkeypatch, cache):
+    service, upstream = make_service(monkeypatch, cache, ttl_sec=300)
+    asyncio.run(service._get("playlistItems", PARAMS))
+    age_rows(cache, 600)
+
+    body = asyncio.run(service._get("playlistItems", PARAMS))
+
+    assert body == {"items": ['"v1"']}
+    assert upstream.requests[-1].headers["If-None-Match"] == '"v1"'
+    assert service.cache_stats["revalidated"] == 1
+    # A 304 renews the entry, so the next call is a plain hit.
+    asyncio.run(service._get("playlistItems", PARAMS))
+    assert len(upstream.requests) == 2
+
+
+def test_changed_resource_replaces_stale_entry(monkeypatch, cache):
+    service, upstream = make_service(monkeypatch, cache, ttl_sec=300)
+    asyncio.run(service._get("playlistItems", PARAMS))
+    age_rows(cache, 600)
+    upstream.etag = '"v2"'
+
+    body = asyncio.run(service._get("playlistItems", PARAMS))
+
+    assert body == {"items": ['"v2"']}
+    assert service.cache_stats["misses"] == 2
+    assert cache.get(YouTubeResponseCache.make_key("playlistItems", PARAMS)).etag == '"v2"'
+
+
+def test_zero_ttl_always_revalidates(monkeypatch, cache):
+    service, upstream = make_service(monkeypatch, cache, ttl_sec=0)
+    asyncio.run(service._get("playlistItems", PARAMS))
+    asyncio.run(service._get("playlistItems", PARAMS))
+
+    assert len(upstream.requests) == 2
+    assert service.cache_stats["revalidated"] == 1
+
+
+def test_prune_drops_rows_past_retention(cache):
+    cache.put("old", "search", None, {})
+    age_rows(cache, 7200)
+    cache.put("new", "search", None, {})
+
+    assert cache.prune() == 1
+    assert cache.get("old") is None
+    assert cache.get("new") is not None
+
+
+def test_prune_caps_rows_keeping_the_newest(cache):
+    for index in range(5):
+        cache.put(f"page{index}", "commentThreads", None, {"page": index})
+        cache._conn().execute(
+            "UPDATE responses SET fetched_at = ? WHERE cache_key = ?", (time.time() + index, f"page{index}")
+        )
+
+    assert cache.prune() == 2
+    assert [cache.get(f"page{index}") is not None for index in range(5)] == [False, False, True, True, True]
+
+
+def test_startup_prunes_existing_file(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    cache = YouTubeResponseCache(path, retention_sec=3600)
+    cache.put("old", "search", None, {})
+    age_rows(cache, 7200)
+
+    reopened = YouTubeResponseCache(path, retention_sec=3600)
+
+    assert reopened.get("old") is None
@@ -149,8 +149,10 @@ async function createStoryJob(payload) {
   return response.json();
 }
 
-async function fetchAssetJobStatus(jobId) {
-  const response = await fetch(`${generationApi}/api/assets/jobs/${jobId}`);
+async function fetchAssetJobStatus(jobId, waitSec = 0) {
+  const response = await fetch(
+    `${generationApi}/api/assets/jobs/${jobId}?wait=${waitSec}`,
+  );
   if (!response.ok) {
     throw new Error("스토리 Job 상태 조회에 실패했습니다.");
   }
@@ -170,7 +172,8 @@ async function fetchAssetJobResult(jobId) {
 async function waitForAssetJob(jobId, timeoutMs = 120000) {
   const startedAt = Date.now();
   while (Date.now() - startedAt < timeoutMs) {
-    const status = await fetchAssetJobStatus(jobId);
+    // Long-poll: the backend answers as soon as the job changes state.
+    const status = await fetchAssetJobStatus(jobId, 30);
     if (status.status === "succeeded") {
       const result = await fetchAssetJobResult(jobId);
       return { status, result };
@@ -180,7 +183,6 @@ async function waitForAssetJob(jobId, timeoutMs = 120000) {
         status.error_message || "스토리 Job이 실패했습니다.",
       );
     }
-    await new Promise((resolve) => setTimeout(resolve, 2000));
   }
   throw new Error(
     "스토리 생성 시간이 초과되었습니다. 잠시 후 다시 시도해 주세요.",